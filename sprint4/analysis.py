@@ -0,0 +1,115 @@
+import queue
+import threading
+
+from gameLogic import DEFAULT_RULE
+
+SCORES = "scores"  # Placing the letter completes a line
+SAFE = "safe"      # Scores nothing and leaves the opponent no new line to finish
+GIFT = "gift"      # Leaves a line through the cell one letter from done
+
+def letter_outcome(board, windows, row, col, letter, words):
+    """ SCORES, SAFE or GIFT for placing letter on the empty cell (row, col) """
+    board[row][col] = letter
+    try:
+        gift = False
+        for _, cells in windows:
+            for word in words:
+                missing = 0
+                for (r, c), ch in zip(cells, word):
+                    cell = board[r][c]
+                    if cell == "":
+                        missing += 1
+                    elif cell != ch:
+                        break
+                else:
+                    if missing == 0:
+                        return SCORES
+                    gift = gift or missing == 1
+        return GIFT if gift else SAFE
+    finally:
+        board[row][col] = ""
+
+def cell_outcomes(board, size, row, col, rule=DEFAULT_RULE):
+    """ {letter: outcome} for an empty cell, or None once it is filled """
+    if board[row][col] != "":
+        return None
+    windows = rule.windows(size)[1][row][col]
+    words = rule._words()
+    return {letter: letter_outcome(board, windows, row, col, letter, words) for letter in rule.letters}
+
+def best_outcome(outcomes):
+    """ The best a player can do on a cell: score, else play safe, else only gifts """
+    if outcomes is None:
+        return None
+    values = outcomes.values()
+    return SCORES if SCORES in values else SAFE if SAFE in values else GIFT
+
+def affected_cells(rule, size, row, col):
+    """
+    Cells whose outcomes can change when (row, col) is filled: every cell on a
+    line through it. An outcome only depends on the lines through its own cell.
+    """
+    return {cell for _, cells in rule.windows(size)[1][row][col] for cell in cells}
+
+class MoveAnalyzer:
+    """
+    Classifies empty cells in a background thread. reset() queues the whole
+    board and moved() only the cells a move can affect; each job works on its
+    own copy of the board. drain() returns finished (row, col, outcomes)
+    updates without blocking. Updates from before the last reset() are
+    dropped.
+    """
+    def __init__(self):
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._generation = 0
+        self._thread = None
+
+    def reset(self, logic):
+        self._generation += 1
+        rows, cols = logic.game_mode.get_shape()
+        self._submit(logic, [(r, c) for r in range(rows) for c in range(cols)])
+
+    def moved(self, logic, row, col):
+        game = logic.game_mode
+        self._submit(logic, sorted(affected_cells(game.rule, game.get_size(), row, col)))
+
+    def _submit(self, logic, cells):
+        game = logic.game_mode
+        board = [list(row) for row in game.get_board()]
+        self._jobs.put((self._generation, board, game.get_size(), game.rule, cells))
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._work, daemon=True)
+            self._thread.start()
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            generation, board, size, rule, cells = job
+            for row, col in cells:
+                if generation != self._generation:
+                    break
+                self._results.put((generation, row, col, cell_outcomes(board, size, row, col, rule)))
+            self._jobs.task_done()
+
+    def wait(self):
+        """ Blocks until every queued job is analyzed """
+        self._jobs.join()
+
+    def drain(self):
+        updates = []
+        while True:
+            try:
+                generation, row, col, outcomes = self._results.get_nowait()
+            except queue.Empty:
+                return updates
+            if generation == self._generation:
+                updates.append((row, col, outcomes))
+
+    def close(self):
+        self._generation += 1
+        if self._thread is not None:
+            self._jobs.put(None)
+            self._thread = None
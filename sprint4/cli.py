@@ -0,0 +1,116 @@
+"""
+Headless command line for the SOS engine:
+    python cli.py play --size 5 --mode general --p2 computer
+    python cli.py simulate --size 7 --games 100000
+    python cli.py bench --size 5 --games 500
+Only gameLogic is imported up front; the simulator (NumPy) and tournament
+code load when their command runs.
+"""
+import argparse
+import sys
+import time
+
+from gameLogic import GameLogic, PLAYER_1, PLAYER_2, VALID_LETTERS, EMPTY_CELL, board_shape, parse_board_size
+
+def format_board(logic):
+    """ Board as text with row and column numbers, empty cells shown as EMPTY_CELL """
+    board = logic.game_mode.get_board()
+    rows, cols = logic.game_mode.get_shape()
+    lines = ["   " + " ".join(f"{c:>2}" for c in range(cols))]
+    for r in range(rows):
+        lines.append(f"{r:>2} " + " ".join(f"{board[r][c] or EMPTY_CELL:>2}" for c in range(cols)))
+    return "\n".join(lines)
+
+def _parse_move(text, rows, cols):
+    parts = text.split()
+    if len(parts) != 3 or parts[2].upper() not in VALID_LETTERS:
+        raise ValueError("enter a move as: row col letter")
+    row, col = int(parts[0]), int(parts[1])
+    if not (0 <= row < rows and 0 <= col < cols):
+        raise ValueError("that cell is off the board")
+    return row, col, parts[2].upper()
+
+def play(args, out=sys.stdout, stdin=None):
+    """ Plays one game in the terminal; humans type "row col letter" """
+    stdin = stdin or sys.stdin
+    logic = GameLogic(args.size, args.mode, args.p1, args.p2, seed=args.seed)
+    rows, cols = board_shape(args.size)
+    while not logic.game_over():
+        print(format_board(logic), file=out)
+        player = logic.get_current_player()
+        move = logic.get_cpu_move()
+        if move is None:
+            print(f"{player} to move: ", end="", file=out, flush=True)
+            line = stdin.readline()
+            if not line:
+                return 1
+            try:
+                move = _parse_move(line, rows, cols)
+            except ValueError as error:
+                print(error, file=out)
+                continue
+        else:
+            print(f"{player} plays {move[0]} {move[1]} {move[2]}", file=out)
+        result = logic.place_letter(*move)
+        if not result["valid"]:
+            print("that cell is taken", file=out)
+    print(format_board(logic), file=out)
+    winner = logic.game_mode.get_winner()
+    if args.mode == "general":
+        scores = logic.get_scores()
+        print(f"Score {scores[PLAYER_1]} - {scores[PLAYER_2]}", file=out)
+    print("Draw" if winner in (None, "draw") else f"Winner: {winner}", file=out)
+    return 0
+
+def simulate(args, out=sys.stdout):
+    """ Random playouts through the NumPy lockstep simulator """
+    from simulator import simulate as run_playouts, summarize
+    start = time.perf_counter()
+    summary = summarize(run_playouts(args.size, args.mode, args.games, seed=args.seed))
+    seconds = time.perf_counter() - start
+    for key, value in summary.items():
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}", file=out)
+    print(f"{args.games} games in {seconds:.2f}s ({args.games / seconds:.0f} games/s)", file=out)
+    return 0
+
+def bench(args, out=sys.stdout):
+    """ Times CPU vs CPU games through GameLogic """
+    from tournament import Entrant, MatchSpec, play_match
+    cpu = Entrant("cpu")
+    moves = 0
+    start = time.perf_counter()
+    for game in range(args.games):
+        seed = None if args.seed is None else args.seed + game
+        moves += play_match(MatchSpec(game, cpu, cpu, args.size, args.mode, seed)).moves
+    seconds = time.perf_counter() - start
+    print(f"{args.games} games, {moves} moves in {seconds:.2f}s", file=out)
+    print(f"{args.games / seconds:.1f} games/s, {moves / seconds:.1f} moves/s", file=out)
+    return 0
+
+def _board_size(text):
+    try:
+        return parse_board_size(text)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Play, simulate and benchmark SOS without the GUI")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, handler, default_games in (("play", play, None), ("simulate", simulate, 10000), ("bench", bench, 200)):
+        sub = commands.add_parser(name, help=handler.__doc__.strip())
+        sub.set_defaults(handler=handler)
+        sub.add_argument("--size", type=_board_size, default=3, help='board size, "7" or "5x9"')
+        sub.add_argument("--mode", choices=["simple", "general"], default="simple")
+        sub.add_argument("--seed", type=int)
+        if default_games is not None:
+            sub.add_argument("--games", type=int, default=default_games)
+    commands.choices["play"].add_argument("--p1", choices=["human", "computer"], default="human")
+    commands.choices["play"].add_argument("--p2", choices=["human", "computer"], default="computer")
+    return parser
+
+def main(argv=None, out=sys.stdout):
+    args = build_parser().parse_args(argv)
+    return args.handler(args, out=out)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Columnar position datasets for offline analysis.
+A dataset is a directory with one .npy file per column and a meta.json.
+Every row is the position before one move:
+
+  boards     (N, rows, cols) int8  EMPTY, CODE_S or CODE_O per cell
+  legal      (N, rows, cols) bool  empty cells, where the side to move may play
+  to_move    (N,) int8             0 for p1, 1 for p2
+  moves      (N, 3) int8           row, col and letter code of the move played
+  sos_found  (N,) int8             lines the move completed
+  p1_score   (N,) int16            final scores of the game
+  p2_score   (N,) int16
+  winner     (N,) int8             0, 1 or DRAW, or NO_WINNER for a game left unfinished
+  game       (N,) int32            game number within the dataset
+
+DatasetWriter appends rows in fixed-size chunks straight to the column files,
+rewriting each .npy header with the new row count after every chunk, so
+memory use does not grow with the corpus and a partly written dataset still
+loads. load() maps the columns with np.load(mmap_mode="r") without copying.
+"""
+import json
+import os
+
+import numpy as np
+
+from gameLogic import GameLogic, board_shape, size_label
+from simulator import LETTER_CODES, PLAYER_CODES, DRAW, NO_WINNER, EMPTY
+
+DEFAULT_CHUNK = 65536  # Rows buffered between writes
+HEADER_SIZE = 128  # Bytes reserved for each .npy header, so it can be rewritten in place
+META_FILE = "meta.json"
+
+def columns(rows, cols):
+    """ {name: (dtype, shape of one row)} for a board shape """
+    return {
+        "boards": (np.int8, (rows, cols)),
+        "legal": (np.bool_, (rows, cols)),
+        "to_move": (np.int8, ()),
+        "moves": (np.int8, (3,)),
+        "sos_found": (np.int8, ()),
+        "p1_score": (np.int16, ()),
+        "p2_score": (np.int16, ()),
+        "winner": (np.int8, ()),
+        "game": (np.int32, ()),
+    }
+
+def _npy_header(dtype, shape):
+    """ Version 1.0 .npy header padded to exactly HEADER_SIZE bytes """
+    header = repr({"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)), "fortran_order": False,
+                   "shape": shape}).encode("latin1")
+    prefix = b"\x93NUMPY\x01\x00" + (HEADER_SIZE - 10).to_bytes(2, "little")
+    padding = HEADER_SIZE - len(prefix) - len(header) - 1
+    if padding < 0:
+        raise ValueError(f"Header for shape {shape} does not fit in {HEADER_SIZE} bytes")
+    return prefix + header + b" " * padding + b"\n"
+
+class DatasetWriter:
+    """
+    Streams positions of one board size and mode into a dataset directory.
+    Use as a context manager, or call close(), to flush the last chunk.
+    """
+    def __init__(self, directory, size, mode, chunk=DEFAULT_CHUNK):
+        self.directory = directory
+        self.size = size
+        self.mode = mode
+        self.chunk = chunk
+        self.rows, self.cols = board_shape(size)
+        self.count = 0
+        self.games = 0
+        self._columns = columns(self.rows, self.cols)
+        self._buffers = {name: np.zeros((chunk,) + shape, dtype) for name, (dtype, shape) in self._columns.items()}
+        self._filled = 0
+        os.makedirs(directory, exist_ok=True)
+        self._files = {}
+        for name in self._columns:
+            f = open(os.path.join(directory, name + ".npy"), "wb")
+            self._files[name] = f
+            self._write_header(name)
+
+    def _write_header(self, name):
+        dtype, shape = self._columns[name]
+        f = self._files[name]
+        end = f.tell()
+        f.seek(0)
+        f.write(_npy_header(dtype, (self.count,) + shape))
+        f.seek(max(end, HEADER_SIZE))
+
+    def add_game(self, moves, rule=None):
+        """ Replays (row, col, letter) moves and appends the position before each; returns the rows added """
+        logic = GameLogic(self.size, self.mode, rule=rule)
+        board = np.zeros((self.rows, self.cols), dtype=np.int8)
+        length = len(moves)
+        boards = np.empty((length, self.rows, self.cols), dtype=np.int8)
+        to_move = np.empty(length, dtype=np.int8)
+        played = np.empty((length, 3), dtype=np.int8)
+        sos_found = np.empty(length, dtype=np.int8)
+        for i, (row, col, letter) in enumerate(moves):
+            boards[i] = board
+            to_move[i] = PLAYER_CODES[logic.get_current_player()]
+            result = logic.place_letter(row, col, letter)
+            if not result["valid"]:
+                raise ValueError(f"Move {i} ({row}, {col}, {letter}) is not valid")
+            board[row, col] = LETTER_CODES[letter]
+            played[i] = (row, col, LETTER_CODES[letter])
+            sos_found[i] = result["sos_found"]
+        snap = logic.snapshot()
+        winner = snap.winner if snap.game_ended else None
+        game = {
+            "boards": boards,
+            "legal": boards == EMPTY,
+            "to_move": to_move,
+            "moves": played,
+            "sos_found": sos_found,
+            "p1_score": snap.p1_score,
+            "p2_score": snap.p2_score,
+            "winner": NO_WINNER if winner is None else DRAW if winner == "draw" else PLAYER_CODES[winner],
+            "game": self.games,
+        }
+        self._append(game, length)
+        self.games += 1
+        return length
+
+    def _append(self, game, length):
+        start = 0
+        while start < length:
+            take = min(length - start, self.chunk - self._filled)
+            for name, values in game.items():
+                target = self._buffers[name][self._filled:self._filled + take]
+                target[...] = values[start:start + take] if isinstance(values, np.ndarray) else values
+            self._filled += take
+            start += take
+            if self._filled == self.chunk:
+                self.flush()
+
+    def flush(self):
+        """ Writes buffered rows to the column files """
+        if not self._filled:
+            return
+        self.count += self._filled
+        for name, f in self._files.items():
+            self._buffers[name][:self._filled].tofile(f)
+            self._write_header(name)
+            f.flush()
+        self._filled = 0
+        self._write_meta()
+
+    def _write_meta(self):
+        meta = {"size": list(board_shape(self.size)), "mode": self.mode, "rows": self.count, "games": self.games,
+                "columns": list(self._columns)}
+        with open(os.path.join(self.directory, META_FILE), "w") as f:
+            json.dump(meta, f)
+
+    def close(self):
+        self.flush()
+        self._write_meta()
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def load(directory, mmap_mode="r"):
+    """ {column: array} of a dataset directory, memory-mapped by default """
+    with open(os.path.join(directory, META_FILE)) as f:
+        meta = json.load(f)
+    return {name: np.load(os.path.join(directory, name + ".npy"), mmap_mode=mmap_mode) for name in meta["columns"]}
+
+def to_npz(directory, path, compressed=True):
+    """ Packs a dataset directory into one .npz archive; npz members load into memory, not by mmap """
+    data = load(directory)
+    (np.savez_compressed if compressed else np.savez)(path, **data)
+
+# --- Sources ---
+def self_play_games(size, mode, games, seed=0):
+    """ Move lists of CPU vs CPU games; game i is seeded from seed and i """
+    for i in range(games):
+        logic = GameLogic(size, mode, "computer", "computer", seed=seed * 1000003 + i)
+        moves = []
+        while not logic.game_over():
+            move = logic.get_cpu_move()
+            logic.place_letter(*move)
+            moves.append(move)
+        yield moves
+
+def simulated_games(size, mode, games, seed=0, batch=4096):
+    """ Move lists of random games from the lockstep simulator, played a batch at a time """
+    from simulator import LockstepSimulator
+    for start in range(0, games, batch):
+        sim = LockstepSimulator(size, mode, min(batch, games - start), seed=seed * 1000003 + start,
+                                record_moves=True)
+        sim.run()
+        for game in range(sim.batch):
+            yield sim.moves(game)
+
+def export(directory, size, mode, games, chunk=DEFAULT_CHUNK):
+    """ Writes every move list in games to a dataset directory; returns the rows written """
+    with DatasetWriter(directory, size, mode, chunk) as writer:
+        for moves in games:
+            writer.add_game(moves)
+    return writer.count
+
+if __name__ == "__main__":
+    import argparse
+    from gameLogic import parse_board_size
+    parser = argparse.ArgumentParser(description="Export game positions as a columnar NumPy dataset")
+    parser.add_argument("output")
+    parser.add_argument("--size", type=parse_board_size, default=5)
+    parser.add_argument("--mode", choices=["simple", "general"], default="general")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--source", choices=["cpu", "random"], default="cpu")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK)
+    parser.add_argument("--npz")
+    args = parser.parse_args()
+    source = self_play_games if args.source == "cpu" else simulated_games
+    rows = export(args.output, args.size, args.mode, source(args.size, args.mode, args.games, args.seed), args.chunk)
+    if args.npz:
+        to_npz(args.output, args.npz)
+    print(f"{rows} positions from {args.games} {size_label(args.size)} {args.mode} games written to {args.output}")
@@ -0,0 +1,226 @@
+import importlib
+import json
+import socket
+import socketserver
+import threading
+import time
+from collections import deque, namedtuple
+
+from tournament import Entrant, MatchSpec, play_match
+
+DEFAULT_HOST = "127.0.0.1"
+WAIT_DELAY = 0.05  # Seconds an idle worker waits before asking again
+MAX_ATTEMPTS = 3  # Times a job is handed out before it is marked failed
+
+# The only player classes workers will run, by short name
+PLAYER_CLASSES = {
+    "computer": "gameLogic:ComputerPlayer",
+    "solver": "solver:SolverPlayer",
+}
+
+# A batch of self-play games. p1 and p2 are {"player": name, "options": {...}}
+# specs; games use seeds seed_start .. seed_start + count - 1.
+Job = namedtuple("Job", ["job_id", "size", "mode", "p1", "p2", "seed_start", "count"])
+
+def make_jobs(size, mode, p1, p2, games, batch_size=100, seed=0):
+    """ Splits a self-play run into jobs of at most batch_size games """
+    jobs = []
+    for job_id, start in enumerate(range(0, games, batch_size)):
+        jobs.append(Job(job_id, size, mode, p1, p2, seed + start, min(batch_size, games - start)))
+    return jobs
+
+def resolve_player(name):
+    """ Player class for a PLAYER_CLASSES name; names arrive over the wire, so nothing else is imported """
+    if name not in PLAYER_CLASSES:
+        raise ValueError(f"Unknown player: {name}")
+    module_name, _, class_name = PLAYER_CLASSES[name].partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+def run_job(job):
+    """
+    Plays every game in a job. Returns compact
+    [seed, winner, p1_score, p2_score, moves] rows, winner being "p1", "p2" or "draw".
+    """
+    size = tuple(job.size) if isinstance(job.size, list) else job.size
+    p1 = Entrant("p1", resolve_player(job.p1["player"]), job.p1.get("options"))
+    p2 = Entrant("p2", resolve_player(job.p2["player"]), job.p2.get("options"))
+    rows = []
+    for seed in range(job.seed_start, job.seed_start + job.count):
+        result = play_match(MatchSpec(seed, p1, p2, size, job.mode, seed))
+        rows.append([seed, result.winner, result.p1_score, result.p2_score, result.moves])
+    return rows
+
+# --- Wire Format ---
+def _send(stream, message):
+    stream.write(json.dumps(message).encode() + b"\n")
+    stream.flush()
+
+def _receive(stream):
+    line = stream.readline()
+    return json.loads(line) if line else None
+
+# --- Coordinator ---
+class _WorkerHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        coordinator = self.server.coordinator
+        worker_id = coordinator._register_worker()
+        try:
+            while True:
+                message = _receive(self.rfile)
+                if message is None:
+                    break
+                if message["type"] == "request":
+                    _send(self.wfile, coordinator._next_assignment(worker_id))
+                elif message["type"] == "result":
+                    coordinator._record_result(message["job_id"], message["games"])
+                elif message["type"] == "error":
+                    coordinator._record_error(worker_id, message["job_id"], message["error"])
+        except (ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            coordinator._worker_lost(worker_id)
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+class Coordinator:
+    """
+    Hands self-play jobs to workers over TCP using newline-delimited JSON.
+    Jobs held by a worker that disconnects, or that run longer than
+    job_timeout seconds, go back on the queue, as do jobs a worker reports
+    an error for. A job handed out max_attempts times without a result is
+    recorded in self.failed with its last error instead. The first result
+    received for a job is kept, even one that arrives after the job was
+    marked failed; the job then counts as finished, not failed.
+    """
+    def __init__(self, jobs, host=DEFAULT_HOST, port=0, job_timeout=None, max_attempts=MAX_ATTEMPTS):
+        self.jobs = {job.job_id: job for job in jobs}
+        self.job_timeout = job_timeout
+        self.max_attempts = max_attempts
+        self.results = {}
+        self.failed = {}  # job_id -> error message
+        self._attempts = dict.fromkeys(self.jobs, 0)
+        self._pending = deque(self.jobs)
+        self._in_flight = {}  # job_id -> (worker_id, start time)
+        self._next_worker = 0
+        self._lock = threading.Condition()
+        self._server = _Server((host, port), _WorkerHandler)
+        self._server.coordinator = self
+        self._thread = None
+
+    @property
+    def address(self):
+        return self._server.server_address
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        """ Blocks until every job has a result or has failed; returns {job_id: rows} of the finished ones """
+        with self._lock:
+            if not self._lock.wait_for(self._finished, timeout):
+                raise TimeoutError(f"{len(self.jobs) - len(self.results) - len(self.failed)} jobs unfinished")
+            return dict(self.results)
+
+    def _finished(self):
+        return len(self.results) + len(self.failed) == len(self.jobs)
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _register_worker(self):
+        with self._lock:
+            self._next_worker += 1
+            return self._next_worker
+
+    def _next_assignment(self, worker_id):
+        with self._lock:
+            if self._finished():
+                return {"type": "done"}
+            self._requeue_expired()
+            if self._finished():
+                self._lock.notify_all()  # The last job may have just run out of attempts
+                return {"type": "done"}
+            while self._pending:
+                job_id = self._pending.popleft()
+                if job_id not in self.results and job_id not in self.failed:
+                    self._attempts[job_id] += 1
+                    self._in_flight[job_id] = (worker_id, time.monotonic())
+                    return {"type": "job", **self.jobs[job_id]._asdict()}
+            return {"type": "wait", "delay": WAIT_DELAY}
+
+    def _requeue_expired(self):
+        if self.job_timeout is None:
+            return
+        now = time.monotonic()
+        for job_id, (_, started) in list(self._in_flight.items()):
+            if now - started > self.job_timeout:
+                del self._in_flight[job_id]
+                self._retry(job_id, "timed out", first=False)
+
+    def _record_result(self, job_id, games):
+        with self._lock:
+            self._in_flight.pop(job_id, None)
+            if job_id not in self.results:
+                self.results[job_id] = games
+                self.failed.pop(job_id, None)
+            self._lock.notify_all()
+
+    def _record_error(self, worker_id, job_id, error):
+        with self._lock:
+            if self._in_flight.get(job_id, (None,))[0] == worker_id:
+                del self._in_flight[job_id]
+                self._retry(job_id, error, first=False)
+            self._lock.notify_all()
+
+    def _worker_lost(self, worker_id):
+        with self._lock:
+            for job_id, (owner, _) in list(self._in_flight.items()):
+                if owner == worker_id:
+                    del self._in_flight[job_id]
+                    self._retry(job_id, "worker lost", first=True)
+            self._lock.notify_all()
+
+    def _retry(self, job_id, error, first):
+        """ Requeues a job, at the front if first, unless it has used up its attempts """
+        if job_id in self.results:
+            return
+        if self._attempts[job_id] >= self.max_attempts:
+            self.failed[job_id] = error
+        elif first:
+            self._pending.appendleft(job_id)
+        else:
+            self._pending.append(job_id)
+
+# --- Worker ---
+def run_worker(host, port):
+    """ Connects to a coordinator and plays jobs until told there are none left; returns jobs played """
+    played = 0
+    with socket.create_connection((host, port)) as sock, sock.makefile("rwb") as stream:
+        while True:
+            _send(stream, {"type": "request"})
+            message = _receive(stream)
+            if message is None or message["type"] == "done":
+                return played
+            if message["type"] == "wait":
+                time.sleep(message["delay"])
+                continue
+            job = Job(**{field: message[field] for field in Job._fields})
+            try:
+                games = run_job(job)
+            except Exception as e:
+                # A bad job must not take the worker down with it
+                _send(stream, {"type": "error", "job_id": job.job_id, "error": f"{type(e).__name__}: {e}"})
+                continue
+            _send(stream, {"type": "result", "job_id": job.job_id, "games": games})
+            played += 1
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) != 3:
+        sys.exit("usage: python distributed.py HOST PORT")
+    print(f"Played {run_worker(sys.argv[1], int(sys.argv[2]))} jobs")
@@ -1,4 +1,9 @@
+import copy
+import logging
+import math
 import random
+import time
+from collections import namedtuple
 
 # Constants
 PLAYER_1 = "p1"
@@ -8,17 +13,298 @@ LETTER_O = "O"
 VALID_LETTERS = ["S", "O"]
 MIN_BOARD_SIZE = 3
 MAX_BOARD_SIZE = 15
+ENDGAME_THRESHOLD = 8  # General game CPU plays exact moves at or below this many empty cells
+EMPTY_CELL = "."  # Marks empty squares in packed boards
+
+# Move-by-move trace of the engine and CPU players. Logged at INFO, so it is
+# silent unless an application such as the GUI turns it on.
+logger = logging.getLogger(__name__)
+
+def board_shape(size):
+    """ (rows, cols) of a board given as a square size n or a (rows, cols) pair """
+    if isinstance(size, int) and not isinstance(size, bool):
+        return size, size
+    if isinstance(size, tuple) and len(size) == 2:
+        return size
+    raise TypeError(f"Invalid board size: {size!r}")
+
+def size_label(size):
+    rows, cols = board_shape(size)
+    return f"{rows}x{cols}"
+
+def parse_board_size(text):
+    """ Parses "7" or "7x10" into a board size; raises ValueError on bad input """
+    parts = text.lower().replace(" ", "").split("x")
+    if len(parts) == 1:
+        return int(parts[0])
+    if len(parts) == 2:
+        rows, cols = int(parts[0]), int(parts[1])
+        return rows if rows == cols else (rows, cols)
+    raise ValueError(f"Invalid board size: {text}")
+
+# SOS directions and the (dr, dc) step between consecutive cells of each
+SOS_STEPS = {'H': (0, 1), 'V': (1, 0), 'D1': (1, 1), 'D2': (1, -1)}
+
+def sos_cells(sos_id, length=3):
+    """ Expands a compact SOS id (direction, r, c) into its board cells """
+    direction, r, c = sos_id
+    dr, dc = SOS_STEPS[direction]
+    return [(r + i * dr, c + i * dc) for i in range(length)]
+
+# --- Pattern Rules ---
+_rule_windows = {}  # (rule, size) -> precomputed windows
+
+class PatternRule(namedtuple("PatternRule", ["word", "letters"])):
+    """
+    The word players score by spelling in a straight line, and the letters
+    they may place. Classic SOS is PatternRule("SOS"). Words that are not
+    palindromes also score when spelled backwards.
+    Windows are precomputed per board shape, so checking a move only looks at
+    the lines through the placed cell.
+    """
+    __slots__ = ()
+
+    def __new__(cls, word="SOS", letters=None):
+        letters = tuple(letters) if letters else tuple(dict.fromkeys(word))
+        if len(word) < 2:
+            raise ValueError("Pattern word must be at least 2 letters")
+        if any(len(letter) != 1 or letter in ("", EMPTY_CELL) for letter in letters):
+            raise ValueError(f"Invalid letters: {letters}")
+        if any(ch not in letters for ch in word):
+            raise ValueError(f"Word {word} uses letters outside {letters}")
+        return super().__new__(cls, word, letters)
+
+    @property
+    def length(self):
+        return len(self.word)
+
+    def _words(self):
+        reverse = self.word[::-1]
+        return (self.word,) if reverse == self.word else (self.word, reverse)
+
+    def windows(self, size):
+        """
+        Returns (all_windows, cell_windows). all_windows lists every
+        (sos_id, cells) line on the board; cell_windows[r][c] lists the ones
+        through (r, c).
+        """
+        shape = board_shape(size)
+        cached = _rule_windows.get((self, shape))
+        if cached is not None:
+            return cached
+        rows, cols = shape
+        k = self.length
+        all_windows = []
+        cell_windows = [[[] for _ in range(cols)] for _ in range(rows)]
+        for direction, (dr, dc) in SOS_STEPS.items():
+            for r in range(rows):
+                for c in range(cols):
+                    r_end = r + (k - 1) * dr
+                    c_end = c + (k - 1) * dc
+                    if 0 <= r_end < rows and 0 <= c_end < cols:
+                        window = ((direction, r, c), tuple(sos_cells((direction, r, c), k)))
+                        all_windows.append(window)
+                        for wr, wc in window[1]:
+                            cell_windows[wr][wc].append(window)
+        cached = (tuple(all_windows), tuple(tuple(tuple(w) for w in row) for row in cell_windows))
+        _rule_windows[(self, shape)] = cached
+        return cached
+
+    def _matching(self, board, windows):
+        found = []
+        for word in self._words():
+            for sos_id, cells in windows:
+                for (r, c), ch in zip(cells, word):
+                    if board[r][c] != ch:
+                        break
+                else:
+                    found.append(sos_id)
+        return found
+
+    def scan(self, board, size):
+        """ Ids of every line on the board that spells the word """
+        return self._matching(board, self.windows(size)[0])
+
+    def matches_at(self, board, size, row, col):
+        """ Ids of lines through (row, col) that spell the word """
+        return self._matching(board, self.windows(size)[1][row][col])
+
+DEFAULT_RULE = PatternRule("SOS", VALID_LETTERS)
+
+# --- Found SOS Registry ---
+SOS_DIRECTIONS = tuple(SOS_STEPS)
+_DIRECTION_INDEX = {direction: i for i, direction in enumerate(SOS_DIRECTIONS)}
+
+class SOSRegistry:
+    """
+    Set of found SOS ids stored as a bitset, one bit per possible
+    (direction, r, c) triple on the board.
+    """
+    __slots__ = ("_rows", "_cols", "_bits", "_count")
+
+    def __init__(self, size, found=()):
+        self._rows, self._cols = board_shape(size)
+        self._bits = bytearray((len(SOS_DIRECTIONS) * self._rows * self._cols + 7) // 8)
+        self._count = 0
+        for sos_id in found:
+            self.add(sos_id)
+
+    def _index(self, sos_id):
+        direction, r, c = sos_id
+        return (_DIRECTION_INDEX[direction] * self._rows + r) * self._cols + c
+
+    def __contains__(self, sos_id):
+        i = self._index(sos_id)
+        return self._bits[i >> 3] >> (i & 7) & 1 == 1
+
+    def add(self, sos_id):
+        """ Marks an SOS id as found; returns False if it already was """
+        i = self._index(sos_id)
+        mask = 1 << (i & 7)
+        if self._bits[i >> 3] & mask:
+            return False
+        self._bits[i >> 3] |= mask
+        self._count += 1
+        return True
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        cols = self._cols
+        cells = self._rows * cols
+        for byte_index, byte in enumerate(self._bits):
+            while byte:
+                low = byte & -byte
+                i = byte_index * 8 + low.bit_length() - 1
+                byte ^= low
+                direction, rest = divmod(i, cells)
+                yield (SOS_DIRECTIONS[direction], *divmod(rest, cols))
+
+    def view(self):
+        return FoundView(self)
+
+class FoundView:
+    """ Read-only live view of an SOSRegistry; costs nothing to hand out """
+    __slots__ = ("_registry",)
+
+    def __init__(self, registry):
+        self._registry = registry
+
+    def __contains__(self, sos_id):
+        return sos_id in self._registry
+
+    def __len__(self):
+        return len(self._registry)
+
+    def __iter__(self):
+        return iter(self._registry)
+
+# --- Move Results ---
+class MoveResult(namedtuple("MoveResult", ["valid", "game_over", "winner", "sos_ids", "length"], defaults=[3])):
+    """
+    Immutable result of a place_letter call.
+    New SOS sequences are kept as compact ids and only expanded into cell
+    coordinates when sos_list is read. Supports result["key"] access so
+    callers written against the old result dicts keep working.
+    """
+    __slots__ = ()
+
+    @property
+    def sos_found(self):
+        return len(self.sos_ids)
+
+    @property
+    def sos_list(self):
+        return [sos_cells(sos_id, self.length) for sos_id in self.sos_ids]
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self):
+        return {"valid": self.valid, "sos_found": self.sos_found, "game_over": self.game_over,
+                "winner": self.winner, "sos_list": self.sos_list}
+
+# Shared result for every rejected move
+INVALID_MOVE = MoveResult(False, False, None, ())
+
+# --- Snapshots ---
+# Flat, immutable and picklable copy of a game position. Board cells are packed
+# row by row into one string with EMPTY_CELL marking empty squares.
+GameSnapshot = namedtuple("GameSnapshot", ["mode", "size", "cells", "found", "p1_score", "p2_score",
+                                           "current_player", "game_ended", "winner", "rule"],
+                          defaults=[DEFAULT_RULE])
+
+# --- Time Controls ---
+class Deadline:
+    """ Cooperative search deadline; searches poll expired() and stop with their best move so far """
+    __slots__ = ("end",)
+
+    def __init__(self, seconds=None):
+        self.end = time.perf_counter() + seconds if seconds is not None else None
+
+    def expired(self):
+        return self.end is not None and time.perf_counter() >= self.end
+
+    def remaining(self):
+        return None if self.end is None else max(0.0, self.end - time.perf_counter())
+
+class TimeControl(namedtuple("TimeControl", ["per_move", "per_game"], defaults=[None, None])):
+    """
+    Seconds a CPU player may think per move and over a whole game; None is
+    unlimited. The game budget is spread evenly over the player's expected
+    remaining moves (half the empty cells).
+    """
+    __slots__ = ()
+
+    def move_budget(self, time_used, empty):
+        budgets = []
+        if self.per_move is not None:
+            budgets.append(self.per_move)
+        if self.per_game is not None:
+            budgets.append(max(0.0, self.per_game - time_used) / max(1, (empty + 1) // 2))
+        return min(budgets) if budgets else None
+
+UNLIMITED = TimeControl()
+
+# --- CPU Heuristics ---
+class HeuristicParams(namedtuple("HeuristicParams", ["letter_preference", "gift_penalty", "center_bias",
+                                                     "temperature"], defaults=[0.0, 0.0, 0.0, 1.0])):
+    """
+    Tunable move policy for ComputerPlayer. Each non-completing move scores
+    letter_preference for an S (its negative for an O), center_bias scaled by
+    closeness to the board center, and minus gift_penalty if it leaves a line
+    one letter from done. Moves are sampled with softmax weights at the given
+    temperature; 0 always plays a best move. A negative letter_preference
+    also makes completing moves try O first.
+    """
+    __slots__ = ()
+
+# Ranges the auto-tuner searches, per field
+PARAM_BOUNDS = HeuristicParams((-2.0, 2.0), (0.0, 10.0), (-2.0, 2.0), (0.05, 2.0))
 
 # --- Player Class Hierarchy ---
 class Player:
     """ Base class for player types """
-    def __init__(self, player_id):
+    def __init__(self, player_id, letters=None):
         self.player_id = player_id
-        self.selected_letter = "S"  # Current letter choice for GUI
+        self.letters = tuple(letters) if letters else tuple(VALID_LETTERS)
+        self.selected_letter = self.letters[0]  # Current letter choice for GUI
     
     def set_letter_choice(self, letter):
         """Set the player's letter choice (S or O)"""
-        if letter in VALID_LETTERS:
+        if letter in self.letters:
             self.selected_letter = letter
     
     def get_letter_choice(self):
@@ -30,36 +316,88 @@ class Player:
 
 class HumanPlayer(Player):
     """ Human player - moves are handled through GUI clicks """
-    def __init__(self, player_id):
-        super().__init__(player_id)
+    def __init__(self, player_id, letters=None):
+        super().__init__(player_id, letters)
     
     def make_move(self):
         """ Human players don't auto-generate moves; returns None """
         return None
 
 class ComputerPlayer(Player):
-    def __init__(self, player_id):
-        super().__init__(player_id)
+    """
+    CPU player. Each instance owns its own random stream: pass rng to share or
+    inject one, or seed to make the player's moves reproducible.
+    In general games the endgame is solved exactly once at most
+    endgame_threshold cells are empty (0 disables this).
+    time_control limits thinking time per move and per game; time_used
+    totals this player's thinking over the game.
+    Without params, moves that complete nothing are picked uniformly at
+    random; with HeuristicParams they are weighted by that policy.
+    """
+    def __init__(self, player_id, rng=None, seed=None, mode=None, endgame_threshold=ENDGAME_THRESHOLD,
+                 letters=None, time_control=UNLIMITED, params=None, rule=None):
+        super().__init__(player_id, letters)
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.mode = mode
+        self.endgame_threshold = endgame_threshold
+        # Job specs sent as JSON carry the time control as a [per_move, per_game] list
+        self.time_control = time_control if isinstance(time_control, TimeControl) else TimeControl(*time_control)
+        self.time_used = 0.0
+        self.params = params if params is None or isinstance(params, HeuristicParams) else HeuristicParams(*params)
+        self.rule = rule or DEFAULT_RULE
     
     def make_move(self, board, size, found, sos_checker):
-        sos_move = self._find_sos_completing_move(board, size, found, sos_checker)
+        start = time.perf_counter()
+        empty = sum(row.count("") for row in board)
+        deadline = Deadline(self.time_control.move_budget(self.time_used, empty))
+        try:
+            return self.choose_move(board, size, found, sos_checker, deadline)
+        finally:
+            self.time_used += time.perf_counter() - start
+
+    def clone(self):
+        """ Independent copy with the same settings, random state and time used, for thinking ahead off the live game """
+        other = copy.copy(self)
+        other.rng = random.Random()
+        other.rng.setstate(self.rng.getstate())
+        return other
+
+    def choose_move(self, board, size, found, sos_checker, deadline):
+        """
+        Any-time move choice. Searches poll the deadline and stop early; the
+        best move found by then is played, else a random one.
+        """
+        # The exact endgame solver only knows classic SOS
+        if self.mode == "general" and self.endgame_threshold and self.rule == DEFAULT_RULE:
+            empty = sum(row.count("") for row in board)
+            if 0 < empty <= self.endgame_threshold:
+                from solver import solve_general_endgame  # Search code is only loaded when needed
+                solved = solve_general_endgame(board, size, deadline)
+                if solved is not None:
+                    return solved[1]
+        sos_move = self._find_sos_completing_move(board, size, found, sos_checker, deadline)
         if sos_move:
             return sos_move
+        if self.params is not None:
+            return self._play_weighted_move(board, size)
         return self._play_random_move(board, size)
     
-    def _find_sos_completing_move(self, board, size, found, sos_checker):
+    def _find_sos_completing_move(self, board, size, found, sos_checker, deadline=None):
         """
         Searches for a move that will complete an SOS sequence.
         For every empty cell, tries placing 'S' and 'O' to see if it creates SOS.
+        Gives up with None once the deadline passes.
         """
-        for r in range(size):
-            for c in range(size):
+        for r in range(len(board)):
+            if deadline is not None and deadline.expired():
+                return None
+            for c in range(len(board[r])):
                 if board[r][c] == "":
-                    for letter in VALID_LETTERS:
+                    for letter in self._letter_order():
                         board[r][c] = letter
                         if self._check_creates_new_sos(board, size, found, sos_checker):
                             board[r][c] = ""
-                            print(f"SOS Candidate found: {letter} at {r},{c}")
+                            logger.info("SOS Candidate found: %s at %d,%d", letter, r, c)
                             return (r, c, letter)
                         board[r][c] = ""
         return None
@@ -71,41 +409,155 @@ class ComputerPlayer(Player):
             if sos_id not in found:
                 return True
         return False
+
+    def _letter_order(self):
+        if self.params is not None and self.params.letter_preference < 0:
+            return self.letters[::-1]
+        return self.letters
     
     def _play_random_move(self, board, size):
         """Plays random letter in random empty cell if no SOS sequence can be formed"""
-        empty_cells = [(r, c) for r in range(size) for c in range(size) if board[r][c] == ""]
+        empty_cells = [(r, c) for r, row in enumerate(board) for c, cell in enumerate(row) if cell == ""]
         
         if empty_cells:
-            r, c = random.choice(empty_cells)
-            letter = random.choice(VALID_LETTERS)
-            print(f"No SOS found, randomly placing {letter} at {r},{c}")
+            r, c = self.rng.choice(empty_cells)
+            letter = self.rng.choice(self.letters)
+            logger.info("No SOS found, randomly placing %s at %d,%d", letter, r, c)
             return (r, c, letter)
         return None
 
+    def _play_weighted_move(self, board, size):
+        """ Samples a move that completes nothing by its HeuristicParams score """
+        from analysis import GIFT, letter_outcome  # Only tuned players pay for the gift check
+        params = self.params
+        rows, cols = board_shape(size)
+        center_r, center_c = (rows - 1) / 2, (cols - 1) / 2
+        reach = max(center_r + center_c, 1)
+        cell_windows = self.rule.windows(size)[1]
+        words = self.rule._words()
+        moves = []
+        scores = []
+        for r in range(rows):
+            for c in range(cols):
+                if board[r][c] != "":
+                    continue
+                closeness = 1 - (abs(r - center_r) + abs(c - center_c)) / reach
+                for letter in self.letters:
+                    score = params.center_bias * closeness
+                    score += params.letter_preference if letter == LETTER_S else -params.letter_preference
+                    if letter_outcome(board, cell_windows[r][c], r, c, letter, words) == GIFT:
+                        score -= params.gift_penalty
+                    moves.append((r, c, letter))
+                    scores.append(score)
+        if not moves:
+            return None
+        top = max(scores)
+        if params.temperature <= 0:
+            return self.rng.choice([move for move, score in zip(moves, scores) if score == top])
+        weights = [math.exp((score - top) / params.temperature) for score in scores]
+        r, c, letter = self.rng.choices(moves, weights)[0]
+        logger.info("No SOS found, placing %s at %d,%d by heuristic", letter, r, c)
+        return (r, c, letter)
+
 # --- Main Game Logic Controller ---
 class GameLogic:
     """
     Coordinator class that manages players and game mode.
     Uses Strategy pattern for different player types and game modes.
     """
-    def __init__(self, size, mode="simple", p1_type="human", p2_type="human"):
-        if not isinstance(size, int) or size < MIN_BOARD_SIZE or size > MAX_BOARD_SIZE:
+    def __init__(self, size, mode="simple", p1_type="human", p2_type="human", seed=None, rule=None,
+                 time_control=UNLIMITED):
+        # size is n for an n x n board or (rows, cols) for a rectangular one
+        rows, cols = board_shape(size) if size is not None else (None, None)
+        if not all(isinstance(n, int) and MIN_BOARD_SIZE <= n <= MAX_BOARD_SIZE for n in (rows, cols)):
             raise ValueError(f"Board size must be between {MIN_BOARD_SIZE} and {MAX_BOARD_SIZE}")
+        size = rows if rows == cols else (rows, cols)
         
         self.mode = mode
+        self.p1_type = p1_type
+        self.p2_type = p2_type
+        self.seed = seed
+        self.rule = rule or DEFAULT_RULE
+        self.time_control = time_control
         
-        # Create player objects with appropriate types
-        self.p1 = HumanPlayer(PLAYER_1) if p1_type == "human" else ComputerPlayer(PLAYER_1)
-        self.p2 = HumanPlayer(PLAYER_2) if p2_type == "human" else ComputerPlayer(PLAYER_2)
+        # Create player objects with appropriate types. A game seed is split
+        # into one independent stream per CPU player.
+        seeds = random.Random(seed)
+        p1_seed, p2_seed = (seeds.getrandbits(64), seeds.getrandbits(64)) if seed is not None else (None, None)
+        self.p1 = self._create_player(PLAYER_1, p1_type, p1_seed)
+        self.p2 = self._create_player(PLAYER_2, p2_type, p2_seed)
         
         # Create game mode instance
+        self.game_mode = self._create_game_mode(size, mode, self.rule)
+
+    def _create_player(self, player_id, player_type, seed):
+        if player_type == "human":
+            return HumanPlayer(player_id, self.rule.letters)
+        return ComputerPlayer(player_id, seed=seed, mode=self.mode, endgame_threshold=self._endgame_threshold(),
+                              letters=self.rule.letters, time_control=self.time_control, rule=self.rule)
+
+    def _endgame_threshold(self):
+        # The exact endgame solver only knows classic SOS
+        return ENDGAME_THRESHOLD if self.rule == DEFAULT_RULE else 0
+
+    def _update_player(self, player, rule_changed):
+        """
+        Points a player at the current mode and rule in place, so custom
+        players keep their settings and CPUs keep their random state. The
+        endgame threshold is only reset when the rule changes.
+        """
+        player.letters = tuple(self.rule.letters)
+        if player.selected_letter not in player.letters:
+            player.selected_letter = player.letters[0]
+        if isinstance(player, ComputerPlayer):
+            player.mode = self.mode
+            player.rule = self.rule
+            if rule_changed:
+                player.endgame_threshold = self._endgame_threshold()
+
+    @staticmethod
+    def _create_game_mode(size, mode, rule=None):
         if mode == 'simple':
-            self.game_mode = SimpleGame(size)
+            return SimpleGame(size, rule)
         elif mode == 'general':
-            self.game_mode = GeneralGame(size)
-        else:
-            raise ValueError(f"Invalid mode: {mode}")
+            return GeneralGame(size, rule)
+        raise ValueError(f"Invalid mode: {mode}")
+
+    @classmethod
+    def from_snapshot(cls, snapshot, p1_type="human", p2_type="human", time_control=UNLIMITED):
+        """ Builds a new game positioned at the given snapshot """
+        logic = cls(snapshot.size, snapshot.mode, p1_type, p2_type, rule=snapshot.rule, time_control=time_control)
+        logic.game_mode.restore(snapshot)
+        return logic
+
+    def play_moves(self, moves, record_events=False):
+        """
+        Applies a sequence of (row, col, letter) moves in one call.
+        Returns (snapshot, events) where events is a list of
+        (player, row, col, letter, sos_ids) tuples, or None unless record_events is set.
+        """
+        events = self.game_mode.play_moves(moves, record_events)
+        return self.snapshot(), events
+
+    def snapshot(self):
+        """ Returns a GameSnapshot of the current position """
+        return self.game_mode.snapshot()
+
+    def restore(self, snapshot):
+        """ Rewinds this game to a snapshot, switching size, mode or rule (and the players with them) if needed """
+        if (snapshot.mode != self.mode or snapshot.size != self.game_mode.get_size()
+                or snapshot.rule != self.game_mode.rule):
+            rule_changed = snapshot.rule != self.rule
+            self.mode = snapshot.mode
+            self.rule = snapshot.rule
+            self.game_mode = self._create_game_mode(snapshot.size, snapshot.mode, snapshot.rule)
+            self._update_player(self.p1, rule_changed)
+            self._update_player(self.p2, rule_changed)
+        self.game_mode.restore(snapshot)
+
+    def clone(self):
+        """ Returns an independent copy of this game with the same player types """
+        return GameLogic.from_snapshot(self.snapshot(), self.p1_type, self.p2_type, self.time_control)
 
     def place_letter(self, row, col, letter):
         return self.game_mode.place_letter(row, col, letter)
@@ -119,7 +571,7 @@ class GameLogic:
                 self.game_mode.get_board(),
                 self.game_mode.get_size(),
                 self.game_mode.get_found(),
-                BaseGame._scan_sos_static
+                self.game_mode.rule.scan
             )
         return None
 
@@ -137,11 +589,15 @@ class GameLogic:
 
 # --- Base Game Class ---
 class BaseGame:
-    def __init__(self, size):
+    MODE = None
+
+    def __init__(self, size, rule=None):
         self._size = size
-        self._board = [["" for _ in range(size)] for _ in range(size)]
+        self._rows, self._cols = board_shape(size)
+        self.rule = rule or DEFAULT_RULE
+        self._board = [["" for _ in range(self._cols)] for _ in range(self._rows)]
         self._current_player = PLAYER_1
-        self._found = set()  # Tracks found SOS sequences to avoid duplicates
+        self._found = SOSRegistry(size)  # Tracks found SOS sequences to avoid duplicates
     
     def get_board(self):
         return self._board
@@ -149,68 +605,99 @@ class BaseGame:
     def get_size(self):
         return self._size
 
+    def get_shape(self):
+        return self._rows, self._cols
+
     def switch_turn(self):
-        print("Switching Turn")
+        logger.info("Switching Turn")
         self._current_player = PLAYER_2 if self._current_player == PLAYER_1 else PLAYER_1
 
     def get_current_player(self):
         return self._current_player
     
     def get_found(self):
-        """Returns copy of found SOS sequences"""
-        return self._found.copy()
+        """Returns a read-only live view of found SOS sequences"""
+        return self._found.view()
 
     @staticmethod
     def _scan_sos_static(board, size):
         """ Simulates and scans for candidate SOS sequences """
-        found_local = []
-        for r in range(size):
-            for c in range(size - 2):
-                if board[r][c:c+3] == [LETTER_S, LETTER_O, LETTER_S]:
-                    found_local.append(('H', r, c))
-        for c in range(size):
-            for r in range(size - 2):
-                if [board[r+i][c] for i in range(3)] == [LETTER_S, LETTER_O, LETTER_S]:
-                    found_local.append(('V', r, c))
-        for r in range(size - 2):
-            for c in range(size - 2):
-                if [board[r+i][c+i] for i in range(3)] == [LETTER_S, LETTER_O, LETTER_S]:
-                    found_local.append(('D1', r, c))
-        for r in range(size - 2):
-            for c in range(2, size):
-                if [board[r+i][c-i] for i in range(3)] == [LETTER_S, LETTER_O, LETTER_S]:
-                    found_local.append(('D2', r, c))
-        return found_local
-
-    def _sos_check(self):
-        """ Finds new SOS sequences, updates _found, and returns their coordinates. """
-        new_sos = []
-        all_sos = BaseGame._scan_sos_static(self._board, self._size)
+        return DEFAULT_RULE.scan(board, size)
 
-        for sos_id in all_sos:
-            if sos_id not in self._found:
-                self._found.add(sos_id)
-                direction, r, c = sos_id
+    def _new_sos_at(self, row, col):
+        """ Returns ids of unseen SOS sequences that pass through (row, col) """
+        new_sos = []
+        for sos_id in self.rule.matches_at(self._board, self._size, row, col):
+            if self._found.add(sos_id):
+                new_sos.append(sos_id)
+        return tuple(new_sos)
 
-                if direction == 'H':
-                    new_sos.append([(r, c), (r, c+1), (r, c+2)])
-                elif direction == 'V':
-                    new_sos.append([(r, c), (r+1, c), (r+2, c)])
-                elif direction == 'D1':
-                    new_sos.append([(r, c), (r+1, c+1), (r+2, c+2)])
-                else:  # D2
-                    new_sos.append([(r, c), (r+1, c-1), (r+2, c-2)])
+    def play_moves(self, moves, record_events=False):
+        """
+        Replays moves without per-move result objects, full board rescans or logging.
+        Only SOS sequences through each placed cell are checked.
+        Raises ValueError on an illegal move; earlier moves stay applied.
+        """
+        events = [] if record_events else None
+        board = self._board
+        rows, cols = self._rows, self._cols
+        empty = sum(row.count("") for row in board)
+        ended = empty == 0 or self._end_state()[0]
+        for index, (row, col, letter) in enumerate(moves):
+            if ended:
+                raise ValueError(f"Move {index} played after the game ended")
+            if letter not in self.rule.letters:
+                raise ValueError(f"Move {index}: invalid letter {letter}")
+            if not (0 <= row < rows and 0 <= col < cols) or board[row][col] != "":
+                raise ValueError(f"Move {index}: position ({row}, {col}) is not playable")
+            board[row][col] = letter
+            empty -= 1
+            player = self._current_player
+            new_sos = self._new_sos_at(row, col)
+            ended = self._after_replayed_move(new_sos, empty == 0)
+            if record_events:
+                events.append((player, row, col, letter, new_sos))
+        return events
+
+    def _after_replayed_move(self, new_sos, board_full):
+        """ Updates scores, end state and turn after a play_moves move; returns True if the game ended """
+        raise NotImplementedError
 
-        return new_sos
+    def snapshot(self):
+        cells = "".join(cell or EMPTY_CELL for row in self._board for cell in row)
+        p1_score, p2_score = self._score_state()
+        game_ended, winner = self._end_state()
+        return GameSnapshot(self.MODE, self._size, cells, tuple(sorted(self._found)),
+                            p1_score, p2_score, self._current_player, game_ended, winner, self.rule)
+
+    def restore(self, snapshot):
+        if snapshot.mode != self.MODE or snapshot.size != self._size or snapshot.rule != self.rule:
+            raise ValueError(f"Snapshot is for a {size_label(snapshot.size)} {snapshot.mode} game")
+        cols = self._cols
+        cells = snapshot.cells
+        self._board = [["" if cell == EMPTY_CELL else cell for cell in cells[r * cols:(r + 1) * cols]]
+                       for r in range(self._rows)]
+        self._found = SOSRegistry(self._size, snapshot.found)
+        self._current_player = snapshot.current_player
+        self._restore_state(snapshot)
+
+    def _score_state(self):
+        return 0, 0
+
+    def _end_state(self):
+        return False, None
+
+    def _restore_state(self, snapshot):
+        pass
 
     def is_valid_move(self, row, col):
-        if not (0 <= row < self._size and 0 <= col < self._size):
+        if not (0 <= row < self._rows and 0 <= col < self._cols):
             raise ValueError(f"Position ({row}, {col}) out of bounds")
         return self._board[row][col] == ""
     
     def update_board(self, row, col, letter):
-        if letter not in VALID_LETTERS:
-            raise ValueError(f"Invalid letter: {letter}. Must be 'S' or 'O'")
+        if letter not in self.rule.letters:
+            raise ValueError(f"Invalid letter: {letter}. Must be one of {', '.join(self.rule.letters)}")
         self._board[row][col] = letter
     
     def is_board_full(self):
@@ -218,18 +705,38 @@ class BaseGame:
 
 # --- Simple Game ---
 class SimpleGame(BaseGame):
-    def __init__(self, size):
-        super().__init__(size)
+    MODE = "simple"
+
+    def __init__(self, size, rule=None):
+        super().__init__(size, rule)
         self._winner = None
         self._game_ended = False
 
+    def _end_state(self):
+        return self._game_ended, self._winner
+
+    def _after_replayed_move(self, new_sos, board_full):
+        if new_sos:
+            self._winner = self._current_player
+            self._game_ended = True
+        elif board_full:
+            self._winner = "draw"
+            self._game_ended = True
+        else:
+            self._current_player = PLAYER_2 if self._current_player == PLAYER_1 else PLAYER_1
+        return self._game_ended
+
+    def _restore_state(self, snapshot):
+        self._game_ended = snapshot.game_ended
+        self._winner = snapshot.winner
+
     def place_letter(self, row, col, letter):
         try:
             if not self.is_valid_move(row, col):
-                return {"valid": False, "sos_found": 0, "game_over": False, "winner": None, "sos_list": []}
+                return INVALID_MOVE
 
             self.update_board(row, col, letter)
-            sos_list = self._sos_check()
+            sos_list = self._new_sos_at(row, col)
             board_full = self.is_board_full()
 
             # Simple game: first SOS wins immediately
@@ -244,10 +751,9 @@ class SimpleGame(BaseGame):
             if not self._game_ended:
                 self.switch_turn()
 
-            return {"valid": True, "sos_found": len(sos_list), "game_over": self._game_ended, "winner": self._winner,"sos_list": sos_list
-            }
+            return MoveResult(True, self._game_ended, self._winner, sos_list, self.rule.length)
         except ValueError:
-            return {"valid": False, "sos_found": 0, "game_over": False, "winner": None, "sos_list": []}
+            return INVALID_MOVE
 
     def game_over(self):
         """Game is over if someone created an SOS or board is full"""
@@ -259,10 +765,34 @@ class SimpleGame(BaseGame):
 
 # --- General Game ---
 class GeneralGame(BaseGame):
-    def __init__(self, size):
-        super().__init__(size)
+    MODE = "general"
+
+    def __init__(self, size, rule=None):
+        super().__init__(size, rule)
         self._p1_score = 0
         self._p2_score = 0
+
+    def _score_state(self):
+        return self._p1_score, self._p2_score
+
+    def _end_state(self):
+        if self.is_board_full():
+            return True, self._determine_winner()
+        return False, None
+
+    def _after_replayed_move(self, new_sos, board_full):
+        if new_sos:
+            if self._current_player == PLAYER_1:
+                self._p1_score += len(new_sos)
+            else:
+                self._p2_score += len(new_sos)
+        else:
+            self._current_player = PLAYER_2 if self._current_player == PLAYER_1 else PLAYER_1
+        return board_full
+
+    def _restore_state(self, snapshot):
+        self._p1_score = snapshot.p1_score
+        self._p2_score = snapshot.p2_score
     
     def get_scores(self):
         """Return current scores for both players"""
@@ -271,10 +801,10 @@ class GeneralGame(BaseGame):
     def place_letter(self, row, col, letter):
         try:
             if not self.is_valid_move(row, col):
-                return {"valid": False, "sos_found": 0, "game_over": False, "winner": None, "sos_list": []}
+                return INVALID_MOVE
 
             self.update_board(row, col, letter)
-            sos_list = self._sos_check()
+            sos_list = self._new_sos_at(row, col)
 
             # Award points to current player for each SOS found
             if self.get_current_player() == PLAYER_1:
@@ -291,10 +821,9 @@ class GeneralGame(BaseGame):
             if not sos_list:
                 self.switch_turn()
 
-            return {"valid": True, "sos_found": len(sos_list), "game_over": board_full, "winner": winner, "sos_list": sos_list
-            }
+            return MoveResult(True, board_full, winner, sos_list, self.rule.length)
         except ValueError:
-            return {"valid": False, "sos_found": 0, "game_over": False, "winner": None, "sos_list": []}
+            return INVALID_MOVE
 
     def _determine_winner(self):
         """Determine winner based on final scores"""
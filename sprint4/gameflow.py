@@ -0,0 +1,398 @@
+"""
+Turn flow for a page showing one SOS game, kept apart from any widget toolkit.
+GameFlow handles clicks, CPU turns, fast-forward, highlighting and game over,
+draws through a Renderer and schedules delayed work on a clock with Tk's
+after(ms, callback, *args) signature. GamePage plugs in a Tk renderer and
+itself as the clock; a NullRenderer or RecordingRenderer with a VirtualClock
+runs the same flow without a display at engine speed.
+"""
+import heapq
+import itertools
+import logging
+import time
+
+from analysis import best_outcome
+from gameLogic import ComputerPlayer, PLAYER_1, PLAYER_2, LETTER_S
+
+P1_COLOR = "cyan"
+P2_COLOR = "red"
+CPU_MOVE_DELAY = 250
+FAST_FORWARD_FRAME = 10  # CPU moves between repaints in fast-forward; 0 repaints only the final board
+FAST_FORWARD_SLICE = 0.02  # Seconds of CPU moves between UI event checks when only the final board is drawn
+ANALYSIS_POLL = 50  # Milliseconds between pulls of finished move analysis
+
+logger = logging.getLogger(__name__)
+
+# --- Renderers ---
+class Renderer:
+    """ What GameFlow draws through. Every method is a no-op here """
+    def new_board(self, rows, cols, clickable):
+        pass
+
+    def set_cell(self, row, col, letter):
+        pass
+
+    def highlight(self, cells, color):
+        """ Colors cells as part of a line; None clears them """
+        pass
+
+    def set_scores(self, p1_score, p2_score):
+        pass
+
+    def set_status(self, text):
+        pass
+
+    def disable_board(self):
+        pass
+
+    def shade_cell(self, row, col, outcome):
+        """ Marks an empty cell with an analysis outcome; None clears it """
+        pass
+
+class NullRenderer(Renderer):
+    """ Draws nothing; for profiling the flow itself """
+
+class RecordingRenderer(Renderer):
+    """ Keeps every call in self.calls and the resulting screen state in plain attributes """
+    def __init__(self):
+        self.calls = []
+        self.cells = {}
+        self.highlights = {}
+        self.scores = (0, 0)
+        self.status = ""
+        self.clickable = False
+        self.shades = {}
+
+    def new_board(self, rows, cols, clickable):
+        self.calls.append(("new_board", rows, cols, clickable))
+        self.cells = {(r, c): "" for r in range(rows) for c in range(cols)}
+        self.highlights = {}
+        self.shades = {}
+        self.clickable = clickable
+
+    def set_cell(self, row, col, letter):
+        self.calls.append(("set_cell", row, col, letter))
+        self.cells[row, col] = letter
+
+    def highlight(self, cells, color):
+        self.calls.append(("highlight", tuple(cells), color))
+        for cell in cells:
+            if color is None:
+                self.highlights.pop(cell, None)
+            else:
+                self.highlights[cell] = color
+
+    def set_scores(self, p1_score, p2_score):
+        self.calls.append(("set_scores", p1_score, p2_score))
+        self.scores = (p1_score, p2_score)
+
+    def set_status(self, text):
+        self.calls.append(("set_status", text))
+        self.status = text
+
+    def disable_board(self):
+        self.calls.append(("disable_board",))
+        self.clickable = False
+
+    def shade_cell(self, row, col, outcome):
+        self.calls.append(("shade_cell", row, col, outcome))
+        if outcome is None:
+            self.shades.pop((row, col), None)
+        else:
+            self.shades[row, col] = outcome
+
+# --- Clock ---
+class VirtualClock:
+    """ Stand-in for Tk's after(): callbacks run in time order when the clock is advanced, not in real time """
+    def __init__(self):
+        self.now = 0
+        self._queue = []
+        self._order = itertools.count()
+
+    def after(self, delay, callback, *args):
+        heapq.heappush(self._queue, (self.now + delay, next(self._order), callback, args))
+
+    def pending(self):
+        return len(self._queue)
+
+    def advance(self, ms):
+        """ Runs everything due within the next ms milliseconds; returns how many callbacks ran """
+        return self._run_until(self.now + ms)
+
+    def run(self):
+        """ Runs callbacks, including ones they schedule, until none are left """
+        return self._run_until(None)
+
+    def _run_until(self, deadline):
+        ran = 0
+        while self._queue and (deadline is None or self._queue[0][0] <= deadline):
+            when, _, callback, args = heapq.heappop(self._queue)
+            self.now = when
+            callback(*args)
+            ran += 1
+        if deadline is not None:
+            self.now = deadline
+        return ran
+
+# --- Flow ---
+def line_positions(r1, c1, r2, c2):
+    """ Cells from (r1, c1) to (r2, c2) along a row, column or diagonal """
+    dr = r2 - r1
+    dc = c2 - c1
+    steps = max(abs(dr), abs(dc))
+
+    # Lines run horizontally, vertically or along a diagonal
+    if steps >= 2 and dr in (0, steps) and abs(dc) in (0, steps):
+        step_r = dr // steps
+        step_c = dc // steps
+        return [(r1 + i * step_r, c1 + i * step_c) for i in range(steps + 1)]
+    else:
+        logger.warning("Invalid line positions (%d,%d) to (%d,%d)", r1, c1, r2, c2)
+        return []
+
+class GameFlow:
+    """
+    Runs one game between its GameLogic and the screen. letter_for(player)
+    returns the letter a human has selected. A ponderer, if given, works out
+    CPU replies during human turns. An analyzer, if set, shades empty cells
+    with the outcome of playing there as moves come in. Valid moves are kept
+    in self.moves, and on_game_over, if set, is called with the final result.
+    """
+    def __init__(self, renderer=None, clock=None, ponderer=None, letter_for=None, cpu_delay=CPU_MOVE_DELAY):
+        self.renderer = renderer or NullRenderer()
+        self.clock = clock or VirtualClock()
+        self.ponderer = ponderer
+        self.letter_for = letter_for or (lambda player: LETTER_S)
+        self.cpu_delay = cpu_delay
+        self.logic = None
+        self.game_active = False
+        self.fast_forward = False
+        self.frame_interval = FAST_FORWARD_FRAME
+        self._pending_cells = []
+        self._pending_sos = []
+        self.analyzer = None
+        self._polling = False
+        self.moves = []
+        self.on_game_over = None
+
+    def new_board(self, logic):
+        """ Shows an empty board for logic; clicks are wired up unless both players are CPUs """
+        self.logic = logic
+        self.moves = []
+        rows, cols = logic.game_mode.get_shape()
+        clickable = not (isinstance(logic.p1, ComputerPlayer) and isinstance(logic.p2, ComputerPlayer))
+        self.renderer.new_board(rows, cols, clickable)
+        if self.analyzer:
+            self.analyzer.reset(logic)
+
+    def start(self):
+        """ Starts play; P1 moves first and may be a CPU """
+        self.game_active = True
+        self._poll_analysis()
+        self.cpu_check_and_play()
+
+    def stop(self):
+        self.game_active = False
+        if self.ponderer:
+            self.ponderer.cancel()
+
+    def set_analyzer(self, analyzer):
+        """ Turns the analysis overlay on with a MoveAnalyzer, or off with None """
+        if self.analyzer:
+            self.analyzer.close()
+            if self.logic:
+                self._clear_shades()
+        self.analyzer = analyzer
+        if analyzer and self.logic:
+            analyzer.reset(self.logic)
+            self._poll_analysis()
+
+    def _poll_analysis(self):
+        if self._polling or not self.analyzer or not self.game_active:
+            return
+        self._polling = True
+        self.clock.after(ANALYSIS_POLL, self._apply_analysis)
+
+    def _apply_analysis(self):
+        self._polling = False
+        if not self.analyzer or not self.game_active:
+            return
+        board = self.logic.game_mode.get_board()
+        for row, col, outcomes in self.analyzer.drain():
+            # Results for cells filled since the job was queued are stale
+            if board[row][col] == "":
+                self.renderer.shade_cell(row, col, best_outcome(outcomes))
+        self._poll_analysis()
+
+    def _clear_shades(self):
+        rows, cols = self.logic.game_mode.get_shape()
+        board = self.logic.game_mode.get_board()
+        for r in range(rows):
+            for c in range(cols):
+                if board[r][c] == "":
+                    self.renderer.shade_cell(r, c, None)
+
+    def _placed(self, row, col, letter):
+        result = self.logic.place_letter(row, col, letter)
+        if result["valid"]:
+            self.moves.append((row, col, letter))
+            if self.analyzer:
+                self.analyzer.moved(self.logic, row, col)
+        return result
+
+    def handle_click(self, row, col, letter=None):
+        """ A human move; ignored once the game is over or while a CPU is to move """
+        if not self.game_active or self.cpu_to_move():
+            return
+        self._play(row, col, letter)
+
+    def _play(self, row, col, letter=None):
+        if not self.is_valid_move(row, col):
+            return
+        if letter is None:
+            letter = self.letter_for(self.logic.get_current_player())
+
+        color = self._player_color()
+        result = self._placed(row, col, letter)
+        self.renderer.set_cell(row, col, letter)
+        self.process_result(result, color)
+
+    def is_valid_move(self, row, col):
+        return self.logic.game_mode.get_board()[row][col] == ""
+
+    def process_result(self, result, color=None):
+        if result["sos_found"] > 0:
+            self.draw_sos_sequences(result["sos_list"], color)
+            self.update_scores()
+
+        if result["game_over"]:
+            self.handle_game_over(result)
+        else:
+            self.update_turn_status()
+            self.cpu_check_and_play()
+
+    def cpu_to_move(self):
+        current = self.logic.p1 if self.logic.get_current_player() == PLAYER_1 else self.logic.p2
+        return isinstance(current, ComputerPlayer)
+
+    def cpu_check_and_play(self):
+        if not self.game_active:
+            return
+        if not self.cpu_to_move():
+            # Human to move: work out CPU replies while they decide
+            if self.ponderer:
+                self.ponderer.start(self.logic)
+            return
+        if self.fast_forward:
+            self._pending_cells = []
+            self._pending_sos = []
+            self.clock.after(0, self._fast_forward_step)
+            return
+        cpu_move = (self.ponderer and self.ponderer.lookup(self.logic)) or self.logic.get_cpu_move()
+        if cpu_move:
+            logger.info("CPU move result: %s", cpu_move)
+            row, col, letter = cpu_move
+            self.clock.after(self.cpu_delay, self._execute_cpu_move, row, col, letter)
+
+    def _execute_cpu_move(self, row, col, letter):
+        if not self.game_active:
+            return
+        self._play(row, col, letter)
+
+    def _fast_forward_step(self):
+        """ Plays a batch of CPU moves without repainting, then yields to the event loop """
+        if not self.game_active:
+            return
+        result = None
+        played = 0
+        end = time.perf_counter() + FAST_FORWARD_SLICE
+        while self._batch_has_room(played, end):
+            if not self.fast_forward or not self.cpu_to_move():
+                break
+            played += 1
+            color = self._player_color()
+            row, col, letter = self.logic.get_cpu_move()
+            result = self._placed(row, col, letter)
+            self._pending_cells.append((row, col, letter))
+            if result["sos_found"]:
+                self._pending_sos.append((result["sos_list"], color))
+            if result["game_over"]:
+                break
+
+        if result is not None and result["game_over"]:
+            self._render_pending()
+            self.handle_game_over(result)
+        elif self.fast_forward and self.cpu_to_move():
+            if self.frame_interval:
+                self._render_pending()
+                self.update_turn_status()
+            self.clock.after(0, self._fast_forward_step)
+        else:
+            # Fast-forward switched off or a human is up: draw and continue normally
+            self._render_pending()
+            self.update_turn_status()
+            self.cpu_check_and_play()
+
+    def _batch_has_room(self, played, end):
+        """
+        frame_interval moves per batch; when only the final board is drawn,
+        as many as fit in FAST_FORWARD_SLICE, because CPU moves on large
+        boards are slow enough that a fixed count would freeze the window
+        """
+        if self.frame_interval:
+            return played < self.frame_interval
+        return not played or time.perf_counter() < end
+
+    def _render_pending(self):
+        """ Draws the letters and SOS lines played since the last repaint """
+        for row, col, letter in self._pending_cells:
+            self.renderer.set_cell(row, col, letter)
+        for sos_list, color in self._pending_sos:
+            self.draw_sos_sequences(sos_list, color)
+        self._pending_cells = []
+        self._pending_sos = []
+        self.update_scores()
+
+    def _player_color(self):
+        return P1_COLOR if self.logic.get_current_player() == PLAYER_1 else P2_COLOR
+
+    def draw_sos_sequences(self, sos_list, color=None):
+        if color is None:
+            color = self._player_color()
+        for sequence in sos_list:
+            r1, c1 = sequence[0]
+            r2, c2 = sequence[-1]
+            self.renderer.highlight(line_positions(r1, c1, r2, c2), color)
+
+    def handle_game_over(self, result):
+        self.stop()
+        if self.analyzer:
+            self._clear_shades()
+        self.renderer.disable_board()
+        self.renderer.set_status(self.winner_text(result))
+        if self.on_game_over:
+            self.on_game_over(result)
+
+    def winner_text(self, result):
+        if result["winner"]:
+            if result["winner"] == "draw":
+                return "Draw!"
+            else:
+                return f"{result['winner'].upper()} Wins!"
+        else:
+            scores = self.logic.get_scores()
+            if scores[PLAYER_1] > scores[PLAYER_2]:
+                return "P1 Wins!"
+            elif scores[PLAYER_1] < scores[PLAYER_2]:
+                return "P2 Wins!"
+            else:
+                return "Draw!"
+
+    def update_turn_status(self):
+        current = "P1" if self.logic.get_current_player() == PLAYER_1 else "P2"
+        self.renderer.set_status(f"Current Turn: {current}")
+
+    def update_scores(self):
+        if self.logic.game_mode.MODE == "general":
+            scores = self.logic.get_scores()
+            self.renderer.set_scores(scores[PLAYER_1], scores[PLAYER_2])
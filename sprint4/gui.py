@@ -1,5 +1,10 @@
+import logging
 import tkinter as tk
-from gameLogic import GameLogic, PLAYER_1, PLAYER_2
+from gameLogic import GameLogic, TimeControl, PLAYER_1, PLAYER_2, board_shape, parse_board_size
+from gameflow import GameFlow, Renderer, P1_COLOR, P2_COLOR, CPU_MOVE_DELAY
+from ponder import Ponderer
+from analysis import MoveAnalyzer, SCORES, SAFE, GIFT
+from replay import Replay, ReplayViewer
 
 DEF_FONT_SIZE = 20
 DEF_FONT = "Arial"
@@ -13,9 +18,8 @@ ALERT_TOP_PADDING = 20
 PANEL_WIDTH = 200
 BOARD_SIZE = 600
 SCORE_SIZE = 72
-P1_COLOR = "cyan"
-P2_COLOR = "red"
-CPU_MOVE_DELAY = 250
+ANALYSIS_COLORS = {SCORES: "pale green", SAFE: "light yellow", GIFT: "misty rose"}
+CPU_THINK_TIME = CPU_MOVE_DELAY / 1000  # Seconds; CPU moves are ready by the time they are shown
 
 class MenuPage(tk.Frame):
     def __init__(self, parent, controller):
@@ -46,7 +50,7 @@ class MenuPage(tk.Frame):
             rb.pack(pady=5)
 
     def create_grid_size_input(self):
-        grid_label = tk.Label(self.inner_frame, text="Enter Grid Size (e.g., 3, 5, 7):", font=(DEF_FONT, SMALL_FONT_SIZE), fg="white")
+        grid_label = tk.Label(self.inner_frame, text="Enter Grid Size (e.g., 3, 5, 7 or 5x9):", font=(DEF_FONT, SMALL_FONT_SIZE), fg="white")
         grid_label.pack(pady=(SECTION_TOP_PADDING, SECTION_BOTTOM_PADDING))
         self.entry = tk.Entry(self.inner_frame, width=ENTRY_WIDTH, font=(DEF_FONT, SMALL_FONT_SIZE))
         self.entry.pack(pady=5)
@@ -78,8 +82,8 @@ class MenuPage(tk.Frame):
             self.alert_label.config(text="Enter a value for board size.")
             return
         try:
-            size = int(value)
-            if size < 3 or size > 15:
+            size = parse_board_size(value)
+            if min(board_shape(size)) < 3 or max(board_shape(size)) > 15:
                 raise ValueError()
             mode = self.selected_option.get()
             if not mode:
@@ -97,8 +101,8 @@ class MenuPage(tk.Frame):
             self.alert_label.config(text="Enter a value for board size.")
             return
         try:
-            size = int(value)
-            if size < 3 or size > 15:
+            size = parse_board_size(value)
+            if min(board_shape(size)) < 3 or max(board_shape(size)) > 15:
                 raise ValueError()
             mode = self.selected_option.get()
             if not mode:
@@ -116,10 +120,12 @@ class GamePage(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
-        self.game_active = False
 
         self.btn_pixel = 0
         self.labels = []
+        self.flow = GameFlow(TkRenderer(self), clock=self, ponderer=Ponderer(), letter_for=self._get_player_letter)
+        self.flow.on_game_over = self._game_finished
+        self.viewer = None
 
         self._main_layout()
         self._left_panel()
@@ -193,8 +199,29 @@ class GamePage(tk.Frame):
         self.new_game_btn = tk.Button(self.bottom_frame, text="New Game", font=(DEF_FONT, DEF_FONT_SIZE), command=self.new_game)
         self.new_game_btn.grid(row=1, column=0, pady=(BUTTON_PADDING, 0))
 
+        # Fast-forward plays CPU turns at engine speed; unticking it resumes step-by-step play
+        self.fast_forward = tk.BooleanVar(value=False)
+        self.fast_forward.trace_add("write", lambda *_: setattr(self.flow, "fast_forward", self.fast_forward.get()))
+        self.fast_forward_btn = tk.Checkbutton(self.bottom_frame, text="Fast Forward", variable=self.fast_forward,
+                                               fg="white", font=(DEF_FONT, SMALL_FONT_SIZE))
+        self.fast_forward_btn.grid(row=2, column=0, pady=(BUTTON_PADDING, 0))
+
+        # Analysis overlay shades each empty cell: green scores, yellow is safe, pink gifts the opponent a line
+        self.show_analysis = tk.BooleanVar(value=False)
+        self.show_analysis_btn = tk.Checkbutton(self.bottom_frame, text="Show Analysis", variable=self.show_analysis,
+                                                fg="white", font=(DEF_FONT, SMALL_FONT_SIZE),
+                                                command=self._toggle_analysis)
+        self.show_analysis_btn.grid(row=3, column=0, pady=(BUTTON_PADDING, 0))
+
+        # Replay controls appear once a game is over; the slider scrubs through its moves
+        self.replay_btn = tk.Button(self.bottom_frame, text="Replay", font=(DEF_FONT, SMALL_FONT_SIZE),
+                                    command=self._start_replay)
+        self.replay_scale = tk.Scale(self.bottom_frame, from_=0, to=0, orient="horizontal", showvalue=False,
+                                     length=BOARD_SIZE // 2, command=self._seek_replay)
+
     def set_logic(self, logic):
         self.logic = logic
+        self.flow.logic = logic
 
     def update_mode_label(self):
         self.mode_label.config(text=f"{self.controller.mode.capitalize()} Game")
@@ -233,29 +260,17 @@ class GamePage(tk.Frame):
             self.right_o_button.pack(pady=5)
   
     def create_board(self):
-        for widget in self.board_frame.winfo_children():
-            widget.destroy()
-
-        size = self.controller.grid_size
-        board_pixel = BOARD_SIZE
-        self.btn_pixel = board_pixel // size
-
-        self.labels = [[None for _ in range(size)] for _ in range(size)]
+        self.flow.new_board(self.logic)
 
-        for r in range(size):
-            for c in range(size):
-                lbl = tk.Label(self.board_frame, text="", font=("Arial", max(12, self.btn_pixel // 2)),
-                               fg="black", bg="white", relief="solid", borderwidth=1)
-                lbl.place(x=c * self.btn_pixel, y=r * self.btn_pixel, width=self.btn_pixel, height=self.btn_pixel)
-                # Enables clicking only when it's human turn
-                if self.controller.p1_cpu_toggle == 0 or self.controller.p2_cpu_toggle == 0:
-                    lbl.bind("<Button-1>", lambda e, row=r, col=c: self.handle_click(row, col))
-                self.labels[r][c] = lbl
+    @property
+    def game_active(self):
+        return self.flow.game_active
 
     def new_game(self):
-        self.game_active = False
-        for widget in self.board_frame.winfo_children():
-            widget.destroy()
+        self.flow.stop()
+        self.viewer = None
+        self.replay_btn.grid_remove()
+        self.replay_scale.grid_remove()
         self.turn_label.config(text="Current Turn: P1")
 
         self.left_score_label.config(text="0")
@@ -264,116 +279,105 @@ class GamePage(tk.Frame):
         self.controller.show_frame("MenuPage")
 
     def handle_click(self, row, col, letter=None):
-        if not self._is_valid_move(row, col):
-            return
-        if letter is None:
-            letter = self._get_player_letter()
-       
-        result = self.logic.place_letter(row, col, letter)
-        self._update_cell(row, col, letter)
-        self._process_result(result)
-
-    def _is_valid_move(self, row, col):
-        return self.labels[row][col]["text"] == ""
-
-    def _get_player_letter(self):
-        current_player = self.logic.get_current_player()
+        self.flow.handle_click(row, col, letter)
+
+    def _game_finished(self, result):
+        self.replay_btn.grid(row=4, column=0, pady=(BUTTON_PADDING, 0))
+
+    def _start_replay(self):
+        game = self.logic.game_mode
+        replay = Replay(game.get_size(), self.logic.mode, self.flow.moves, rule=game.rule)
+        rows, cols = game.get_shape()
+        self.flow.renderer.new_board(rows, cols, False)
+        self.viewer = ReplayViewer(replay, self.flow.renderer, {PLAYER_1: P1_COLOR, PLAYER_2: P2_COLOR})
+        self.replay_scale.config(to=len(replay))
+        self.replay_scale.grid(row=5, column=0)
+        self.replay_scale.set(len(replay))
+        self.viewer.seek(len(replay))
+
+    def _seek_replay(self, value):
+        if self.viewer:
+            self.viewer.seek(int(value))
+
+    def _toggle_analysis(self):
+        self.flow.set_analyzer(MoveAnalyzer() if self.show_analysis.get() else None)
+
+    def _get_player_letter(self, current_player):
         if current_player == PLAYER_1:
             return self.left_choice.get()
         else:
             return self.right_choice.get()
 
-    def _update_cell(self, row, col, letter):
-        self.labels[row][col].config(text=letter, fg="black")
+class TkRenderer(Renderer):
+    """ Draws a GameFlow onto a GamePage's widgets """
+    def __init__(self, page):
+        self.page = page
+        self._pool = []  # Cell labels kept across games, in row-major order
+        self._shape = None
+
+    def new_board(self, rows, cols, clickable):
+        """ Resets the pooled cells in place; labels are only created, destroyed or moved when the size changes """
+        page = self.page
+        pool = self._pool
+        resized = self._shape != (rows, cols)
+        if resized:
+            page.btn_pixel = BOARD_SIZE // max(rows, cols)
+            while len(pool) < rows * cols:
+                pool.append(tk.Label(page.board_frame, relief="solid", borderwidth=1))
+            for lbl in pool[rows * cols:]:
+                lbl.destroy()
+            del pool[rows * cols:]
+            page.labels = [pool[r * cols:(r + 1) * cols] for r in range(rows)]
+            self._shape = (rows, cols)
+
+        for r in range(rows):
+            for c in range(cols):
+                lbl = page.labels[r][c]
+                lbl.config(text="", fg="black", bg="white")
+                if resized:
+                    lbl.config(font=("Arial", max(12, page.btn_pixel // 2)))
+                    lbl.place(x=c * page.btn_pixel, y=r * page.btn_pixel, width=page.btn_pixel, height=page.btn_pixel)
+                # Enables clicking only when it's human turn
+                if clickable:
+                    lbl.bind("<Button-1>", lambda e, row=r, col=c: page.handle_click(row, col))
+                else:
+                    lbl.unbind("<Button-1>")
 
-    def _cpu_check_and_play(self):
-        if not self.game_active:
-            return
-        cpu_move = self.logic.get_cpu_move()
-        if cpu_move:
-            print(f"CPU move result: {cpu_move}")
-            row, col, letter = cpu_move
-            self.after(CPU_MOVE_DELAY, lambda: self._execute_cpu_move(row, col, letter))
-    
-    def _execute_cpu_move(self, row, col, letter):
-        if not self.game_active:
-            return
-        self.handle_click(row, col, letter)
+    def set_cell(self, row, col, letter):
+        self.page.labels[row][col].config(text=letter, fg="black", bg="white")
 
-    def _process_result(self, result):
-        if result["sos_found"] > 0:
-            self._draw_sos_sequences(result["sos_list"])
-            self._update_scores()
+    def highlight(self, cells, color):
+        for r, c in cells:
+            self.page.labels[r][c].config(bg=color or "white")
 
-        if result["game_over"]:
-            self._handle_game_over(result)
-        else:
-            self._update_turn_label()
-            self._cpu_check_and_play()
-            
-    def _draw_sos_sequences(self, sos_list):
-        color = P1_COLOR if self.logic.get_current_player() == PLAYER_1 else P2_COLOR
-        for sequence in sos_list:
-            r1, c1 = sequence[0]
-            r2, c2 = sequence[2]
-            self._draw_line(r1, c1, r2, c2, color)
-
-    def _handle_game_over(self, result):
-        self.game_active = False
-        self._disable_board()
-        winner_text = self._get_winner_text(result)
-        self.turn_label.config(text=winner_text)
-
-    def _disable_board(self):
-        for r in range(self.controller.grid_size):
-            for c in range(self.controller.grid_size):
-                self.labels[r][c].unbind("<Button-1>")
-
-    def _get_winner_text(self, result):
-        if result["winner"]:
-            if result["winner"] == "draw":
-                return "Draw!"
-            else:
-                return f"{result['winner'].upper()} Wins!"
-        else:
-            scores = self.logic.get_scores()
-            if scores[PLAYER_1] > scores[PLAYER_2]:
-                return "P1 Wins!"
-            elif scores[PLAYER_1] < scores[PLAYER_2]:
-                return "P2 Wins!"
-            else:
-                return "Draw!"
-
-    def _update_turn_label(self):
-        current = "P1" if self.logic.get_current_player() == PLAYER_1 else "P2"
-        self.turn_label.config(text=f"Current Turn: {current}")
-
-    def _update_scores(self):
-        if self.controller.mode == "general":
-            scores = self.logic.get_scores()
-            self.left_score_label.config(text=str(scores[PLAYER_1]))
-            self.right_score_label.config(text=str(scores[PLAYER_2]))
-
-    def _draw_line(self, r1, c1, r2, c2, color):
-        positions = self._get_line_positions(r1, c1, r2, c2)
-        for r, c in positions:
-            self.labels[r][c].config(bg=color)
-
-    def _get_line_positions(self, r1, c1, r2, c2):
-        dr = r2 - r1
-        dc = c2 - c1
-
-        if dr == 0 and abs(dc) == 2:
-            return [(r1, c1), (r1, c1 + 1), (r1, c1 + 2)]
-        elif dc == 0 and abs(dr) == 2:
-            return [(r1, c1), (r1 + 1, c1), (r1 + 2, c1)]
-        elif dr == 2 and dc == 2:
-            return [(r1, c1), (r1 + 1, c1 + 1), (r1 + 2, c1 + 2)]
-        elif dr == 2 and dc == -2:
-            return [(r1, c1), (r1 + 1, c1 - 1), (r1 + 2, c1 - 2)]
-        else:
-            print(f"Warning: Invalid line positions ({r1},{c1}) to ({r2},{c2})")
-            return []
+    def set_scores(self, p1_score, p2_score):
+        self.page.left_score_label.config(text=str(p1_score))
+        self.page.right_score_label.config(text=str(p2_score))
+
+    def set_status(self, text):
+        self.page.turn_label.config(text=text)
+
+    def disable_board(self):
+        for row in self.page.labels:
+            for label in row:
+                label.unbind("<Button-1>")
+
+    def shade_cell(self, row, col, outcome):
+        self.page.labels[row][col].config(bg=ANALYSIS_COLORS.get(outcome, "white"))
+
+class _Pages(dict):
+    """ Page name -> page, building each page the first time it is looked up """
+    def __init__(self, container, controller, page_classes):
+        super().__init__()
+        self.container = container
+        self.controller = controller
+        self.page_classes = {F.__name__: F for F in page_classes}
+
+    def __missing__(self, page_name):
+        frame = self.page_classes[page_name](self.container, self.controller)
+        frame.grid(row=0, column=0, sticky="nsew")
+        self[page_name] = frame
+        return frame
 
 class SOSApp(tk.Tk):
     def __init__(self):
@@ -391,13 +395,7 @@ class SOSApp(tk.Tk):
         container.grid_rowconfigure(0, weight=1)
         container.grid_columnconfigure(0, weight=1)
 
-        self.frames = {}
-        for F in (MenuPage, GamePage):
-            page_name = F.__name__
-            frame = F(container, self)
-            self.frames[page_name] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
-
+        self.frames = _Pages(container, self, (MenuPage, GamePage))
         self.show_frame("MenuPage")
 
     def set_game_config(self, grid_size, mode, p1_cpu, p2_cpu):
@@ -413,18 +411,20 @@ class SOSApp(tk.Tk):
            
             p1_type = "computer" if self.p1_cpu_toggle == 1 else "human"
             p2_type = "computer" if self.p2_cpu_toggle == 1 else "human"
-            self.logic = GameLogic(self.grid_size, self.mode, p1_type, p2_type)
+            self.logic = GameLogic(self.grid_size, self.mode, p1_type, p2_type,
+                                   time_control=TimeControl(per_move=CPU_THINK_TIME))
 
             frame.set_logic(self.logic)
             frame.update_mode_label()
             frame.update_score_visibility()
             frame.cpu_visibility()
             frame.create_board()
-            frame.game_active = True
 
             # P1 plays first, checks if CPU plays
-            frame._cpu_check_and_play()
+            frame.flow.start()
 
 if __name__ == "__main__":
+    # Show the engine's move trace on the console, as the game always has
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     app = SOSApp()
     app.mainloop()
\ No newline at end of file
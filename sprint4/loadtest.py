@@ -0,0 +1,213 @@
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import namedtuple
+
+from gameLogic import GameLogic, PLAYER_1
+
+HUMAN_MOVE = "human_move"
+CPU_REPLY = "cpu_reply"
+GAME_END = "game_end"
+MOVE_TYPES = (HUMAN_MOVE, CPU_REPLY, GAME_END)
+PERCENTILES = (50, 90, 99)
+
+LatencySummary = namedtuple("LatencySummary", ["count", "p50", "p90", "p99", "max"])
+LoadReport = namedtuple("LoadReport", ["bots", "games", "moves", "seconds", "games_per_second",
+                                       "moves_per_second", "latency"])
+
+# --- Game Service ---
+class GameService:
+    """
+    Hosts many concurrent games, each a GameLogic with a human P1 and a CPU P2.
+    Requests and responses are plain dicts so the same service can be called
+    in-process or over TCP:
+        {"op": "new", "size": 5, "mode": "simple"}  -> {"game_id", "turn"}
+        {"op": "move", "game_id", "row", "col", "letter"}  -> result
+        {"op": "cpu", "game_id"}  -> result with the CPU's "move"
+    Finished games are dropped.
+    """
+    def __init__(self, seed=None):
+        self.games = {}
+        self._ids = itertools.count(1)
+        self._seeds = random.Random(seed)
+
+    def handle(self, request):
+        op = request.get("op")
+        if op == "new":
+            return self._new_game(request)
+        logic = self.games.get(request.get("game_id"))
+        if logic is None:
+            return {"error": "unknown game"}
+        if op == "move":
+            result = logic.place_letter(request["row"], request["col"], request["letter"])
+            return self._respond(request["game_id"], logic, result)
+        if op == "cpu":
+            move = logic.get_cpu_move()
+            if move is None:
+                return {"error": "not the CPU's turn"}
+            response = self._respond(request["game_id"], logic, logic.place_letter(*move))
+            response["move"] = list(move)
+            return response
+        return {"error": f"unknown op {op}"}
+
+    def _new_game(self, request):
+        size = request.get("size", 3)
+        size = tuple(size) if isinstance(size, list) else size
+        logic = GameLogic(size, request.get("mode", "simple"), "human", "computer",
+                          seed=self._seeds.getrandbits(64))
+        game_id = next(self._ids)
+        self.games[game_id] = logic
+        return {"game_id": game_id, "turn": logic.get_current_player()}
+
+    def _respond(self, game_id, logic, result):
+        if result["game_over"]:
+            del self.games[game_id]
+        return {"valid": result["valid"], "game_over": result["game_over"], "winner": result["winner"],
+                "turn": logic.get_current_player()}
+
+async def serve(service, host="127.0.0.1", port=0):
+    """ Starts a newline-delimited JSON TCP endpoint for a GameService; returns the asyncio server """
+    async def handle_client(reader, writer):
+        try:
+            while line := await reader.readline():
+                writer.write(json.dumps(service.handle(json.loads(line))).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+    return await asyncio.start_server(handle_client, host, port)
+
+# --- Endpoints ---
+class InProcessEndpoint:
+    def __init__(self, service):
+        self.service = service
+
+    async def connect(self):
+        return self
+
+    async def request(self, message):
+        return self.service.handle(message)
+
+    async def close(self):
+        pass
+
+class TcpEndpoint:
+    """ One connection per bot to a serve() endpoint """
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+
+    async def connect(self):
+        connection = TcpEndpoint(self.host, self.port)
+        connection._reader, connection._writer = await asyncio.open_connection(self.host, self.port)
+        return connection
+
+    async def request(self, message):
+        self._writer.write(json.dumps(message).encode() + b"\n")
+        await self._writer.drain()
+        return json.loads(await self._reader.readline())
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+
+# --- Bots ---
+async def _timed(connection, message, latencies):
+    start = time.perf_counter()
+    response = await connection.request(message)
+    elapsed = time.perf_counter() - start
+    kind = CPU_REPLY if message["op"] == "cpu" else HUMAN_MOVE
+    latencies[GAME_END if response.get("game_over") else kind].append(elapsed)
+    return response
+
+async def bot(endpoint, size, mode, games, think_time, rng, latencies):
+    """ Plays full games as the human P1, choosing random empty cells; returns moves made """
+    connection = await endpoint.connect()
+    moves = 0
+    rows, cols = (size, size) if isinstance(size, int) else size
+    try:
+        for _ in range(games):
+            game = await connection.request({"op": "new", "size": size, "mode": mode})
+            game_id = game["game_id"]
+            turn = game["turn"]
+            empty = {(r, c) for r in range(rows) for c in range(cols)}
+            game_over = False
+            while not game_over:
+                if turn == PLAYER_1:
+                    if think_time:
+                        await asyncio.sleep(think_time)
+                    row, col = rng.choice(sorted(empty))
+                    message = {"op": "move", "game_id": game_id, "row": row, "col": col,
+                               "letter": rng.choice("SO")}
+                    empty.discard((row, col))
+                else:
+                    message = {"op": "cpu", "game_id": game_id}
+                response = await _timed(connection, message, latencies)
+                if "move" in response:
+                    empty.discard(tuple(response["move"][:2]))
+                moves += 1
+                game_over = response["game_over"]
+                turn = response["turn"]
+    finally:
+        await connection.close()
+    return moves
+
+def summarize_latencies(samples):
+    if not samples:
+        return LatencySummary(0, 0.0, 0.0, 0.0, 0.0)
+    ordered = sorted(samples)
+    ranks = [ordered[min(len(ordered) - 1, max(0, -(-p * len(ordered) // 100) - 1))] for p in PERCENTILES]
+    return LatencySummary(len(ordered), *ranks, ordered[-1])
+
+async def run_load_test(endpoint, bots=100, games_per_bot=1, size=5, mode="simple", think_time=0.0, seed=None):
+    """ Runs a fleet of concurrent bots against an endpoint and returns a LoadReport """
+    seeds = random.Random(seed)
+    latencies = {kind: [] for kind in MOVE_TYPES}
+    start = time.perf_counter()
+    moves = await asyncio.gather(*(bot(endpoint, size, mode, games_per_bot, think_time,
+                                       random.Random(seeds.getrandbits(64)), latencies)
+                                   for _ in range(bots)))
+    seconds = time.perf_counter() - start
+    games = bots * games_per_bot
+    total_moves = sum(moves)
+    return LoadReport(bots, games, total_moves, seconds, games / seconds, total_moves / seconds,
+                      {kind: summarize_latencies(samples) for kind, samples in latencies.items()})
+
+def format_report(report):
+    lines = [f"{report.bots} bots, {report.games} games, {report.moves} moves in {report.seconds:.2f}s",
+             f"{report.games_per_second:.1f} games/s, {report.moves_per_second:.1f} moves/s",
+             f"{'Move type':<12}{'Count':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+    for kind, s in report.latency.items():
+        lines.append(f"{kind:<12}{s.count:>8}{s.p50 * 1000:>10.2f}{s.p90 * 1000:>10.2f}"
+                     f"{s.p99 * 1000:>10.2f}{s.max * 1000:>10.2f}")
+    return "\n".join(lines)
+
+async def _main(args):
+    service = GameService(args.seed)
+    if args.tcp:
+        server = await serve(service)
+        host, port = server.sockets[0].getsockname()[:2]
+        endpoint = TcpEndpoint(host, port)
+    else:
+        server = None
+        endpoint = InProcessEndpoint(service)
+    report = await run_load_test(endpoint, args.bots, args.games, args.size, args.mode, args.think, args.seed)
+    if server:
+        server.close()
+        await server.wait_closed()
+    print(format_report(report))
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Load test the SOS game service with bot clients")
+    parser.add_argument("--bots", type=int, default=1000)
+    parser.add_argument("--games", type=int, default=1, help="games per bot")
+    parser.add_argument("--size", type=int, default=5)
+    parser.add_argument("--mode", choices=["simple", "general"], default="simple")
+    parser.add_argument("--think", type=float, default=0.0, help="seconds each bot waits before moving")
+    parser.add_argument("--tcp", action="store_true", help="go through a localhost TCP endpoint")
+    parser.add_argument("--seed", type=int)
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,282 @@
+"""
+Pattern-value tables learned from self-play.
+A move is described by several patterns around the cell it fills, each with
+the letter placed: the whole neighbourhood (5x5 for radius 2), reduced to one
+canonical key over the board's 8 rotations and reflections, and the four
+lines through the cell, read in either direction. Self-play games record, for
+every move, whether its player went on to win and its local point margin
+(points it scores, or if it ends the turn, minus the opponent's next turn), under
+each of its patterns. A weight per pattern is then fitted so that summing a
+move's weights predicts that outcome; the small line patterns generalise
+while the neighbourhood adds detail once seen. Everything lives in fixed-size
+array buckets indexed by a hash of the key, so a table is a few flat arrays
+whatever the number of patterns seen.
+"""
+import random
+import struct
+from array import array
+
+from gameLogic import GameLogic, ComputerPlayer, PLAYER_1, PLAYER_2, LETTER_S, LETTER_O, board_shape
+
+DEFAULT_RADIUS = 2
+TABLE_BITS = 18  # 2 ** TABLE_BITS buckets
+RESULT_WEIGHT = 1.0  # Value of a win over a loss, in points of local margin
+FIT_EPOCHS = 4
+LEARNING_RATE = 0.1
+DEFAULT_BATCH = 200
+FILE_MAGIC = b"SOSPAT2\n"
+
+CELL_CODES = {"": 0, LETTER_S: 1, LETTER_O: 2}
+OFF_BOARD = 3
+NEIGHBOURHOOD = 0  # Pattern kinds, part of every key
+LINE = 1
+LINE_STEPS = ((0, 1), (1, 0), (1, 1), (1, -1))
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+# The 8 symmetries of the square as (dr, dc) -> (dr', dc') maps
+SYMMETRIES = (
+    lambda r, c: (r, c), lambda r, c: (c, -r), lambda r, c: (-r, -c), lambda r, c: (-c, r),
+    lambda r, c: (r, -c), lambda r, c: (-r, c), lambda r, c: (c, r), lambda r, c: (-c, -r),
+)
+
+def neighbourhood(radius):
+    """ (dr, dc) offsets around a cell, centre excluded, and each symmetry's base-4 digit values for them """
+    offsets = [(dr, dc) for dr in range(-radius, radius + 1) for dc in range(-radius, radius + 1) if dr or dc]
+    position = {offset: i for i, offset in enumerate(offsets)}
+    digits = tuple(tuple(4 ** position[sym(dr, dc)] for dr, dc in offsets) for sym in SYMMETRIES)
+    return tuple(offsets), digits
+
+def _bucket(canonical, kind, letter, bits):
+    key = (canonical * 2 + kind) * 2 + (letter == LETTER_O)
+    return ((key * _HASH_MULTIPLIER) & _MASK64) >> (64 - bits)
+
+def move_target(result, margin):
+    """ What a move's value is fitted to: its local margin plus a share for the result (1 win, 0.5 draw, 0 loss) """
+    return margin + RESULT_WEIGHT * (result - 0.5)
+
+class PatternTable:
+    """
+    Per pattern bucket: visits, summed results (1 win, 0.5 draw, 0 loss for
+    the mover), summed local point margins and the fitted weight.
+    """
+    def __init__(self, radius=DEFAULT_RADIUS, bits=TABLE_BITS):
+        self.radius = radius
+        self.bits = bits
+        self.visits = array("I", [0]) * (1 << bits)
+        self.results = array("f", [0.0]) * (1 << bits)
+        self.margins = array("f", [0.0]) * (1 << bits)
+        self.weights = array("f", [0.0]) * (1 << bits)
+        self._offsets, self._digits = neighbourhood(radius)
+
+    def keys(self, board, rows, cols, row, col, letter):
+        """ Bucket indexes of the patterns of placing letter on the empty cell (row, col) """
+        codes = {}
+        for dr, dc in self._offsets:
+            r, c = row + dr, col + dc
+            codes[dr, dc] = CELL_CODES[board[r][c]] if 0 <= r < rows and 0 <= c < cols else OFF_BOARD
+        values = tuple(codes.values())
+        canonical = min(sum(code * digit for code, digit in zip(values, digits)) for digits in self._digits)
+        keys = [_bucket(canonical, NEIGHBOURHOOD, letter, self.bits)]
+        span = range(1, self.radius + 1)
+        for dr, dc in LINE_STEPS:
+            forward = backward = 0
+            for k in span:
+                forward = forward * 4 + codes[k * dr, k * dc]
+                backward = backward * 4 + codes[-k * dr, -k * dc]
+            # The two sides of the line are interchangeable
+            keys.append(_bucket(min(forward, backward) * 4 ** self.radius + max(forward, backward),
+                                LINE, letter, self.bits))
+        return keys
+
+    def record(self, keys, result, margin):
+        for index in keys:
+            self.visits[index] += 1
+            self.results[index] += result
+            self.margins[index] += margin
+
+    def move_value(self, keys):
+        weights = self.weights
+        return sum(weights[index] for index in keys)
+
+    def fit(self, samples, epochs=FIT_EPOCHS, rate=LEARNING_RATE, rng=None):
+        """
+        Fits the weights to (keys, target) samples by stochastic gradient
+        descent on squared error. Fitting all patterns jointly, rather than
+        averaging each on its own, keeps a pattern from taking credit for the
+        others it usually appears with.
+        """
+        samples = list(samples)
+        rng = rng or random.Random(0)
+        weights = self.weights
+        for _ in range(epochs):
+            rng.shuffle(samples)
+            for keys, target in samples:
+                step = rate * (target - sum(weights[index] for index in keys)) / len(keys)
+                for index in keys:
+                    weights[index] += step
+        return self
+
+    def merge(self, other):
+        """ Adds other's statistics to this table; weights are refitted rather than merged """
+        if (other.radius, other.bits) != (self.radius, self.bits):
+            raise ValueError("Pattern tables must have the same radius and size to merge")
+        for mine, theirs in ((self.visits, other.visits), (self.results, other.results),
+                             (self.margins, other.margins)):
+            for i, amount in enumerate(theirs):
+                if amount:
+                    mine[i] += amount
+        return self
+
+    def __len__(self):
+        """ Buckets that have seen at least one move """
+        return sum(1 for visits in self.visits if visits)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(FILE_MAGIC + struct.pack("<II", self.radius, self.bits))
+            for values in (self.visits, self.results, self.margins, self.weights):
+                values.tofile(f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                raise ValueError(f"{path} is not a pattern table")
+            radius, bits = struct.unpack("<II", f.read(8))
+            table = cls.__new__(cls)
+            table.radius, table.bits = radius, bits
+            table._offsets, table._digits = neighbourhood(radius)
+            table.visits, table.results, table.margins, table.weights = array("I"), array("f"), array("f"), array("f")
+            for values in (table.visits, table.results, table.margins, table.weights):
+                values.fromfile(f, 1 << bits)
+        return table
+
+class PatternPlayer(ComputerPlayer):
+    """
+    CPU player that plays the move with the highest summed pattern weights,
+    breaking ties at random. General game endgames still go to the exact
+    solver. Checks the deadline between rows and keeps the best so far.
+    """
+    def __init__(self, player_id, table=None, table_path=None, **kwargs):
+        super().__init__(player_id, **kwargs)
+        self.table = table if table is not None else PatternTable.load(table_path)
+
+    def choose_move(self, board, size, found, sos_checker, deadline):
+        rows, cols = board_shape(size)
+        empty = sum(row.count("") for row in board)
+        if self.mode == "general" and 0 < empty <= self.endgame_threshold:
+            return super().choose_move(board, size, found, sos_checker, deadline)
+        table = self.table
+        best = None
+        best_value = None
+        for r in range(rows):
+            if best is not None and deadline.expired():
+                break
+            for c in range(cols):
+                if board[r][c] != "":
+                    continue
+                for letter in self.letters:
+                    value = (table.move_value(table.keys(board, rows, cols, r, c, letter)), self.rng.random())
+                    if best_value is None or value > best_value:
+                        best, best_value = (r, c, letter), value
+        return best or super().choose_move(board, size, found, sos_checker, deadline)
+
+# --- Training ---
+def local_margins(played):
+    """
+    For each (player, keys, points) move: the points it scores, or for the
+    move ending a turn without scoring, minus the points the opponent scores
+    in the turn after. Later scoring in the same turn is credited to the
+    moves that make it, which keeps the target local to the cell.
+    """
+    margins = []
+    for i, (player, _, points) in enumerate(played):
+        if points:
+            margins.append(points)
+            continue
+        reply = 0
+        for other, _, scored in played[i + 1:]:
+            if other == player:
+                break
+            reply += scored
+        margins.append(-reply)
+    return margins
+
+def _self_play_batch(job):
+    """ Plays a batch of self-play games; returns their statistics as a PatternTable and (keys, target) samples """
+    size, mode, games, seed, radius, bits, explore, policy = job
+    table = PatternTable(radius, bits)
+    samples = []
+    rows, cols = board_shape(size)
+    rng = random.Random(seed)
+    for _ in range(games):
+        logic = GameLogic(size, mode)
+        players = {pid: (PatternPlayer(pid, policy, rng=rng, mode=mode) if policy is not None
+                         else ComputerPlayer(pid, rng=rng, mode=mode)) for pid in (PLAYER_1, PLAYER_2)}
+        played = []  # (player, pattern keys, points scored)
+        while not logic.game_over():
+            board = logic.game_mode.get_board()
+            player = logic.get_current_player()
+            if rng.random() < explore:
+                move = players[player]._play_random_move(board, size)
+            else:
+                move = players[player].make_move(board, size, logic.game_mode.get_found(),
+                                                 logic.game_mode.rule.scan)
+            keys = table.keys(board, rows, cols, *move)
+            played.append((player, keys, logic.place_letter(*move)["sos_found"]))
+        winner = logic.game_mode.get_winner()
+        # Simple games end on the first line, so only the result counts
+        margins = local_margins(played) if mode == "general" else [0] * len(played)
+        for (player, keys, _), margin in zip(played, margins):
+            result = 0.5 if winner == "draw" else 1.0 if winner == player else 0.0
+            table.record(keys, result, margin)
+            samples.append((keys, move_target(result, margin)))
+    return table, samples
+
+def train(size, mode, games, workers=None, batch=DEFAULT_BATCH, seed=0, radius=DEFAULT_RADIUS, bits=TABLE_BITS,
+          explore=0.1, policy=None, epochs=FIT_EPOCHS):
+    """
+    Runs self-play in parallel worker processes (in-process when workers is 1),
+    merges their statistics and fits the pattern weights to every recorded
+    move. Games are played by ComputerPlayer, or by PatternPlayers using an
+    earlier table as policy, with an explore share of random moves to widen
+    the patterns seen.
+    """
+    jobs = [(size, mode, min(batch, games - start), seed * 1000003 + start, radius, bits, explore, policy)
+            for start in range(0, games, batch)]
+    table = PatternTable(radius, bits)
+    samples = []
+    if workers == 1:
+        parts = map(_self_play_batch, jobs)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(workers)
+        parts = pool.map(_self_play_batch, jobs)
+    try:
+        for part, part_samples in parts:
+            table.merge(part)
+            samples.extend(part_samples)
+    finally:
+        if workers != 1:
+            pool.shutdown()
+    return table.fit(samples, epochs, rng=random.Random(seed))
+
+if __name__ == "__main__":
+    import argparse
+    from gameLogic import parse_board_size
+    parser = argparse.ArgumentParser(description="Learn pattern-value tables from self-play")
+    parser.add_argument("output")
+    parser.add_argument("--size", type=parse_board_size, default=5)
+    parser.add_argument("--mode", choices=["simple", "general"], default="general")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--radius", type=int, default=DEFAULT_RADIUS)
+    parser.add_argument("--bits", type=int, default=TABLE_BITS)
+    parser.add_argument("--explore", type=float, default=0.1)
+    args = parser.parse_args()
+    learned = train(args.size, args.mode, args.games, args.workers, seed=args.seed, radius=args.radius,
+                    bits=args.bits, explore=args.explore)
+    learned.save(args.output)
+    print(f"{len(learned)} pattern buckets from {args.games} games written to {args.output}")
@@ -0,0 +1,114 @@
+import threading
+
+from gameLogic import ComputerPlayer, PLAYER_1
+
+DEFAULT_CANDIDATES = 8
+NEIGHBOURS = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc]
+
+def position_key(logic):
+    snap = logic.snapshot()
+    return snap.cells, snap.current_player
+
+def likely_moves(logic, limit=DEFAULT_CANDIDATES):
+    """
+    Guesses the human's next moves: ones that complete a line first, then
+    moves next to letters already on the board, then the rest.
+    """
+    game = logic.game_mode
+    board = game.get_board()
+    rows, cols = game.get_shape()
+    scored = []
+    for r in range(rows):
+        for c in range(cols):
+            if board[r][c] != "":
+                continue
+            near = any(0 <= r + dr < rows and 0 <= c + dc < cols and board[r + dr][c + dc] != ""
+                       for dr, dc in NEIGHBOURS)
+            for letter in game.rule.letters:
+                board[r][c] = letter
+                completes = bool(game.rule.matches_at(board, game.get_size(), r, c))
+                board[r][c] = ""
+                scored.append((2 if completes else 1 if near else 0, r, c, letter))
+    scored.sort(key=lambda move: -move[0])
+    return [move[1:] for move in scored[:limit]]
+
+class Ponderer:
+    """
+    Computes CPU replies in a background thread while a human is deciding.
+    start() guesses the human's likely moves and stores the CPU's reply to
+    each in a small cache keyed by position. lookup() returns the cached
+    reply if the real position matches, and always stops pondering and
+    empties the cache. All work runs on cloned games, never the live one,
+    each with a clone of the live CPU player, so a pondered reply is the one
+    that player would have chosen. On a hit the live player takes over the
+    clone's random state and thinking time.
+    """
+    def __init__(self, max_candidates=DEFAULT_CANDIDATES):
+        self.max_candidates = max_candidates
+        self.hits = 0
+        self.misses = 0
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._thread = None
+
+    def start(self, logic):
+        self.cancel()
+        human = logic.get_current_player()
+        cpu = logic.p2 if human == PLAYER_1 else logic.p1
+        if not isinstance(cpu, ComputerPlayer) or logic.game_over():
+            return
+        root = logic.clone()
+        candidates = likely_moves(root, self.max_candidates)
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._ponder, args=(root, cpu, candidates, self._cancel), daemon=True)
+        self._thread.start()
+
+    def _ponder(self, root, cpu, candidates, cancel):
+        snapshot = root.snapshot()
+        for move in candidates:
+            if cancel.is_set():
+                return
+            root.restore(snapshot)
+            if root.place_letter(*move)["game_over"] or root.get_current_player() != cpu.player_id:
+                continue
+            key = position_key(root)
+            # A fresh clone per candidate: each reply starts from the live player's state
+            player = cpu.clone()
+            if cpu.player_id == PLAYER_1:
+                root.p1 = player
+            else:
+                root.p2 = player
+            reply = root.get_cpu_move()
+            with self._lock:
+                if not cancel.is_set():
+                    self._cache[key] = reply, player
+
+    @staticmethod
+    def _player_to_move(logic):
+        return logic.p1 if logic.get_current_player() == PLAYER_1 else logic.p2
+
+    def wait(self, timeout=None):
+        """ Waits for the current pondering pass to finish """
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def cancel(self):
+        self._cancel.set()
+        with self._lock:
+            self._cache.clear()
+
+    def lookup(self, logic):
+        """ Returns the pondered reply for the current position, or None """
+        key = position_key(logic)
+        with self._lock:
+            reply, player = self._cache.get(key, (None, None))
+        self.cancel()
+        if reply is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        live = self._player_to_move(logic)
+        live.rng.setstate(player.rng.getstate())
+        live.time_used = player.time_used
+        return reply
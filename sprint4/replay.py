@@ -0,0 +1,110 @@
+from gameLogic import GameLogic, GameSnapshot, PLAYER_1, EMPTY_CELL, board_shape, sos_cells
+
+KEYFRAME_INTERVAL = 16  # Moves between stored full positions
+
+class Replay:
+    """
+    A recorded game that can be positioned at any move without replaying it.
+    The moves are played once, storing a full GameSnapshot every
+    keyframe_interval moves plus each move's letter and new lines. frame(i)
+    starts from the keyframe at or before move i and applies at most
+    keyframe_interval - 1 moves, so seeking costs the same at move 5 or 200.
+    """
+    def __init__(self, size, mode, moves, rule=None, keyframe_interval=KEYFRAME_INTERVAL):
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1")
+        self.size = size
+        self.mode = mode
+        self.keyframe_interval = keyframe_interval
+        self._cols = board_shape(size)[1]
+
+        logic = GameLogic(size, mode, rule=rule)
+        self.keyframes = [logic.snapshot()]
+        self.events = []
+        for start in range(0, len(moves), keyframe_interval):
+            _, events = logic.play_moves(moves[start:start + keyframe_interval], record_events=True)
+            self.events.extend(events)
+            self.keyframes.append(logic.snapshot())
+        self.final = self.keyframes[-1]
+        self.rule = self.final.rule
+        self.line_owners = {}  # sos_id -> player, in the order lines were made
+        for player, _, _, _, new_sos in self.events:
+            for sos_id in new_sos:
+                self.line_owners[sos_id] = player
+        self._line_order = {sos_id: i for i, sos_id in enumerate(self.line_owners)}
+
+        # Running scores after each move; only general games keep score
+        self._scores = [(0, 0)]
+        p1_score = p2_score = 0
+        for player, _, _, _, new_sos in self.events:
+            if mode == "general":
+                if player == PLAYER_1:
+                    p1_score += len(new_sos)
+                else:
+                    p2_score += len(new_sos)
+            self._scores.append((p1_score, p2_score))
+
+    def __len__(self):
+        return len(self.events)
+
+    def frame(self, index):
+        """ GameSnapshot of the position after the first index moves """
+        if not 0 <= index <= len(self.events):
+            raise IndexError(f"Move {index} is outside 0..{len(self.events)}")
+        if index == len(self.events):
+            return self.final
+        keyframe = self.keyframes[index // self.keyframe_interval]
+        cells = list(keyframe.cells)
+        found = list(keyframe.found)
+        for _, row, col, letter, new_sos in self.events[index - index % self.keyframe_interval:index]:
+            cells[row * self._cols + col] = letter
+            found.extend(new_sos)
+        p1_score, p2_score = self._scores[index]
+        return GameSnapshot(self.mode, self.size, "".join(cells), tuple(sorted(found)), p1_score, p2_score,
+                            self.events[index][0], False, None, self.rule)
+
+    def moves(self):
+        return [(row, col, letter) for _, row, col, letter, _ in self.events]
+
+class ReplayViewer:
+    """
+    Shows a Replay through a gameflow Renderer. seek() only redraws cells
+    whose letter or highlight differs from what is on screen. colors maps
+    each player to its highlight color.
+    """
+    def __init__(self, replay, renderer, colors):
+        self.replay = replay
+        self.renderer = renderer
+        self.colors = colors
+        self.index = None
+        self._cells = None
+        self._shading = {}
+
+    def seek(self, index):
+        frame = self.replay.frame(index)
+        if self._cells is None:
+            self._cells = EMPTY_CELL * len(frame.cells)
+        cols = self.replay._cols
+        for i, (old, new) in enumerate(zip(self._cells, frame.cells)):
+            if old != new:
+                self.renderer.set_cell(*divmod(i, cols), "" if new == EMPTY_CELL else new)
+        self._cells = frame.cells
+
+        # Cells keep the color of the most recent line through them
+        shading = {}
+        for sos_id in sorted(frame.found, key=self.replay._line_order.get):
+            color = self.colors[self.replay.line_owners[sos_id]]
+            for cell in sos_cells(sos_id, self.replay.rule.length):
+                shading[cell] = color
+        for cell in self._shading.keys() - shading.keys():
+            self.renderer.highlight([cell], None)
+        for cell, color in shading.items():
+            if self._shading.get(cell) != color:
+                self.renderer.highlight([cell], color)
+        self._shading = shading
+
+        if self.replay.mode == "general":
+            self.renderer.set_scores(frame.p1_score, frame.p2_score)
+        self.renderer.set_status(f"Move {index} of {len(self.replay)}")
+        self.index = index
+        return frame
@@ -0,0 +1,219 @@
+"""
+SQLite store of finished game summaries, for querying past outcomes by board
+size, mode, player type and date without replaying games.
+Producers call record(), which only puts the summary on a queue. A
+background thread owns the writing connection and inserts whatever has
+queued up, at most batch rows per transaction. The database runs in WAL
+mode, so the canned queries can read on their own connection while the
+writer keeps going.
+"""
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from gameLogic import PLAYER_1, PLAYER_2, board_shape
+
+DEFAULT_BATCH = 500  # Rows per insert transaction
+
+GameSummary = namedtuple("GameSummary", ["size", "mode", "p1_type", "p2_type", "winner", "p1_score", "p2_score",
+                                         "moves", "seed", "source", "played_at"],
+                         defaults=[None, "", None])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,
+    rows INTEGER NOT NULL,
+    cols INTEGER NOT NULL,
+    mode TEXT NOT NULL,
+    p1_type TEXT NOT NULL,
+    p2_type TEXT NOT NULL,
+    winner TEXT,
+    p1_score INTEGER NOT NULL,
+    p2_score INTEGER NOT NULL,
+    moves INTEGER NOT NULL,
+    seed INTEGER,
+    source TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_board ON games (rows, cols, mode);
+CREATE INDEX IF NOT EXISTS games_by_p1 ON games (p1_type, mode);
+CREATE INDEX IF NOT EXISTS games_by_p2 ON games (p2_type, mode);
+CREATE INDEX IF NOT EXISTS games_by_time ON games (played_at);
+"""
+
+INSERT = """
+INSERT INTO games (played_at, rows, cols, mode, p1_type, p2_type, winner, p1_score, p2_score, moves, seed, source)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def summarize(logic, moves, seed=None, source=""):
+    """ GameSummary of a GameLogic game, after moves moves """
+    snap = logic.snapshot()
+    return GameSummary(snap.size, snap.mode, logic.p1_type, logic.p2_type, snap.winner, snap.p1_score,
+                       snap.p2_score, moves, seed if seed is not None else logic.seed, source)
+
+def from_match(result, source="tournament"):
+    """ GameSummary of a tournament MatchResult; entrant names stand in for player types """
+    winner = {result.p1: PLAYER_1, result.p2: PLAYER_2}.get(result.winner, result.winner)
+    return GameSummary(result.size, result.mode, result.p1, result.p2, winner, result.p1_score, result.p2_score,
+                       result.moves, result.seed, source)
+
+def _row(summary):
+    rows, cols = board_shape(summary.size)
+    played_at = summary.played_at if summary.played_at is not None else time.time()
+    return (played_at, rows, cols, summary.mode, summary.p1_type, summary.p2_type, summary.winner,
+            summary.p1_score, summary.p2_score, summary.moves, summary.seed, summary.source)
+
+def connect(path):
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")  # WAL keeps the database consistent; only a power cut loses rows
+    connection.executescript(SCHEMA)
+    return connection
+
+class ResultStore:
+    """
+    Game summaries in the SQLite database at path. record() never blocks on
+    disk; flush() waits until everything recorded so far is committed. Use as
+    a context manager, or call close(), to stop the writer.
+    """
+    def __init__(self, path, batch=DEFAULT_BATCH):
+        self.path = path
+        self.batch = batch
+        connect(path).close()  # Create the schema before any reader looks
+        self._queue = queue.Queue()
+        self._error = None
+        self._thread = threading.Thread(target=self._write, daemon=True)
+        self._thread.start()
+        self._reader = None
+
+    # --- Writing ---
+    def record(self, summary):
+        if self._thread is None:
+            raise RuntimeError("Result store is closed")
+        self._queue.put(_row(summary))
+
+    def record_many(self, summaries):
+        for summary in summaries:
+            self.record(summary)
+
+    def _write(self):
+        connection = connect(self.path)
+        try:
+            running = True
+            while running:
+                rows = [self._queue.get()]
+                # Take whatever else has queued up, up to a batch
+                while len(rows) < self.batch:
+                    try:
+                        rows.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if None in rows:
+                    running = False
+                    rows = [row for row in rows if row is not None]
+                try:
+                    with connection:
+                        connection.executemany(INSERT, rows)
+                except sqlite3.Error as e:
+                    self._error = e
+                for _ in range(len(rows) + (not running)):
+                    self._queue.task_done()
+        finally:
+            connection.close()
+
+    def flush(self):
+        """ Blocks until every recorded summary is written; raises the writer's last error, if any """
+        self._queue.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Queries ---
+    def _query(self, sql, params=()):
+        if self._reader is None:
+            self._reader = sqlite3.connect(self.path, check_same_thread=False)
+            self._reader.row_factory = sqlite3.Row
+        return [dict(row) for row in self._reader.execute(sql, params)]
+
+    def games(self, size=None, mode=None, player_type=None, since=None, until=None, limit=None):
+        """ Stored games, oldest first, filtered by any of board size, mode, player type (either side) and time """
+        where, params = self._filters(size, mode, player_type, since, until)
+        sql = f"SELECT * FROM games{where} ORDER BY played_at, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._query(sql, params)
+
+    @staticmethod
+    def _filters(size=None, mode=None, player_type=None, since=None, until=None):
+        clauses = []
+        params = []
+        if size is not None:
+            clauses.append("rows = ? AND cols = ?")
+            params.extend(board_shape(size))
+        if mode is not None:
+            clauses.append("mode = ?")
+            params.append(mode)
+        if player_type is not None:
+            clauses.append("(p1_type = ? OR p2_type = ?)")
+            params.extend((player_type, player_type))
+        if since is not None:
+            clauses.append("played_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("played_at < ?")
+            params.append(until)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def win_rates(self, since=None, until=None):
+        """ Games and p1, p2 and draw rates per board size and mode """
+        where, params = self._filters(since=since, until=until)
+        return self._query(f"""
+            SELECT rows, cols, mode, COUNT(*) AS games,
+                   AVG(winner = 'p1') AS p1_rate, AVG(winner = 'p2') AS p2_rate, AVG(winner = 'draw') AS draw_rate,
+                   AVG(p1_score) AS p1_score, AVG(p2_score) AS p2_score, AVG(moves) AS moves
+            FROM games{where}
+            GROUP BY rows, cols, mode
+            ORDER BY rows, cols, mode""", params)
+
+    def player_win_rates(self, size=None, mode=None, since=None, until=None):
+        """ Games, wins, draws and score rate (draws count half) per player type, whichever side it played """
+        where, params = self._filters(size, mode, since=since, until=until)
+        return self._query(f"""
+            SELECT player_type, COUNT(*) AS games, SUM(won) AS wins, SUM(drawn) AS draws,
+                   (SUM(won) + 0.5 * SUM(drawn)) / COUNT(*) AS score
+            FROM (SELECT p1_type AS player_type, winner = 'p1' AS won, winner = 'draw' AS drawn FROM games{where}
+                  UNION ALL
+                  SELECT p2_type, winner = 'p2', winner = 'draw' FROM games{where})
+            GROUP BY player_type
+            ORDER BY score DESC, player_type""", params * 2)
+
+    def games_per_day(self, size=None, mode=None, player_type=None):
+        """ Games and p1 win rate per UTC day """
+        where, params = self._filters(size, mode, player_type)
+        return self._query(f"""
+            SELECT date(played_at, 'unixepoch') AS day, COUNT(*) AS games, AVG(winner = 'p1') AS p1_rate
+            FROM games{where}
+            GROUP BY day
+            ORDER BY day""", params)
@@ -0,0 +1,166 @@
+from collections import namedtuple
+
+import numpy as np
+
+from gameLogic import PLAYER_1, PLAYER_2, LETTER_S, LETTER_O, EMPTY_CELL, DEFAULT_RULE, board_shape, size_label
+from solver import cell_windows
+
+# Cell codes
+EMPTY = 0
+CODE_S = 1
+CODE_O = 2
+LETTER_CODES = {LETTER_S: CODE_S, LETTER_O: CODE_O, EMPTY_CELL: EMPTY}
+CODE_LETTERS = {CODE_S: LETTER_S, CODE_O: LETTER_O}
+
+# Winner codes; players are 0 (p1) and 1 (p2) in the player array
+NO_WINNER = -1
+DRAW = 2
+WINNER_NAMES = {0: PLAYER_1, 1: PLAYER_2, DRAW: "draw"}
+PLAYER_CODES = {PLAYER_1: 0, PLAYER_2: 1}
+
+DEFAULT_BATCH = 4096
+
+# Per-game arrays for a finished batch
+SimulationResult = namedtuple("SimulationResult", ["winner", "p1_score", "p2_score", "length"])
+
+def window_table(size):
+    """
+    (cells, K, 3) index array of the SOS lines through each cell. Cells with
+    fewer than K lines are padded with the index of an always-empty sentinel
+    column so the padding never matches.
+    """
+    windows = cell_windows(size)
+    rows, cols = board_shape(size)
+    cells = rows * cols
+    k = max(len(w) for w in windows)
+    table = np.full((cells, k, 3), cells, dtype=np.intp)
+    for i, w in enumerate(windows):
+        table[i, :len(w)] = w
+    return table
+
+class LockstepSimulator:
+    """
+    Plays a batch of independent classic SOS random games in lockstep with NumPy.
+    Every step, each unfinished game places a random letter on a random empty
+    cell. Only the SOS lines through that cell are checked, which is exact
+    because none of them could have been complete before. Scoring, extra
+    turns and game end follow SimpleGame and GeneralGame.
+    """
+    def __init__(self, size, mode="simple", batch=DEFAULT_BATCH, seed=None, record_moves=False):
+        if mode not in ("simple", "general"):
+            raise ValueError(f"Invalid mode: {mode}")
+        self.size = size
+        self.mode = mode
+        self.batch = batch
+        self.record_moves = record_moves
+        self.rng = np.random.default_rng(seed)
+        self._rows, self._cols = board_shape(size)
+        self._cells = self._rows * self._cols
+        self._windows = window_table(size)
+        self.reset()
+
+    def reset(self, snapshot=None):
+        """ Starts every game in the batch from an empty board or from a GameSnapshot """
+        cells = self._cells
+        self.board = np.zeros((self.batch, cells + 1), dtype=np.int8)
+        self.player = np.zeros(self.batch, dtype=np.int8)
+        self.scores = np.zeros((self.batch, 2), dtype=np.int32)
+        self.winner = np.full(self.batch, NO_WINNER, dtype=np.int8)
+        self.done = np.zeros(self.batch, dtype=bool)
+        self.length = np.zeros(self.batch, dtype=np.int32)
+        if snapshot is not None:
+            if snapshot.size != self.size or snapshot.mode != self.mode or snapshot.rule != DEFAULT_RULE:
+                raise ValueError(f"Snapshot is for a {size_label(snapshot.size)} {snapshot.mode} game")
+            self.board[:, :cells] = [LETTER_CODES[cell] for cell in snapshot.cells]
+            self.player[:] = PLAYER_CODES[snapshot.current_player]
+            self.scores[:] = (snapshot.p1_score, snapshot.p2_score)
+            if snapshot.game_ended:
+                self.done[:] = True
+                self.winner[:] = DRAW if snapshot.winner == "draw" else PLAYER_CODES[snapshot.winner]
+        self.empty = (self.board[:, :cells] == EMPTY).sum(axis=1).astype(np.int32)
+        self.done |= self.empty == 0
+        if self.record_moves:
+            self.move_cells = np.full((self.batch, cells), -1, dtype=np.int16)
+            self.move_letters = np.zeros((self.batch, cells), dtype=np.int8)
+
+    def step(self):
+        """ Advances every unfinished game by one move; returns how many moved """
+        idx = np.flatnonzero(~self.done)
+        if not idx.size:
+            return 0
+        cells = self._cells
+
+        # Uniform random empty cell via argmax over masked noise
+        noise = self.rng.random((idx.size, cells + 1))
+        noise[self.board[idx] != EMPTY] = -1.0
+        noise[:, cells] = -1.0
+        cell = noise.argmax(axis=1)
+        letter = self.rng.integers(CODE_S, CODE_O + 1, size=idx.size, dtype=np.int8)
+        self.board[idx, cell] = letter
+
+        if self.record_moves:
+            self.move_cells[idx, self.length[idx]] = cell
+            self.move_letters[idx, self.length[idx]] = letter
+        self.length[idx] += 1
+
+        lines = self.board[idx[:, None, None], self._windows[cell]]
+        gain = ((lines[..., 0] == CODE_S) & (lines[..., 1] == CODE_O) & (lines[..., 2] == CODE_S)).sum(axis=1)
+        self.empty[idx] -= 1
+        full = self.empty[idx] == 0
+        player = self.player[idx]
+
+        if self.mode == "simple":
+            won = gain > 0
+            self.winner[idx[won]] = player[won]
+            self.winner[idx[full & ~won]] = DRAW
+            self.done[idx[won | full]] = True
+            switch = ~(won | full)
+        else:
+            self.scores[idx, player] += gain.astype(np.int32)
+            switch = gain == 0
+            finished = idx[full]
+            p1, p2 = self.scores[finished, 0], self.scores[finished, 1]
+            self.winner[finished] = np.where(p1 > p2, 0, np.where(p2 > p1, 1, DRAW))
+            self.done[finished] = True
+        self.player[idx[switch]] ^= 1
+        return idx.size
+
+    def run(self):
+        """ Plays every game in the batch to the end """
+        while self.step():
+            pass
+        return self.result()
+
+    def result(self):
+        return SimulationResult(self.winner.copy(), self.scores[:, 0].copy(), self.scores[:, 1].copy(),
+                                self.length.copy())
+
+    def moves(self, game):
+        """ Recorded (row, col, letter) moves of one game, for replay through GameLogic """
+        if not self.record_moves:
+            raise ValueError("Simulator was not created with record_moves=True")
+        return [divmod(int(cell), self._cols) + (CODE_LETTERS[int(letter)],)
+                for cell, letter in zip(self.move_cells[game, :self.length[game]],
+                                        self.move_letters[game, :self.length[game]])]
+
+def simulate(size, mode, games, batch=DEFAULT_BATCH, seed=None, snapshot=None):
+    """ Runs random playouts in batches and returns the concatenated SimulationResult """
+    # At least one batch, so games=0 still yields empty columns of the right dtypes
+    seeds = np.random.SeedSequence(seed).spawn(max(1, (games + batch - 1) // batch))
+    parts = []
+    remaining = games
+    for child_seed in seeds:
+        simulator = LockstepSimulator(size, mode, min(batch, remaining), seed=child_seed)
+        if snapshot is not None:
+            simulator.reset(snapshot)
+        parts.append(simulator.run())
+        remaining -= simulator.batch
+    return SimulationResult(*(np.concatenate(column) for column in zip(*parts)))
+
+def summarize(result):
+    """ Win counts and mean scores of a SimulationResult """
+    counts = np.bincount(result.winner[result.winner >= 0], minlength=3)
+    summary = {WINNER_NAMES[code]: int(counts[code]) for code in WINNER_NAMES}
+    summary["mean_p1_score"] = float(result.p1_score.mean()) if result.p1_score.size else 0.0
+    summary["mean_p2_score"] = float(result.p2_score.mean()) if result.p2_score.size else 0.0
+    return summary
@@ -0,0 +1,299 @@
+import time
+from collections import namedtuple
+from functools import lru_cache
+
+from gameLogic import ComputerPlayer, DEFAULT_RULE, board_shape, SOS_STEPS, EMPTY_CELL, LETTER_S, LETTER_O, VALID_LETTERS, PLAYER_1, PLAYER_2
+
+INF = float("inf")
+WIN = "win"
+DRAW = "draw"
+LOSS = "loss"
+DEFAULT_NODE_BUDGET = 200000
+DEFAULT_TABLE_SIZE = 100000
+DEADLINE_CHECK_INTERVAL = 256
+ENDGAME_CACHE_SIZE = 500000
+
+# outcome is WIN, DRAW or LOSS for the player to move, or None if the budget ran out.
+# move is (row, col, letter) or None.
+SolveResult = namedtuple("SolveResult", ["outcome", "move", "nodes", "complete"])
+
+@lru_cache(maxsize=None)
+def cell_windows(size):
+    """ For each cell index, the (a, b, c) index triples of every SOS line through it """
+    rows, cols = board_shape(size)
+    windows = [[] for _ in range(rows * cols)]
+    for dr, dc in SOS_STEPS.values():
+        for r in range(rows):
+            for c in range(cols):
+                r_end = r + 2 * dr
+                c_end = c + 2 * dc
+                if 0 <= r_end < rows and 0 <= c_end < cols:
+                    line = (r * cols + c, (r + dr) * cols + c + dc, r_end * cols + c_end)
+                    for i in line:
+                        windows[i].append(line)
+    return tuple(tuple(w) for w in windows)
+
+def completes_sos(cells, windows):
+    for a, b, c in windows:
+        if cells[a] == LETTER_S and cells[b] == LETTER_O and cells[c] == LETTER_S:
+            return True
+    return False
+
+def other_player(player):
+    return PLAYER_2 if player == PLAYER_1 else PLAYER_1
+
+# --- Proof-Number Search ---
+class _Node:
+    __slots__ = ("cells", "to_move", "move", "parent", "children", "pn", "dn")
+
+    def __init__(self, cells, to_move, move, parent):
+        self.cells = cells
+        self.to_move = to_move
+        self.move = move
+        self.parent = parent
+        self.children = None
+        self.pn = 1
+        self.dn = 1
+
+class SimpleSolver:
+    """
+    Proof-number search over SimpleGame positions.
+    Positions are packed cell strings as in GameSnapshot.cells. A position is
+    solved with two proofs: first that the side to move wins, and if that
+    fails, that it at least draws. Solved positions are kept in a bounded
+    transposition table that is reused across solve calls.
+    """
+    def __init__(self, size, node_budget=DEFAULT_NODE_BUDGET, time_budget=None, table_size=DEFAULT_TABLE_SIZE):
+        self.size = size
+        self._cols = board_shape(size)[1]
+        self.node_budget = node_budget
+        self.time_budget = time_budget
+        self.table_size = table_size
+        self._windows = cell_windows(size)
+        self._table = {}
+
+    def solve_game(self, logic):
+        """ Solves the current position of a simple-mode GameLogic """
+        if logic.mode != "simple" or logic.game_mode.rule != DEFAULT_RULE:
+            raise ValueError("SimpleSolver only handles classic SOS simple games")
+        snap = logic.snapshot()
+        if snap.game_ended:
+            raise ValueError("Game is already over")
+        return self.solve(snap.cells, snap.current_player)
+
+    def solve(self, cells, to_move, deadline=None):
+        """ deadline, a gameLogic.Deadline, cuts the search short on top of time_budget """
+        if EMPTY_CELL not in cells:
+            raise ValueError("Board is full")
+        ends = [end for end in (time.perf_counter() + self.time_budget if self.time_budget is not None else None,
+                                deadline.end if deadline is not None else None) if end is not None]
+        self._nodes = 0
+        self._expansions = 0
+        self._deadline = min(ends) if ends else None
+
+        win_root = self._prove(cells, to_move, WIN)
+        if win_root.pn == 0:
+            return self._result(WIN, self._proven_move(win_root), True)
+        if win_root.dn != 0:
+            return self._result(None, None, False)
+
+        draw_root = self._prove(cells, to_move, DRAW)
+        if draw_root.pn == 0:
+            return self._result(DRAW, self._proven_move(draw_root), True)
+        if draw_root.dn != 0:
+            return self._result(None, None, False)
+        return self._result(LOSS, self._any_move(cells), True)
+
+    def _result(self, outcome, move, complete):
+        return SolveResult(outcome, move, self._nodes, complete)
+
+    def _move_to_tuple(self, move):
+        index, letter = move
+        return divmod(index, self._cols) + (letter,)
+
+    def _proven_move(self, root):
+        for child in root.children:
+            if child.pn == 0:
+                return self._move_to_tuple(child.move)
+        return None
+
+    def _any_move(self, cells):
+        index = cells.index(EMPTY_CELL)
+        return self._move_to_tuple((index, VALID_LETTERS[0]))
+
+    def _out_of_budget(self):
+        if self._nodes >= self.node_budget:
+            return True
+        # Nodes grow by a whole expansion at a time and can step over every multiple of the interval
+        self._expansions += 1
+        if self._deadline is not None and self._expansions % DEADLINE_CHECK_INTERVAL == 0:
+            return time.perf_counter() >= self._deadline
+        return False
+
+    def _prove(self, cells, to_move, target):
+        """ Runs PNS for target (WIN or DRAW-or-better) from the root mover's side """
+        attacker = to_move
+        root = _Node(cells, to_move, None, None)
+        while root.pn != 0 and root.dn != 0 and not self._out_of_budget():
+            node = root
+            while node.children is not None:
+                if node.to_move == attacker:
+                    node = min(node.children, key=lambda child: child.pn)
+                else:
+                    node = min(node.children, key=lambda child: child.dn)
+            self._expand(node, attacker, target)
+            self._update_ancestors(node, attacker, target)
+        return root
+
+    def _lookup(self, node, attacker, target):
+        proven = self._table.get((node.cells, node.to_move, attacker, target))
+        if proven is not None:
+            self._set_value(node, proven)
+
+    def _set_value(self, node, proven):
+        node.pn, node.dn = (0, INF) if proven else (INF, 0)
+
+    def _store(self, node, attacker, target):
+        if len(self._table) >= self.table_size:
+            del self._table[next(iter(self._table))]
+        self._table[(node.cells, node.to_move, attacker, target)] = node.pn == 0
+
+    def _expand(self, node, attacker, target):
+        cells = node.cells
+        mover = node.to_move
+        next_player = other_player(mover)
+        children = []
+        for index, cell in enumerate(cells):
+            if cell != EMPTY_CELL:
+                continue
+            for letter in VALID_LETTERS:
+                child_cells = cells[:index] + letter + cells[index + 1:]
+                child = _Node(child_cells, next_player, (index, letter), node)
+                self._nodes += 1
+                if completes_sos(child_cells, self._windows[index]):
+                    # The mover wins outright; no other move needs to be considered
+                    self._set_value(child, mover == attacker)
+                    node.children = [child]
+                    return
+                if EMPTY_CELL not in child_cells:
+                    self._set_value(child, target == DRAW)
+                else:
+                    self._lookup(child, attacker, target)
+                children.append(child)
+        node.children = children
+
+    def _update_ancestors(self, node, attacker, target):
+        while node is not None:
+            if node.to_move == attacker:
+                node.pn = min(child.pn for child in node.children)
+                node.dn = sum(child.dn for child in node.children)
+            else:
+                node.pn = sum(child.pn for child in node.children)
+                node.dn = min(child.dn for child in node.children)
+            if node.pn == 0 or node.dn == 0:
+                self._store(node, attacker, target)
+                if node.parent is not None:
+                    node.children = ()  # Solved subtrees are never revisited
+            node = node.parent
+
+# --- General Game Endgame ---
+# Exact endgame values shared by every game in the process, keyed by board shape and packed cells
+_endgame_cache = {}
+
+class SearchTimeout(Exception):
+    """ Raised inside a search when its deadline passes; only finished values are ever cached """
+
+def sos_gain(cells, windows):
+    """ Number of SOS lines through the last placed cell """
+    gain = 0
+    for a, b, c in windows:
+        if cells[a] == LETTER_S and cells[b] == LETTER_O and cells[c] == LETTER_S:
+            gain += 1
+    return gain
+
+def _endgame_moves(cells, windows, shape, deadline=None):
+    """ Yields (score difference, index, letter) for every move in a general game position of a (rows, cols) shape """
+    for index, cell in enumerate(cells):
+        if cell != EMPTY_CELL:
+            continue
+        for letter in VALID_LETTERS:
+            child = cells[:index] + letter + cells[index + 1:]
+            gain = sos_gain(child, windows[index])
+            if EMPTY_CELL not in child:
+                yield gain, index, letter
+            elif gain:
+                yield gain + endgame_value(child, windows, shape, deadline), index, letter
+            else:
+                yield -endgame_value(child, windows, shape, deadline), index, letter
+
+def endgame_value(cells, windows, shape, deadline=None):
+    """
+    Best achievable (mover's points - opponent's points) over the rest of a
+    general game. Scoring a point keeps the turn, as in GeneralGame.place_letter.
+    Raises SearchTimeout if deadline passes first. The same cells on
+    transposed shapes (3x4 and 4x3) are different positions, so the shape is
+    part of the cache key.
+    """
+    key = (shape, cells)
+    value = _endgame_cache.get(key)
+    if value is None:
+        if deadline is not None and deadline.expired():
+            raise SearchTimeout()
+        value = max(score for score, _, _ in _endgame_moves(cells, windows, shape, deadline))
+        if len(_endgame_cache) >= ENDGAME_CACHE_SIZE:
+            _endgame_cache.clear()
+        _endgame_cache[key] = value
+    return value
+
+def solve_general_endgame(board, size, deadline=None):
+    """
+    Returns (score difference, (row, col, letter)) for the best move on a
+    general game board. If deadline passes, returns the best of the moves
+    fully evaluated so far, or None if there are none.
+    """
+    cells = "".join(cell or EMPTY_CELL for row in board for cell in row)
+    if EMPTY_CELL not in cells:
+        raise ValueError("Board is full")
+    best = None
+    shape = board_shape(size)
+    moves = _endgame_moves(cells, cell_windows(size), shape, deadline)
+    try:
+        for move in moves:
+            if best is None or move[0] > best[0]:
+                best = move
+    except SearchTimeout:
+        pass
+    if best is None:
+        return None
+    score, index, letter = best
+    return score, divmod(index, shape[1]) + (letter,)
+
+# --- Solver Player ---
+class SolverPlayer(ComputerPlayer):
+    """
+    CPU player for simple games that plays proven moves once the position has
+    at most max_empty empty cells and falls back to the standard heuristic
+    when the solver cannot finish within its budget.
+    """
+    def __init__(self, player_id, max_empty=12, node_budget=DEFAULT_NODE_BUDGET, time_budget=None, **kwargs):
+        super().__init__(player_id, **kwargs)
+        self.max_empty = max_empty
+        self.node_budget = node_budget
+        self.time_budget = time_budget
+        self._solvers = {}
+
+    def clone(self):
+        other = super().clone()
+        other._solvers = {}  # Solvers keep per-search state, so copies must not share them
+        return other
+
+    def choose_move(self, board, size, found, sos_checker, deadline):
+        cells = "".join(cell or EMPTY_CELL for row in board for cell in row)
+        if not found and cells.count(EMPTY_CELL) <= self.max_empty:
+            solver = self._solvers.get(size)
+            if solver is None:
+                solver = self._solvers[size] = SimpleSolver(size, self.node_budget, self.time_budget)
+            result = solver.solve(cells, self.player_id, deadline)
+            if result.outcome in (WIN, DRAW):
+                return result.move
+        return super().choose_move(board, size, found, sos_checker, deadline)
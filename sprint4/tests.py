@@ -1,6 +1,48 @@
 import unittest
-from gameLogic import GameLogic, ComputerPlayer, HumanPlayer
-from gui import MenuPage, GamePage, SOSApp
+from unittest import mock
+import pickle
+import random
+import os
+import tempfile
+import time
+from gameLogic import GameLogic, ComputerPlayer, HumanPlayer, MoveResult, INVALID_MOVE, SOSRegistry, PatternRule, parse_board_size
+from gameLogic import TimeControl, Deadline, HeuristicParams
+from tournament import Tournament, Entrant, SWISS, pairing_matches, play_match
+import solver
+import socket
+import threading
+import distributed
+import asyncio
+import loadtest
+from ponder import Ponderer, likely_moves
+try:
+    import numpy
+    import simulator
+    import dataset
+except ImportError:
+    numpy = None
+from solver import SimpleSolver, SolverPlayer, solve_general_endgame
+import io
+import subprocess
+import sys
+import cli
+import gameflow
+from gameflow import GameFlow, RecordingRenderer, VirtualClock, CPU_MOVE_DELAY, ANALYSIS_POLL
+from replay import Replay, ReplayViewer
+from analysis import MoveAnalyzer, cell_outcomes, best_outcome, SCORES, SAFE, GIFT
+from patterns import PatternTable, PatternPlayer, local_margins, train
+import tuner
+from results import ResultStore, GameSummary, summarize
+try:
+    from gui import MenuPage, GamePage, SOSApp
+    import tkinter
+    try:
+        tkinter.Tk().destroy()
+        NO_GUI = None
+    except tkinter.TclError:
+        NO_GUI = "no display for Tk"
+except ImportError:
+    NO_GUI = "tkinter not installed"
 
 class TestBoardSetup(unittest.TestCase):
     """Tests for board size validation and game initialization"""
@@ -23,6 +65,45 @@ class TestBoardSetup(unittest.TestCase):
                 with self.assertRaises((ValueError, TypeError)):
                     GameLogic(size, "simple")
 
+class TestRectangularBoards(unittest.TestCase):
+    """Tests for N x M boards"""
+
+    def test_rectangular_board_shape(self):
+        logic = GameLogic((3, 7), "general")
+        board = logic.game_mode.get_board()
+        self.assertEqual((len(board), len(board[0])), (3, 7))
+        self.assertTrue(logic.place_letter(2, 6, "S")["valid"])
+        self.assertFalse(logic.place_letter(3, 0, "S")["valid"])
+        self.assertEqual(GameLogic((5, 5)).game_mode.get_size(), 5)
+
+    def test_rectangular_scoring_and_snapshot(self):
+        logic = GameLogic((6, 3), "general")
+        logic.play_moves([(3, 2, "S"), (4, 1, "O"), (5, 0, "S"), (1, 0, "O")])
+        self.assertEqual(set(logic.game_mode.get_found()), {('D2', 3, 2)})
+        clone = logic.clone()
+        self.assertEqual(clone.snapshot(), logic.snapshot())
+        self.assertEqual(clone.game_mode.get_board()[5], ["S", "", ""])
+
+    def test_cpu_on_rectangular_board(self):
+        logic = GameLogic((3, 8), "simple", "computer", "human")
+        logic.game_mode._board[1][5] = "S"
+        logic.game_mode._board[1][6] = "O"
+        self.assertEqual(logic.get_cpu_move(), (1, 7, "S"))
+
+    def test_invalid_rectangular_sizes(self):
+        for size in [(2, 5), (5, 16), (5,), ("5", 5)]:
+            with self.subTest(size=size):
+                with self.assertRaises((ValueError, TypeError)):
+                    GameLogic(size)
+
+    def test_parse_board_size(self):
+        self.assertEqual(parse_board_size("7"), 7)
+        self.assertEqual(parse_board_size("5x9"), (5, 9))
+        self.assertEqual(parse_board_size("6 X 6"), 6)
+        with self.assertRaises(ValueError):
+            parse_board_size("5x")
+
+@unittest.skipIf(NO_GUI, NO_GUI)
 class TestGameCreate(unittest.TestCase):
     """Tests for starting games and GUI setup"""
     
@@ -46,6 +127,30 @@ class TestGameCreate(unittest.TestCase):
         self.assertEqual(frame.mode_label['text'], "General Game")
         self.assertEqual(len(frame.board_frame.winfo_children()), 3 * 3)
 
+    def test_game_page_built_on_first_use(self):
+        app = SOSApp()
+        self.assertNotIn("GamePage", app.frames)
+        app.set_game_config(3, "simple", 0, 0)
+        app.show_frame("GamePage")
+        self.assertIn("GamePage", app.frames)
+        app.destroy()
+
+    def test_board_cells_reused_across_games(self):
+        app = SOSApp()
+        app.set_game_config(4, "simple", 0, 0)
+        app.show_frame("GamePage")
+        frame = app.frames["GamePage"]
+        frame.handle_click(0, 0, "S")
+        first = [label for row in frame.labels for label in row]
+        frame.new_game()
+        app.show_frame("GamePage")
+        self.assertEqual([label for row in frame.labels for label in row], first)
+        self.assertEqual(frame.labels[0][0]["text"], "")
+        app.set_game_config(3, "simple", 0, 0)
+        app.show_frame("GamePage")
+        self.assertEqual(len(frame.board_frame.winfo_children()), 3 * 3)
+        app.destroy()
+
     def test_start_no_mode_selected(self):
         """AC 3.3 Test that starting a game without selecting a mode shows alert."""
         class DummyController:
@@ -104,6 +209,7 @@ class TestSimpleGame(unittest.TestCase):
         self.assertTrue(result["game_over"])
         self.assertEqual(result["winner"], "draw")
 
+    @unittest.skipIf(NO_GUI, NO_GUI)
     def test_simple_highlighting(self):
         """Highlighting in Simple Game"""
         app = SOSApp()
@@ -149,6 +255,7 @@ class TestGeneralGame(unittest.TestCase):
         self.assertEqual(result["sos_found"], 1)
         self.assertEqual(logic.get_current_player(), "p1")
 
+    @unittest.skipIf(NO_GUI, NO_GUI)
     def test_general_highlighting(self):
         """AC 7.1: Test that forming SOS highlights cells in general mode"""
         app = SOSApp()
@@ -277,6 +384,33 @@ class TestCPUMove(unittest.TestCase):
             moves_made += 1
         self.assertTrue(logic.game_mode.game_over() or moves_made == max_moves)
 
+class TestCPUSeeding(unittest.TestCase):
+    """Tests for per-player random streams"""
+
+    def _play_out(self, logic):
+        moves = []
+        while not logic.game_over():
+            move = logic.get_cpu_move()
+            moves.append(move)
+            logic.place_letter(*move)
+        return moves
+
+    def test_seeded_games_replay_exactly(self):
+        first = self._play_out(GameLogic(6, "general", "computer", "computer", seed=42))
+        random.seed(0)
+        second = self._play_out(GameLogic(6, "general", "computer", "computer", seed=42))
+        self.assertEqual(first, second)
+
+    def test_players_have_separate_streams(self):
+        logic = GameLogic(5, "simple", "computer", "computer", seed=1)
+        self.assertIsNot(logic.p1.rng, logic.p2.rng)
+        self.assertNotEqual(logic.p1.rng.random(), logic.p2.rng.random())
+
+    def test_injected_rng(self):
+        rng = random.Random(3)
+        player = ComputerPlayer("p1", rng=rng)
+        self.assertIs(player.rng, rng)
+
 class TestCPULogic(unittest.TestCase):
     """Tests for CPU intelligence and strategy (User Story 10)"""
 
@@ -328,5 +462,1062 @@ class TestCPULogic(unittest.TestCase):
         self.assertIn(letter, ["S", "O"])
         self.assertEqual(logic.game_mode._board[row][col], "")
 
+class TestMoveResult(unittest.TestCase):
+    """Tests for the compact move result objects"""
+
+    def test_result_dict_access(self):
+        logic = GameLogic(3, "general")
+        logic.place_letter(0, 0, "S")
+        logic.place_letter(0, 1, "O")
+        result = logic.place_letter(0, 2, "S")
+        self.assertIsInstance(result, MoveResult)
+        self.assertEqual(result["sos_found"], 1)
+        self.assertEqual(result.sos_ids, (('H', 0, 0),))
+        self.assertEqual(result["sos_list"], [[(0, 0), (0, 1), (0, 2)]])
+        self.assertEqual(result.to_dict()["valid"], True)
+        with self.assertRaises(KeyError):
+            result["missing"]
+
+    def test_invalid_result_is_shared(self):
+        logic = GameLogic(3, "simple")
+        logic.place_letter(1, 1, "S")
+        self.assertIs(logic.place_letter(1, 1, "O"), INVALID_MOVE)
+        self.assertIs(logic.place_letter(5, 5, "O"), INVALID_MOVE)
+        self.assertFalse(INVALID_MOVE["valid"])
+        self.assertEqual(INVALID_MOVE["sos_list"], [])
+
+class TestFoundRegistry(unittest.TestCase):
+    """Tests for the bitset found-SOS registry"""
+
+    def test_registry_membership(self):
+        registry = SOSRegistry(5)
+        ids = [('H', 0, 0), ('V', 2, 4), ('D1', 1, 1), ('D2', 0, 4)]
+        for sos_id in ids:
+            self.assertTrue(registry.add(sos_id))
+        self.assertFalse(registry.add(('V', 2, 4)))
+        self.assertEqual(len(registry), 4)
+        self.assertIn(('D2', 0, 4), registry)
+        self.assertNotIn(('D2', 0, 3), registry)
+        self.assertEqual(sorted(registry), sorted(ids))
+
+    def test_found_view_is_live_and_read_only(self):
+        logic = GameLogic(3, "general")
+        found = logic.game_mode.get_found()
+        logic.place_letter(0, 0, "S")
+        logic.place_letter(0, 1, "O")
+        logic.place_letter(0, 2, "S")
+        self.assertIn(('H', 0, 0), found)
+        self.assertEqual(len(found), 1)
+        self.assertFalse(hasattr(found, "add"))
+
+class TestPatternRules(unittest.TestCase):
+    """Tests for configurable pattern words"""
+
+    def test_longer_word(self):
+        logic = GameLogic(5, "general", rule=PatternRule("SOOS"))
+        logic.play_moves([(1, 0, "S"), (1, 1, "O"), (1, 2, "O")])
+        result = logic.place_letter(1, 3, "S")
+        self.assertEqual(result["sos_found"], 1)
+        self.assertEqual(result["sos_list"], [[(1, 0), (1, 1), (1, 2), (1, 3)]])
+        self.assertEqual(logic.get_scores()["p2"], 1)
+
+    def test_reversed_word_and_custom_alphabet(self):
+        logic = GameLogic(4, "simple", rule=PatternRule("CAT", "CATX"))
+        self.assertFalse(logic.place_letter(0, 0, "S")["valid"])
+        logic.play_moves([(0, 0, "X"), (3, 1, "T"), (2, 2, "A")])
+        result = logic.place_letter(1, 3, "C")
+        self.assertTrue(result["game_over"])
+        self.assertEqual(result["sos_list"], [[(1, 3), (2, 2), (3, 1)]])
+
+    def test_cpu_completes_custom_word(self):
+        logic = GameLogic(4, "simple", "computer", "human", rule=PatternRule("SSO"))
+        logic.game_mode._board[2][0] = "S"
+        logic.game_mode._board[2][1] = "S"
+        self.assertEqual(logic.get_cpu_move(), (2, 2, "O"))
+
+    def test_cpu_skips_sos_endgame_solver_for_other_words(self):
+        # Built directly, so the player keeps its default endgame threshold
+        player = ComputerPlayer("p1", seed=0, mode="general", rule=PatternRule("SOOS"))
+        logic = GameLogic(4, "general", rule=PatternRule("SOOS"))
+        logic.play_moves([(r, c, "O") for r in range(4) for c in range(4)][:-4])
+        game = logic.game_mode
+        with mock.patch("solver.solve_general_endgame") as solve:
+            move = player.make_move(game.get_board(), 4, game.get_found(), game.rule.scan)
+        solve.assert_not_called()
+        self.assertTrue(logic.place_letter(*move)["valid"])
+
+    def test_invalid_rules(self):
+        with self.assertRaises(ValueError):
+            PatternRule("S")
+        with self.assertRaises(ValueError):
+            PatternRule("SOS", "S")
+
+    def test_restore_updates_players_for_new_rule(self):
+        logic = GameLogic(4, "simple", "computer", "computer", seed=1)
+        rng = logic.p1.rng
+        logic.restore(GameLogic(4, "simple", rule=PatternRule("CAT", "CATX")).snapshot())
+        self.assertIs(logic.p1.rng, rng)
+        self.assertEqual(logic.p1.letters, ("C", "A", "T", "X"))
+        self.assertEqual(logic.p1.endgame_threshold, 0)
+        self.assertTrue(logic.place_letter(*logic.get_cpu_move())["valid"])
+        logic.restore(GameLogic(4, "general").snapshot())
+        self.assertEqual(logic.p2.letters, ("S", "O"))
+        self.assertGreater(logic.p2.endgame_threshold, 0)
+
+    def test_restore_updates_players_for_new_mode(self):
+        logic = GameLogic(4, "general", "computer", "computer", seed=2)
+        simple = GameLogic(4, "simple")
+        simple.play_moves([(r, c, "O") for r in range(4) for c in range(4)][:-3])
+        logic.restore(simple.snapshot())
+        self.assertEqual(logic.p2.mode, "simple")
+        with mock.patch("solver.solve_general_endgame") as solve:
+            move = logic.get_cpu_move()
+        solve.assert_not_called()
+        self.assertTrue(logic.place_letter(*move)["valid"])
+
+    def test_snapshot_keeps_rule(self):
+        logic = GameLogic(5, "general", rule=PatternRule("SOOS"))
+        clone = logic.clone()
+        self.assertEqual(clone.game_mode.rule, PatternRule("SOOS"))
+
+class TestSnapshot(unittest.TestCase):
+    """Tests for game snapshot and restore"""
+
+    def test_snapshot_round_trip(self):
+        logic = GameLogic(4, "general")
+        for r, c, letter in [(0, 0, "S"), (0, 1, "O"), (0, 2, "S"), (3, 3, "O")]:
+            logic.place_letter(r, c, letter)
+        snap = logic.snapshot()
+        copy = GameLogic.from_snapshot(pickle.loads(pickle.dumps(snap)))
+        self.assertEqual(copy.game_mode.get_board(), logic.game_mode.get_board())
+        self.assertEqual(copy.get_scores(), {"p1": 1, "p2": 0})
+        self.assertEqual(copy.get_current_player(), logic.get_current_player())
+        self.assertEqual(set(copy.game_mode.get_found()), set(logic.game_mode.get_found()))
+
+    def test_restore_discards_later_moves(self):
+        logic = GameLogic(3, "simple")
+        logic.place_letter(0, 0, "S")
+        snap = logic.snapshot()
+        logic.place_letter(0, 1, "O")
+        logic.place_letter(0, 2, "S")
+        self.assertTrue(logic.game_over())
+        logic.restore(snap)
+        self.assertFalse(logic.game_over())
+        self.assertEqual(logic.game_mode.get_board()[0], ["S", "", ""])
+        self.assertEqual(logic.get_current_player(), "p2")
+
+    def test_clone_is_independent(self):
+        logic = GameLogic(3, "simple", p1_type="computer")
+        clone = logic.clone()
+        clone.place_letter(1, 1, "O")
+        self.assertEqual(logic.game_mode.get_board()[1][1], "")
+        self.assertIsInstance(clone.p1, ComputerPlayer)
+
+class TestPlayMoves(unittest.TestCase):
+    """Tests for batch move replay"""
+
+    def test_replay_matches_place_letter(self):
+        rng = random.Random(7)
+        for mode in ("simple", "general"):
+            with self.subTest(mode=mode):
+                cells = [(r, c) for r in range(5) for c in range(5)]
+                rng.shuffle(cells)
+                moves = [(r, c, rng.choice("SO")) for r, c in cells]
+                stepped = GameLogic(5, mode)
+                played = []
+                for move in moves:
+                    if stepped.place_letter(*move)["game_over"]:
+                        played.append(move)
+                        break
+                    played.append(move)
+                snap, events = GameLogic(5, mode).play_moves(played, record_events=True)
+                self.assertEqual(snap, stepped.snapshot())
+                self.assertEqual(len(events), len(played))
+
+    def test_replay_rejects_illegal_move(self):
+        logic = GameLogic(3, "general")
+        with self.assertRaises(ValueError):
+            logic.play_moves([(0, 0, "S"), (0, 0, "O")])
+        self.assertEqual(logic.game_mode.get_board()[0][0], "S")
+
+    def test_replay_rejects_moves_after_win(self):
+        logic = GameLogic(3, "simple")
+        with self.assertRaises(ValueError):
+            logic.play_moves([(0, 0, "S"), (0, 1, "O"), (0, 2, "S"), (2, 2, "S")])
+        self.assertEqual(logic.game_mode.get_winner(), "p1")
+
+class FirstEmptyPlayer(ComputerPlayer):
+    """Weak test entrant that always plays O in the first empty cell"""
+    def make_move(self, board, size, found, sos_checker):
+        for r in range(size):
+            for c in range(size):
+                if board[r][c] == "":
+                    return (r, c, "O")
+        return None
+
+class TestTournament(unittest.TestCase):
+    """Tests for the strategy tournament runner"""
+
+    def setUp(self):
+        self.entrants = [Entrant("cpu", ComputerPlayer), Entrant("first", FirstEmptyPlayer)]
+
+    def test_round_robin_is_deterministic(self):
+        path = os.path.join(tempfile.mkdtemp(), "results.jsonl")
+        serial = Tournament(self.entrants, sizes=(3, 4), games_per_pairing=4, seed=5, workers=1).run()
+        pooled = Tournament(self.entrants, sizes=(3, 4), games_per_pairing=4, seed=5, workers=2,
+                            results_path=path).run()
+        self.assertEqual(serial, pooled)
+        self.assertEqual(len(serial), 2 * 2 * 4)
+        with open(path) as f:
+            self.assertEqual(len(f.readlines()), len(serial))
+
+    def test_threaded_matches_leave_stdout_alone(self):
+        stdout = sys.stdout
+        specs = pairing_matches([tuple(self.entrants)], (4,), ("general",), 8, seed=2)
+        threads = [threading.Thread(target=lambda spec=spec: play_match(spec)) for spec in specs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertIs(sys.stdout, stdout)
+
+    def test_match_leaves_global_random_alone(self):
+        random.seed(7)
+        expected = random.random()
+        random.seed(7)
+        play_match(pairing_matches([tuple(self.entrants)], (3,), ("simple",), 1, seed=2)[0])
+        self.assertEqual(random.random(), expected)
+
+    def test_ratings_rank_stronger_player(self):
+        tournament = Tournament(self.entrants, sizes=(4,), modes=("general",), games_per_pairing=20, workers=1)
+        tournament.run()
+        ratings = tournament.ratings()
+        self.assertGreater(ratings["cpu"][0], ratings["first"][0])
+        elo, low, high = ratings["cpu"]
+        self.assertLess(low, elo)
+        self.assertGreater(high, elo)
+        self.assertIn("cpu", tournament.report())
+
+    def test_swiss_rounds(self):
+        entrants = self.entrants + [Entrant("cpu2", ComputerPlayer), Entrant("first2", FirstEmptyPlayer)]
+        tournament = Tournament(entrants, modes=("simple",), pairing=SWISS, rounds=3, games_per_pairing=2, workers=1)
+        results = tournament.run()
+        self.assertEqual(len(results), 3 * 2 * 2)
+        self.assertEqual(sum(tournament.points().values()), len(results))
+
+class TestSimpleSolver(unittest.TestCase):
+    """Tests for the proof-number search solver"""
+
+    def test_immediate_win(self):
+        result = SimpleSolver(3).solve("SO.......", "p1")
+        self.assertEqual(result.outcome, "win")
+        self.assertEqual(result.move, (0, 2, "S"))
+
+    def test_forced_win(self):
+        # No immediate SOS, but (3, 0) S leaves p1 only losing replies
+        result = SimpleSolver(4).solve("SOOO.SSO.SSO.S..", "p2")
+        self.assertEqual(result.outcome, "win")
+        self.assertEqual(result.move, (3, 0, "S"))
+
+    def test_forced_loss(self):
+        result = SimpleSolver(4).solve("O..SO.SOOS.OS..S", "p2")
+        self.assertEqual(result.outcome, "loss")
+        self.assertTrue(result.complete)
+
+    def test_proven_draw_move_keeps_draw(self):
+        solver = SimpleSolver(4)
+        cells = ".OOO.O..OO.SO..O"
+        result = solver.solve(cells, "p1")
+        self.assertEqual(result.outcome, "draw")
+        row, col, letter = result.move
+        index = row * 4 + col
+        after = cells[:index] + letter + cells[index + 1:]
+        self.assertEqual(solver.solve(after, "p2").outcome, "draw")
+
+    def test_budget_exhausted(self):
+        result = SimpleSolver(5, node_budget=50).solve("." * 25, "p1")
+        self.assertIsNone(result.outcome)
+        self.assertFalse(result.complete)
+
+    def test_solver_player_in_game(self):
+        logic = GameLogic(4, "simple", p1_type="computer", p2_type="computer")
+        logic.p2 = SolverPlayer("p2")
+        board = logic.game_mode.get_board()
+        for i, letter in enumerate("SOOO.SSO.SSO.S.."):
+            if letter != ".":
+                board[i // 4][i % 4] = letter
+        logic.switch_turn()
+        self.assertEqual(logic.get_cpu_move(), (3, 0, "S"))
+
+def random_endgame(seed, size=4, empty=7):
+    """ CPU vs CPU general game filled at random until empty cells are left """
+    rng = random.Random(seed)
+    logic = GameLogic(size, "general", "computer", "computer", seed=seed)
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    rng.shuffle(cells)
+    logic.play_moves([(r, c, rng.choice("SO")) for r, c in cells[:-empty]])
+    return logic
+
+class TestGeneralEndgame(unittest.TestCase):
+    """Tests for the exact general game endgame solver"""
+
+    def test_predicted_margin_is_achieved(self):
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                logic = random_endgame(seed)
+                mover = logic.get_current_player()
+                before = logic.get_scores()
+                predicted, _ = solve_general_endgame(logic.game_mode.get_board(), 4)
+                while not logic.game_over():
+                    logic.place_letter(*logic.get_cpu_move())
+                after = logic.get_scores()
+                other = "p2" if mover == "p1" else "p1"
+                gained = (after[mover] - before[mover]) - (after[other] - before[other])
+                self.assertEqual(gained, predicted)
+
+    def test_transposed_shapes_cached_apart(self):
+        cells = "...O.OO.O.S."
+        wide = [[cell.strip(".") for cell in cells[r * 4:r * 4 + 4]] for r in range(3)]
+        tall = [[cell.strip(".") for cell in cells[r * 3:r * 3 + 3]] for r in range(4)]
+        solver._endgame_cache.clear()
+        cold = solve_general_endgame(tall, (4, 3))
+        solver._endgame_cache.clear()
+        self.assertNotEqual(solve_general_endgame(wide, (3, 4))[0], cold[0])
+        self.assertEqual(solve_general_endgame(tall, (4, 3)), cold)
+
+    def test_cpu_uses_solver_below_threshold(self):
+        logic = random_endgame(11, size=5, empty=6)
+        self.assertEqual(logic.get_cpu_move(), solve_general_endgame(logic.game_mode.get_board(), 5)[1])
+        self.assertGreater(len(solver._endgame_cache), 0)
+
+    def test_players_know_game_mode(self):
+        self.assertEqual(GameLogic(3, "simple", "computer", "human").p1.mode, "simple")
+        self.assertEqual(GameLogic(3, "general", "human", "computer").p2.mode, "general")
+
+class TestTimeControls(unittest.TestCase):
+    """Tests for CPU thinking time budgets"""
+
+    def test_move_budget(self):
+        self.assertIsNone(TimeControl().move_budget(0.0, 10))
+        self.assertEqual(TimeControl(per_move=0.5).move_budget(0.0, 10), 0.5)
+        self.assertEqual(TimeControl(per_game=10).move_budget(4.0, 6), 2.0)
+        self.assertEqual(TimeControl(per_move=1.5, per_game=10).move_budget(4.0, 6), 1.5)
+        self.assertEqual(TimeControl(per_game=1).move_budget(3.0, 6), 0.0)
+
+    def test_expired_deadline_still_moves(self):
+        logic = GameLogic(5, "general", "computer", "human", seed=1, time_control=TimeControl(per_move=0))
+        logic.play_moves([(0, 0, "S"), (0, 1, "O")])
+        for _ in range(10):
+            row, col, letter = logic.get_cpu_move()
+            self.assertTrue(logic.game_mode.is_valid_move(row, col))
+        self.assertGreater(logic.p1.time_used, 0.0)
+
+    def test_unlimited_matches_default(self):
+        timed = GameLogic(5, "general", "computer", "human", seed=1, time_control=TimeControl(per_move=60))
+        timed.play_moves([(0, 0, "S"), (0, 1, "O")])
+        self.assertEqual(timed.get_cpu_move(), (0, 2, "S"))
+
+    def test_endgame_any_time(self):
+        logic = random_endgame(3, empty=8)
+        board = logic.game_mode.get_board()
+        solver._endgame_cache.clear()
+        self.assertIsNone(solve_general_endgame(board, 4, Deadline(0)))
+        self.assertEqual(len(solver._endgame_cache), 0)
+        self.assertEqual(solve_general_endgame(board, 4, Deadline(60)), solve_general_endgame(board, 4))
+
+    def test_simple_solver_respects_deadline(self):
+        result = SimpleSolver(4).solve("." * 16, "p1", Deadline(0))
+        self.assertFalse(result.complete)
+
+    def test_simple_solver_stops_mid_search(self):
+        # Far too big to solve, so only the deadline can end the search
+        start = time.perf_counter()
+        result = SimpleSolver(7, node_budget=10 ** 9).solve("." * 49, "p1", Deadline(0.2))
+        self.assertFalse(result.complete)
+        self.assertGreater(result.nodes, solver.DEADLINE_CHECK_INTERVAL)
+        self.assertLess(time.perf_counter() - start, 5)
+
+    def test_time_control_from_json(self):
+        self.assertEqual(ComputerPlayer("p1", time_control=[0.1, None]).time_control, TimeControl(0.1))
+        self.assertEqual(GameLogic(3, "simple", "computer", "computer").clone().p1.time_control, TimeControl())
+
+class TestPatternTables(unittest.TestCase):
+    """Tests for pattern-value tables learned from self-play"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = train(4, "general", 30, workers=1, batch=10, seed=1, bits=14)
+
+    def test_keys_symmetric(self):
+        table = PatternTable(bits=14)
+        board = [[""] * 5 for _ in range(5)]
+        board[1][2], board[2][3] = "S", "O"
+        turned = [[board[4 - c][r] for c in range(5)] for r in range(5)]
+        keys = table.keys(board, 5, 5, 2, 2, "S")
+        turned_keys = table.keys(turned, 5, 5, 2, 2, "S")
+        self.assertEqual(keys[0], turned_keys[0])
+        self.assertEqual(sorted(keys[1:]), sorted(turned_keys[1:]))
+        self.assertNotEqual(keys, table.keys(board, 5, 5, 2, 2, "O"))
+
+    def test_local_margins(self):
+        played = [("p1", None, 0), ("p2", None, 1), ("p2", None, 0), ("p1", None, 2), ("p1", None, 0), ("p2", None, 0)]
+        self.assertEqual(local_margins(played), [-1, 1, -2, 2, 0, 0])
+
+    def test_training_fills_table(self):
+        self.assertGreater(len(self.table), 0)
+        self.assertEqual(sum(self.table.visits) % 5, 0)
+        self.assertTrue(any(self.table.weights))
+        again = train(4, "general", 30, workers=1, batch=10, seed=1, bits=14)
+        self.assertEqual(again.weights, self.table.weights)
+
+    def test_save_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "patterns.bin")
+            self.table.save(path)
+            loaded = PatternTable.load(path)
+        self.assertEqual((loaded.radius, loaded.bits), (self.table.radius, self.table.bits))
+        self.assertEqual(loaded.visits, self.table.visits)
+        self.assertEqual(loaded.weights, self.table.weights)
+
+    def test_player_makes_legal_moves(self):
+        logic = GameLogic(4, "general")
+        logic.p1 = PatternPlayer("p1", self.table, seed=1, mode="general")
+        logic.p2 = PatternPlayer("p2", self.table, seed=2, mode="general")
+        while not logic.game_over():
+            row, col, letter = logic.get_cpu_move()
+            self.assertTrue(logic.place_letter(row, col, letter)["valid"])
+
+class TestAutoTuner(unittest.TestCase):
+    """Tests for tunable CPU heuristics and the SPSA tuner"""
+
+    def test_params_from_json(self):
+        player = ComputerPlayer("p1", params=[1.0, 2.0])
+        self.assertEqual(player.params, HeuristicParams(1.0, 2.0, 0.0, 1.0))
+        self.assertIsNone(ComputerPlayer("p1").params)
+
+    def test_gift_penalty_avoids_gifts(self):
+        board = [["S", "", "", ""], ["", "", "", ""], ["", "", "", ""], ["", "", "", ""]]
+        player = ComputerPlayer("p1", seed=1, params=HeuristicParams(gift_penalty=5.0, temperature=0))
+        for _ in range(20):
+            row, col, letter = player._play_weighted_move(board, 4)
+            self.assertNotEqual(cell_outcomes(board, 4, row, col)[letter], GIFT)
+
+    def test_center_bias_and_letter_preference(self):
+        board = [[""] * 5 for _ in range(5)]
+        player = ComputerPlayer("p1", seed=1, params=HeuristicParams(-1.0, 0.0, 1.0, 0))
+        self.assertEqual(player._play_weighted_move(board, 5), (2, 2, "O"))
+        # (1, 1) completes a line with either letter
+        board[0][0], board[2][2], board[2][1], board[3][1] = "S", "S", "O", "S"
+        scan = GameLogic(5).game_mode.rule.scan
+        self.assertEqual(ComputerPlayer("p1")._find_sos_completing_move(board, 5, set(), scan), (1, 1, "S"))
+        self.assertEqual(player._find_sos_completing_move(board, 5, set(), scan), (1, 1, "O"))
+
+    def test_score_interval(self):
+        self.assertEqual(tuner.score_interval(0, 0), (0.5, 0.0, 1.0))
+        mean, low, high = tuner.score_interval(15, 20)
+        self.assertEqual(mean, 0.75)
+        self.assertLess(low, mean)
+        self.assertGreater(high, mean)
+
+    def test_checkpoint_resume(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tune.json")
+            options = dict(games=2, eval_every=1, eval_games=4, patience=10, seed=3, workers=1, checkpoint_path=path)
+            first = tuner.Tuner(3, "general", **options).run(2)
+            self.assertEqual(first.iterations, 2)
+            self.assertTrue(os.path.exists(path))
+            resumed = tuner.Tuner(3, "general", **options)
+            self.assertEqual(resumed.iteration, 2)
+            self.assertEqual(resumed.run(2), first)
+            straight = tuner.Tuner(3, "general", **dict(options, checkpoint_path=None)).run(3)
+            self.assertEqual(tuner.Tuner(3, "general", **options).run(3), straight)
+        self.assertIn("3x3", tuner.report({(3, "general"): first}))
+
+    def test_rectangular_checkpoint_resume(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tune.json")
+            options = dict(games=2, eval_every=1, eval_games=2, seed=1, workers=1, checkpoint_path=path)
+            tuner.Tuner((3, 4), "simple", **options).run(1)
+            self.assertEqual(tuner.Tuner((3, 4), "simple", **options).iteration, 1)
+            with self.assertRaises(ValueError):
+                tuner.Tuner((4, 3), "simple", **options)
+
+class TestResultStore(unittest.TestCase):
+    """Tests for the SQLite results store"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "results.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_summaries_round_trip(self):
+        logic = GameLogic(3, "general", "computer", "computer", seed=4)
+        snap, _ = logic.play_moves([(0, 0, "S"), (0, 1, "O"), (0, 2, "S")])
+        with ResultStore(self.path, batch=2) as store:
+            store.record(summarize(logic, 3, source="test"))
+            store.record_many(GameSummary((3, 4), "simple", "human", "computer", "p2", 0, 0, 5, played_at=100.0)
+                              for _ in range(4))
+            store.flush()
+            games = store.games(mode="general")
+            self.assertEqual(len(games), 1)
+            self.assertEqual((games[0]["p1_score"], games[0]["seed"], games[0]["source"]), (1, 4, "test"))
+            self.assertEqual(len(store.games(size=(3, 4), player_type="human")), 4)
+            self.assertEqual(store.games(until=200.0, limit=2)[0]["played_at"], 100.0)
+            journal = store._query("PRAGMA journal_mode")[0]["journal_mode"]
+            self.assertEqual(journal, "wal")
+
+    def test_aggregates(self):
+        rows = [GameSummary(3, "simple", "cpu", "random", "p1", 0, 0, 5, played_at=0.0),
+                GameSummary(3, "simple", "random", "cpu", "p2", 0, 0, 6, played_at=0.0),
+                GameSummary(3, "simple", "cpu", "random", "draw", 0, 0, 9, played_at=86400.0),
+                GameSummary(4, "general", "cpu", "cpu", "p1", 3, 1, 16, played_at=86400.0)]
+        with ResultStore(self.path) as store:
+            store.record_many(rows)
+            store.flush()
+            rates = {(r["rows"], r["mode"]): r for r in store.win_rates()}
+            self.assertEqual(rates[3, "simple"]["games"], 3)
+            self.assertAlmostEqual(rates[3, "simple"]["p1_rate"], 1 / 3)
+            self.assertAlmostEqual(rates[3, "simple"]["draw_rate"], 1 / 3)
+            players = {r["player_type"]: r for r in store.player_win_rates(size=3)}
+            self.assertEqual((players["cpu"]["games"], players["cpu"]["wins"]), (3, 2))
+            self.assertAlmostEqual(players["cpu"]["score"], 2.5 / 3)
+            days = store.games_per_day()
+            self.assertEqual([(d["day"], d["games"]) for d in days], [("1970-01-01", 2), ("1970-01-02", 2)])
+
+    def test_tournament_records_matches(self):
+        with ResultStore(self.path) as store:
+            tournament = Tournament([Entrant("cpu", ComputerPlayer), Entrant("first", FirstEmptyPlayer)], sizes=(3,),
+                                    modes=("general",), games_per_pairing=4, workers=1, store=store)
+            results = tournament.run()
+            store.flush()
+            players = {r["player_type"]: r for r in store.player_win_rates()}
+        self.assertEqual(players["cpu"]["wins"], sum(r.winner == "cpu" for r in results))
+        self.assertEqual(players["cpu"]["games"], len(results))
+
+@unittest.skipIf(numpy is None, "numpy not installed")
+class TestDatasetExport(unittest.TestCase):
+    """Tests for columnar position datasets"""
+
+    def test_rows_match_replayed_games(self):
+        games = list(dataset.self_play_games(4, "general", 3, seed=2))
+        with tempfile.TemporaryDirectory() as tmp:
+            # A chunk smaller than a game makes games straddle writes
+            rows = dataset.export(tmp, 4, "general", games, chunk=5)
+            data = dataset.load(tmp)
+            self.assertEqual(rows, sum(len(moves) for moves in games))
+            self.assertIsInstance(data["boards"], numpy.memmap)
+            self.assertEqual(data["boards"].shape, (rows, 4, 4))
+            self.assertEqual(data["boards"].dtype, numpy.int8)
+            self.assertTrue((data["legal"] == (data["boards"] == simulator.EMPTY)).all())
+            self.assertTrue((data["boards"][0] == 0).all())
+
+            logic = GameLogic(4, "general")
+            snap, _ = logic.play_moves(games[0])
+            first = data["game"] == 0
+            self.assertEqual(int(first.sum()), len(games[0]))
+            self.assertEqual(int(data["sos_found"][first].sum()), snap.p1_score + snap.p2_score)
+            self.assertTrue((data["p1_score"][first] == snap.p1_score).all())
+            row, col, letter = games[0][1]
+            self.assertEqual(tuple(data["moves"][1]), (row, col, simulator.LETTER_CODES[letter]))
+            self.assertEqual(list(data["to_move"][:1]), [0])
+            del data
+
+    def test_partial_dataset_loads(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = dataset.DatasetWriter(tmp, 3, "simple", chunk=4)
+            for moves in dataset.simulated_games(3, "simple", 5, seed=1):
+                writer.add_game(moves)
+            flushed = writer.count
+            self.assertEqual(len(dataset.load(tmp)["game"]), flushed)
+            writer.close()
+            self.assertEqual(len(dataset.load(tmp)["game"]), writer.count)
+            path = os.path.join(tmp, "positions.npz")
+            dataset.to_npz(tmp, path)
+            with numpy.load(path) as packed:
+                self.assertEqual(packed["moves"].shape, (writer.count, 3))
+
+@unittest.skipIf(numpy is None, "numpy not installed")
+class TestLockstepSimulator(unittest.TestCase):
+    """Tests for the vectorized random playout simulator"""
+
+    def test_matches_engine(self):
+        for mode in ("simple", "general"):
+            with self.subTest(mode=mode):
+                sim = simulator.LockstepSimulator(5, mode, batch=64, seed=3, record_moves=True)
+                result = sim.run()
+                for game in range(sim.batch):
+                    snap, _ = GameLogic(5, mode).play_moves(sim.moves(game))
+                    self.assertTrue(snap.game_ended)
+                    self.assertEqual(simulator.WINNER_NAMES[int(result.winner[game])], snap.winner)
+                    self.assertEqual((result.p1_score[game], result.p2_score[game]), (snap.p1_score, snap.p2_score))
+
+    def test_rectangular_matches_engine(self):
+        sim = simulator.LockstepSimulator((4, 7), "general", batch=32, seed=5, record_moves=True)
+        result = sim.run()
+        for game in range(sim.batch):
+            snap, _ = GameLogic((4, 7), "general").play_moves(sim.moves(game))
+            self.assertEqual((result.p1_score[game], result.p2_score[game]), (snap.p1_score, snap.p2_score))
+
+    def test_start_from_snapshot(self):
+        logic = GameLogic(4, "general")
+        logic.play_moves([(0, 0, "S"), (0, 1, "O"), (0, 2, "S")])
+        result = simulator.simulate(4, "general", 100, batch=32, seed=1, snapshot=logic.snapshot())
+        self.assertEqual(len(result.winner), 100)
+        self.assertTrue((result.p1_score >= 1).all())
+        self.assertTrue((result.length == 13).all())
+
+    def test_seeded_runs_repeat(self):
+        first = simulator.simulate(6, "simple", 50, batch=16, seed=9)
+        second = simulator.simulate(6, "simple", 50, batch=16, seed=9)
+        self.assertTrue((first.winner == second.winner).all())
+        summary = simulator.summarize(first)
+        self.assertEqual(summary["p1"] + summary["p2"] + summary["draw"], 50)
+
+    def test_no_games(self):
+        result = simulator.simulate(4, "general", 0, seed=2)
+        self.assertEqual([len(column) for column in result], [0, 0, 0, 0])
+        self.assertEqual(result.p1_score.dtype, numpy.int32)
+        self.assertEqual(simulator.summarize(result)["mean_p1_score"], 0.0)
+
+class TestDistributedSelfPlay(unittest.TestCase):
+    """Tests for the TCP coordinator and workers on localhost"""
+
+    def setUp(self):
+        cpu = {"player": "computer"}
+        self.jobs = distributed.make_jobs(4, "general", cpu, cpu, games=12, batch_size=3, seed=10)
+        self.coordinator = distributed.Coordinator(self.jobs).start()
+        self.addCleanup(self.coordinator.stop)
+
+    def _start_worker(self):
+        thread = threading.Thread(target=distributed.run_worker, args=self.coordinator.address, daemon=True)
+        thread.start()
+        return thread
+
+    def test_workers_complete_all_jobs(self):
+        workers = [self._start_worker() for _ in range(2)]
+        results = self.coordinator.wait(timeout=30)
+        self.assertEqual(sorted(results), [0, 1, 2, 3])
+        seeds = sorted(row[0] for rows in results.values() for row in rows)
+        self.assertEqual(seeds, list(range(10, 22)))
+        for worker in workers:
+            worker.join(timeout=5)
+        self.assertEqual(results[0], distributed.run_job(self.jobs[0]))
+
+    def test_lost_worker_job_is_reassigned(self):
+        # A worker that takes a job and disconnects without answering
+        with socket.create_connection(self.coordinator.address) as sock, sock.makefile("rwb") as stream:
+            distributed._send(stream, {"type": "request"})
+            lost_job = distributed._receive(stream)["job_id"]
+        self._start_worker()
+        results = self.coordinator.wait(timeout=30)
+        self.assertEqual(len(results[lost_job]), 3)
+
+    def test_result_after_failure_finishes_job(self):
+        coordinator = distributed.Coordinator(self.jobs[:1], job_timeout=0.01, max_attempts=1).start()
+        self.addCleanup(coordinator.stop)
+        with socket.create_connection(coordinator.address) as sock, sock.makefile("rwb") as stream:
+            distributed._send(stream, {"type": "request"})
+            job_id = distributed._receive(stream)["job_id"]
+            time.sleep(0.05)
+            # Asking again times the job out on its only attempt, which ends the run
+            distributed._send(stream, {"type": "request"})
+            self.assertEqual(distributed._receive(stream)["type"], "done")
+            self.assertEqual(coordinator.wait(timeout=5), {})
+            self.assertEqual(list(coordinator.failed), [job_id])
+            # The slow worker's result still counts
+            distributed._send(stream, {"type": "result", "job_id": job_id, "games": [[10, "p1", 2, 1, 16]]})
+            distributed._send(stream, {"type": "request"})
+            self.assertEqual(distributed._receive(stream)["type"], "done")
+        self.assertEqual(coordinator.wait(timeout=5), {job_id: [[10, "p1", 2, 1, 16]]})
+        self.assertEqual(coordinator.failed, {})
+
+    def test_only_known_players_resolve(self):
+        self.assertIs(distributed.resolve_player("computer"), ComputerPlayer)
+        for name in ("os:system", "gameLogic:ComputerPlayer", "human"):
+            with self.assertRaises(ValueError):
+                distributed.resolve_player(name)
+
+    def test_bad_job_fails_without_killing_workers(self):
+        bad = distributed.Job(4, 4, "general", {"player": "os:system"}, {"player": "computer"}, 0, 1)
+        coordinator = distributed.Coordinator(self.jobs + [bad], max_attempts=2).start()
+        self.addCleanup(coordinator.stop)
+        workers = [threading.Thread(target=distributed.run_worker, args=coordinator.address, daemon=True)
+                   for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        results = coordinator.wait(timeout=30)
+        self.assertEqual(sorted(results), [0, 1, 2, 3])
+        self.assertEqual(list(coordinator.failed), [4])
+        self.assertIn("os:system", coordinator.failed[4])
+        for worker in workers:
+            worker.join(timeout=5)
+            self.assertFalse(worker.is_alive())
+
+class TestLoadTest(unittest.TestCase):
+    """Tests for the game service and bot fleet"""
+
+    def _check_report(self, report, games):
+        self.assertEqual(report.games, games)
+        self.assertEqual(report.latency[loadtest.GAME_END].count, games)
+        counted = sum(summary.count for summary in report.latency.values())
+        self.assertEqual(counted, report.moves)
+        self.assertGreater(report.latency[loadtest.CPU_REPLY].count, 0)
+
+    def test_in_process_fleet(self):
+        service = loadtest.GameService(seed=1)
+        endpoint = loadtest.InProcessEndpoint(service)
+        report = asyncio.run(loadtest.run_load_test(endpoint, bots=30, games_per_bot=2, size=4,
+                                                    mode="general", seed=2))
+        self._check_report(report, 60)
+        self.assertEqual(service.games, {})
+        self.assertIn("cpu_reply", loadtest.format_report(report))
+
+    def test_tcp_fleet(self):
+        async def run():
+            server = await loadtest.serve(loadtest.GameService(seed=3))
+            endpoint = loadtest.TcpEndpoint(*server.sockets[0].getsockname()[:2])
+            report = await loadtest.run_load_test(endpoint, bots=10, size=(3, 4), think_time=0.001, seed=4)
+            server.close()
+            await server.wait_closed()
+            return report
+        self._check_report(asyncio.run(run()), 10)
+
+    def test_service_errors(self):
+        service = loadtest.GameService()
+        self.assertIn("error", service.handle({"op": "move", "game_id": 99}))
+        game_id = service.handle({"op": "new", "size": 3})["game_id"]
+        self.assertIn("error", service.handle({"op": "cpu", "game_id": game_id}))
+
+    def test_percentiles(self):
+        summary = loadtest.summarize_latencies([i / 100 for i in range(1, 101)])
+        self.assertEqual((summary.p50, summary.p90, summary.p99, summary.max), (0.5, 0.9, 0.99, 1.0))
+
+class TestPondering(unittest.TestCase):
+    """Tests for precomputing CPU replies during the human's turn"""
+
+    def test_likely_moves_prefer_completions(self):
+        logic = GameLogic(5, "simple", "human", "computer")
+        logic.play_moves([(2, 0, "S"), (2, 1, "O")])
+        moves = likely_moves(logic, limit=3)
+        self.assertEqual(len(moves), 3)
+        self.assertEqual(moves[0], (2, 2, "S"))
+        self.assertTrue(all(abs(r - 2) <= 1 and c <= 2 for r, c, _ in moves[1:]))
+
+    def test_hit_returns_cached_reply(self):
+        logic = GameLogic(5, "general", "human", "computer", seed=4)
+        logic.play_moves([(0, 0, "S"), (4, 4, "O")])
+        ponderer = Ponderer(max_candidates=4)
+        ponderer.start(logic)
+        ponderer.wait(timeout=10)
+        guessed = likely_moves(logic, limit=4)[-1]
+        logic.place_letter(*guessed)
+        reply = ponderer.lookup(logic)
+        self.assertIsNotNone(reply)
+        row, col, letter = reply
+        self.assertTrue(logic.place_letter(row, col, letter)["valid"])
+        self.assertEqual(ponderer.hits, 1)
+
+    def test_hit_plays_as_live_player(self):
+        logic = GameLogic(5, "general", "human", "computer", seed=4)
+        logic.p2.params = HeuristicParams(temperature=0.5)
+        logic.play_moves([(0, 0, "S"), (4, 4, "O")])
+        ponderer = Ponderer(max_candidates=4)
+        ponderer.start(logic)
+        ponderer.wait(timeout=10)
+        logic.place_letter(*likely_moves(logic, limit=4)[-1])
+        # The reply the live player would have chosen itself
+        reference = logic.clone()
+        reference.p2 = logic.p2.clone()
+        expected = reference.get_cpu_move()
+        self.assertEqual(ponderer.lookup(logic), expected)
+        self.assertEqual(logic.p2.rng.getstate(), reference.p2.rng.getstate())
+        self.assertGreater(logic.p2.time_used, 0)
+
+    def test_miss_discards_cache(self):
+        logic = GameLogic(5, "simple", "human", "computer")
+        ponderer = Ponderer(max_candidates=2)
+        ponderer.start(logic)
+        ponderer.wait(timeout=10)
+        logic.place_letter(4, 4, "O")
+        self.assertIsNone(ponderer.lookup(logic))
+        self.assertEqual(ponderer.misses, 1)
+        self.assertEqual(ponderer._cache, {})
+
+    def test_no_pondering_without_cpu(self):
+        ponderer = Ponderer()
+        ponderer.start(GameLogic(3, "simple"))
+        self.assertIsNone(ponderer._thread)
+
+class TestCommandLine(unittest.TestCase):
+    """Tests for the headless command line"""
+
+    def test_engine_import_is_light(self):
+        code = ("import sys, cli, tournament; "
+                "print(sorted({'tkinter', 'numpy', 'concurrent.futures', 'sqlite3'} & set(sys.modules)))")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout
+        self.assertEqual(output.strip(), "[]")
+
+    def test_play_cpu_game(self):
+        out = io.StringIO()
+        self.assertEqual(cli.main(["play", "--size", "4", "--mode", "general", "--p1", "computer",
+                                   "--p2", "computer", "--seed", "3"], out=out), 0)
+        self.assertIn("Score", out.getvalue())
+        self.assertNotIn(".", out.getvalue().splitlines()[-3])
+
+    def test_play_human_input(self):
+        args = cli.build_parser().parse_args(["play", "--p2", "human"])
+        out = io.StringIO()
+        moves = io.StringIO("0 0 S\n9 9 S\n0 0 O\n0 1 O\n0 2 S\n")
+        self.assertEqual(cli.play(args, out=out, stdin=moves), 0)
+        self.assertIn("off the board", out.getvalue())
+        self.assertIn("that cell is taken", out.getvalue())
+        self.assertIn("Winner: p1", out.getvalue())
+
+    def test_bench(self):
+        out = io.StringIO()
+        cli.main(["bench", "--size", "3x4", "--games", "5", "--seed", "1"], out=out)
+        self.assertTrue(out.getvalue().startswith("5 games"))
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_simulate(self):
+        out = io.StringIO()
+        cli.main(["simulate", "--size", "4", "--games", "100", "--seed", "1"], out=out)
+        counts = dict(line.split(": ") for line in out.getvalue().splitlines()[:3])
+        self.assertEqual(sum(int(v) for v in counts.values()), 100)
+
+class TestGameFlow(unittest.TestCase):
+    """Tests for running the game page flow without a display"""
+
+    def _flow(self, logic, **options):
+        flow = GameFlow(RecordingRenderer(), VirtualClock(), **options)
+        flow.new_board(logic)
+        return flow
+
+    def test_cpu_reply_waits_for_delay(self):
+        flow = self._flow(GameLogic(3, "simple", "human", "computer", seed=1))
+        flow.start()
+        self.assertTrue(flow.renderer.clickable)
+        flow.handle_click(0, 0, "S")
+        self.assertEqual(flow.renderer.status, "Current Turn: P2")
+        self.assertEqual(flow.clock.advance(CPU_MOVE_DELAY - 1), 0)
+        self.assertEqual(flow.clock.advance(1), 1)
+        self.assertEqual(flow.renderer.status, "Current Turn: P1")
+        self.assertEqual(sum(1 for letter in flow.renderer.cells.values() if letter), 2)
+
+    def test_occupied_cell_ignored(self):
+        flow = self._flow(GameLogic(3, "simple"))
+        flow.start()
+        flow.handle_click(1, 1, "S")
+        flow.handle_click(1, 1, "O")
+        self.assertEqual(flow.renderer.cells[1, 1], "S")
+        self.assertEqual(flow.logic.get_current_player(), "p2")
+
+    def test_clicks_ignored_after_game_over(self):
+        flow = self._flow(GameLogic(3, "simple"))
+        ended = []
+        flow.on_game_over = ended.append
+        flow.start()
+        for row, col, letter in [(0, 0, "S"), (1, 1, "O"), (0, 1, "O"), (0, 2, "S"), (2, 2, "S"), (2, 0, "O")]:
+            flow.handle_click(row, col, letter)
+        self.assertEqual(len(flow.moves), 4)
+        self.assertEqual(len(ended), 1)
+        self.assertEqual(flow.renderer.cells[2, 2], "")
+
+    def test_clicks_ignored_on_cpu_turn(self):
+        flow = self._flow(GameLogic(3, "simple", "human", "computer", seed=1))
+        flow.start()
+        flow.handle_click(0, 0, "S")
+        flow.handle_click(2, 2, "O")
+        self.assertEqual(flow.moves, [(0, 0, "S")])
+        flow.clock.advance(CPU_MOVE_DELAY)
+        self.assertEqual(len(flow.moves), 2)
+        self.assertEqual(flow.logic.get_current_player(), "p1")
+
+    def test_highlight_and_scores(self):
+        logic = GameLogic(3, "general")
+        flow = self._flow(logic, letter_for=lambda player: "S")
+        logic.place_letter(1, 0, "S")
+        logic.place_letter(1, 1, "O")
+        flow.start()
+        flow.handle_click(1, 2)
+        self.assertEqual(flow.renderer.highlights, {(1, 0): "cyan", (1, 1): "cyan", (1, 2): "cyan"})
+        self.assertEqual(flow.renderer.scores, (1, 0))
+
+    def test_cpu_game_runs_to_end(self):
+        logic = GameLogic(5, "general", "computer", "computer", seed=9)
+        flow = self._flow(logic)
+        self.assertFalse(flow.renderer.clickable)
+        flow.start()
+        flow.clock.run()
+        self.assertFalse(flow.game_active)
+        self.assertTrue(logic.game_over())
+        self.assertIn(flow.renderer.status, ("P1 Wins!", "P2 Wins!", "Draw!"))
+        board = logic.game_mode.get_board()
+        self.assertTrue(all(board[r][c] == letter for (r, c), letter in flow.renderer.cells.items()))
+        self.assertEqual(flow.clock.now, 25 * CPU_MOVE_DELAY)
+
+    def test_fast_forward_draws_final_board_once(self):
+        flow = self._flow(GameLogic(4, "general", "computer", "computer", seed=2))
+        flow.fast_forward = True
+        flow.frame_interval = 0
+        flow.start()
+        flow.clock.run()
+        self.assertEqual(flow.clock.now, 0)
+        calls = [call[0] for call in flow.renderer.calls]
+        self.assertEqual(calls[-2:], ["disable_board", "set_status"])
+        self.assertEqual(calls.count("set_cell"), 16)
+        self.assertNotIn("set_status", calls[:-1])
+
+    def test_fast_forward_yields_by_time(self):
+        flow = self._flow(GameLogic(4, "general", "computer", "computer", seed=2))
+        flow.fast_forward = True
+        flow.frame_interval = 0
+        flow.start()
+        # With no time to spare every batch is a single move
+        with mock.patch.object(gameflow, "FAST_FORWARD_SLICE", 0):
+            self.assertEqual(flow.clock.run(), 16)
+        self.assertTrue(flow.logic.game_over())
+
+class TestMoveAnalysis(unittest.TestCase):
+    """Tests for the live move analysis overlay"""
+
+    def test_cell_outcomes(self):
+        logic = GameLogic(3, "general")
+        logic.play_moves([(0, 0, "S"), (0, 1, "O")])
+        board = logic.game_mode.get_board()
+        self.assertEqual(cell_outcomes(board, 3, 0, 2), {"S": SCORES, "O": SAFE})
+        self.assertEqual(cell_outcomes(board, 3, 2, 0), {"S": GIFT, "O": SAFE})
+        self.assertEqual(cell_outcomes(board, 3, 1, 1), {"S": SAFE, "O": GIFT})
+        self.assertIsNone(cell_outcomes(board, 3, 0, 0))
+        self.assertEqual(best_outcome({"S": GIFT, "O": GIFT}), GIFT)
+
+    def test_incremental_matches_full_analysis(self):
+        logic = GameLogic(6, "general")
+        analyzer = MoveAnalyzer()
+        analyzer.reset(logic)
+        shown = {}
+        rng = random.Random(3)
+        cells = [(r, c) for r in range(6) for c in range(6)]
+        rng.shuffle(cells)
+        for row, col in cells[:20]:
+            logic.place_letter(row, col, rng.choice("SO"))
+            analyzer.moved(logic, row, col)
+        analyzer.wait()
+        for row, col, outcomes in analyzer.drain():
+            shown[row, col] = outcomes
+        board = logic.game_mode.get_board()
+        for row, col in cells:
+            self.assertEqual(shown[row, col], cell_outcomes(board, 6, row, col))
+        analyzer.close()
+
+    def test_flow_shades_empty_cells(self):
+        flow = GameFlow(RecordingRenderer(), VirtualClock())
+        flow.set_analyzer(MoveAnalyzer())
+        logic = GameLogic(3, "simple")
+        flow.new_board(logic)
+        flow.start()
+        flow.handle_click(0, 0, "S")
+        flow.handle_click(1, 1, "O")
+        flow.analyzer.wait()
+        flow.clock.advance(ANALYSIS_POLL)
+        board = logic.game_mode.get_board()
+        expected = {(r, c): best_outcome(cell_outcomes(board, 3, r, c))
+                    for r in range(3) for c in range(3) if board[r][c] == ""}
+        self.assertEqual(flow.renderer.shades, expected)
+        self.assertEqual(flow.renderer.shades[2, 2], SCORES)
+        flow.set_analyzer(None)
+        self.assertEqual(flow.renderer.shades, {})
+
+class TestReplay(unittest.TestCase):
+    """Tests for keyframed replays"""
+
+    def _cpu_game(self, size, mode, seed):
+        flow = GameFlow(RecordingRenderer(), VirtualClock(), cpu_delay=0)
+        flow.new_board(GameLogic(size, mode, "computer", "computer", seed=seed))
+        flow.start()
+        flow.clock.run()
+        return flow.moves
+
+    def test_frames_match_replayed_positions(self):
+        moves = self._cpu_game(5, "general", 6)
+        self.assertEqual(len(moves), 25)
+        for interval in (1, 7, 16):
+            replay = Replay(5, "general", moves, keyframe_interval=interval)
+            for index in range(len(moves) + 1):
+                logic = GameLogic(5, "general")
+                logic.play_moves(moves[:index])
+                self.assertEqual(replay.frame(index), logic.snapshot())
+        self.assertEqual(replay.moves(), moves)
+        with self.assertRaises(IndexError):
+            replay.frame(26)
+
+    def test_simple_game_frames(self):
+        moves = self._cpu_game((3, 5), "simple", 2)
+        replay = Replay((3, 5), "simple", moves, keyframe_interval=4)
+        self.assertTrue(replay.frame(len(moves)).game_ended)
+        logic = GameLogic.from_snapshot(replay.frame(len(moves) - 1))
+        self.assertTrue(logic.place_letter(*moves[-1])["game_over"])
+
+    def test_viewer_seeks_incrementally(self):
+        moves = self._cpu_game(4, "general", 11)
+        replay = Replay(4, "general", moves, keyframe_interval=5)
+        colors = {"p1": "cyan", "p2": "red"}
+        viewer = ReplayViewer(replay, RecordingRenderer(), colors)
+        viewer.renderer.new_board(4, 4, False)
+        for index in (len(moves), 0, 9, 3, len(moves), 12):
+            viewer.seek(index)
+            fresh = ReplayViewer(replay, RecordingRenderer(), colors)
+            fresh.renderer.new_board(4, 4, False)
+            fresh.seek(index)
+            self.assertEqual(viewer.renderer.cells, fresh.renderer.cells)
+            self.assertEqual(viewer.renderer.highlights, fresh.renderer.highlights)
+            self.assertEqual(viewer.renderer.scores, replay._scores[index])
+        calls = len(viewer.renderer.calls)
+        viewer.seek(12)
+        self.assertEqual([call[0] for call in viewer.renderer.calls[calls:]], ["set_scores", "set_status"])
+
+@unittest.skipIf(NO_GUI, NO_GUI)
+class TestFastForward(unittest.TestCase):
+    """Tests for fast-forwarding CPU vs CPU games in the GUI"""
+
+    def _cpu_game(self, frame_interval):
+        app = SOSApp()
+        app.set_game_config(4, "general", 1, 1)
+        frame = app.frames["GamePage"]
+        frame.fast_forward.set(True)
+        frame.flow.frame_interval = frame_interval
+        app.show_frame("GamePage")
+        for _ in range(100):
+            if not frame.game_active:
+                break
+            app.update()
+        return app, frame
+
+    def test_final_board_only(self):
+        app, frame = self._cpu_game(0)
+        self.assertFalse(frame.game_active)
+        board = frame.logic.game_mode.get_board()
+        for r, row in enumerate(frame.labels):
+            for c, label in enumerate(row):
+                self.assertEqual(label["text"], board[r][c])
+        app.destroy()
+
+    def test_resume_step_by_step(self):
+        app = SOSApp()
+        app.set_game_config(4, "general", 1, 1)
+        frame = app.frames["GamePage"]
+        frame.fast_forward.set(True)
+        frame.flow.frame_interval = 1
+        app.show_frame("GamePage")
+        app.update()
+        frame.fast_forward.set(False)
+        app.update()
+        self.assertTrue(frame.game_active)
+        self.assertEqual(frame.flow._pending_cells, [])
+        app.destroy()
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
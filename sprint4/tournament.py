@@ -0,0 +1,211 @@
+import contextlib
+import json
+import math
+import random
+from collections import namedtuple
+
+from gameLogic import GameLogic, ComputerPlayer, PLAYER_1, PLAYER_2
+
+ROUND_ROBIN = "round_robin"
+SWISS = "swiss"
+BASE_ELO = 1500
+ELO_ITERATIONS = 200
+CONFIDENCE_Z = 1.96  # 95% interval
+
+# A tournament participant. player_class must be a picklable Player subclass
+# whose make_move(board, size, found, sos_checker) returns (row, col, letter).
+Entrant = namedtuple("Entrant", ["name", "player_class", "options"], defaults=[ComputerPlayer, None])
+
+MatchSpec = namedtuple("MatchSpec", ["index", "p1", "p2", "size", "mode", "seed"])
+MatchResult = namedtuple("MatchResult", ["index", "p1", "p2", "size", "mode", "seed", "winner",
+                                         "p1_score", "p2_score", "moves", "forfeit"])
+
+# --- Match Play ---
+def _make_player(entrant, player_id, rng, mode):
+    options = dict(entrant.options or {})
+    if issubclass(entrant.player_class, ComputerPlayer):
+        options.setdefault("rng", rng)
+        options.setdefault("mode", mode)
+    return entrant.player_class(player_id, **options)
+
+def play_match(spec):
+    """ Plays one game between two entrants; winner is an entrant name or "draw" """
+    # Each CPU entrant draws from its own stream split off the match seed
+    seeds = random.Random(spec.seed)
+    logic = GameLogic(spec.size, spec.mode)
+    players = {PLAYER_1: _make_player(spec.p1, PLAYER_1, random.Random(seeds.getrandbits(64)), spec.mode),
+               PLAYER_2: _make_player(spec.p2, PLAYER_2, random.Random(seeds.getrandbits(64)), spec.mode)}
+    names = {PLAYER_1: spec.p1.name, PLAYER_2: spec.p2.name, "draw": "draw"}
+    moves = 0
+    forfeit = False
+    winner = None
+    while winner is None:
+        current = logic.get_current_player()
+        move = players[current].make_move(logic.game_mode.get_board(), spec.size,
+                                          logic.game_mode.get_found(), logic.game_mode.rule.scan)
+        result = logic.place_letter(*move) if move else None
+        if result is None or not result["valid"]:
+            forfeit = True
+            winner = PLAYER_2 if current == PLAYER_1 else PLAYER_1
+            break
+        moves += 1
+        if result["game_over"]:
+            winner = result["winner"]
+    snap = logic.snapshot()
+    return MatchResult(spec.index, spec.p1.name, spec.p2.name, spec.size, spec.mode, spec.seed,
+                       names[winner], snap.p1_score, snap.p2_score, moves, forfeit)
+
+# --- Scheduling ---
+def _match_seed(seed, index):
+    return seed * 1000003 + index
+
+def pairing_matches(pairs, sizes, modes, games_per_pairing, seed, start_index=0):
+    """ Expands entrant pairs into match specs, alternating who moves first """
+    specs = []
+    index = start_index
+    for a, b in pairs:
+        for size in sizes:
+            for mode in modes:
+                for game in range(games_per_pairing):
+                    p1, p2 = (a, b) if game % 2 == 0 else (b, a)
+                    specs.append(MatchSpec(index, p1, p2, size, mode, _match_seed(seed, index)))
+                    index += 1
+    return specs
+
+def round_robin_pairs(entrants):
+    return [(a, b) for i, a in enumerate(entrants) for b in entrants[i + 1:]]
+
+def swiss_pairs(entrants, points, played):
+    """
+    Pairs entrants with similar points, avoiding rematches where possible.
+    With an odd field the lowest ranked unpaired entrant sits out the round.
+    """
+    ranked = sorted(entrants, key=lambda e: (-points.get(e.name, 0), e.name))
+    pairs = []
+    while len(ranked) > 1:
+        first = ranked.pop(0)
+        opponent = next((e for e in ranked if frozenset((first.name, e.name)) not in played), ranked[0])
+        ranked.remove(opponent)
+        pairs.append((first, opponent))
+    return pairs
+
+# --- Ratings ---
+def elo_ratings(results):
+    """
+    Fits Bradley-Terry strengths (draws count as half a win) and returns
+    {name: (elo, low, high)} with a 95% confidence interval. Each entrant gets
+    one virtual draw against a BASE_ELO opponent so unbeaten or winless
+    entrants still get finite ratings.
+    """
+    names = sorted({r.p1 for r in results} | {r.p2 for r in results})
+    points = {name: 0.5 for name in names}
+    games = {name: {} for name in names}
+    for r in results:
+        games[r.p1][r.p2] = games[r.p1].get(r.p2, 0) + 1
+        games[r.p2][r.p1] = games[r.p2].get(r.p1, 0) + 1
+        if r.winner == "draw":
+            points[r.p1] += 0.5
+            points[r.p2] += 0.5
+        else:
+            points[r.winner] += 1
+
+    gamma = {name: 1.0 for name in names}
+    for _ in range(ELO_ITERATIONS):
+        updated = {}
+        for name in names:
+            denom = 1.0 / (gamma[name] + 1.0)
+            for other, n in games[name].items():
+                denom += n / (gamma[name] + gamma[other])
+            updated[name] = points[name] / denom
+        gamma = updated
+
+    scale = 400 / math.log(10)
+    ratings = {}
+    for name in names:
+        g = gamma[name]
+        info = g / (g + 1.0) ** 2
+        for other, n in games[name].items():
+            info += n * g * gamma[other] / (g + gamma[other]) ** 2
+        elo = BASE_ELO + scale * math.log(g)
+        margin = CONFIDENCE_Z * scale / math.sqrt(info)
+        ratings[name] = (elo, elo - margin, elo + margin)
+    return ratings
+
+# --- Tournament Runner ---
+class Tournament:
+    """
+    Schedules entrants across board sizes and modes and plays the matches on a
+    process pool. Each match has its own seed, so results do not depend on the
+    number of workers. Finished matches are appended to results_path as JSON lines
+    and recorded in store, a results.ResultStore, when given.
+    """
+    def __init__(self, entrants, sizes=(3,), modes=("simple", "general"), pairing=ROUND_ROBIN,
+                 rounds=3, games_per_pairing=2, seed=0, workers=None, results_path=None, store=None):
+        if len({e.name for e in entrants}) != len(entrants):
+            raise ValueError("Entrant names must be unique")
+        if pairing not in (ROUND_ROBIN, SWISS):
+            raise ValueError(f"Invalid pairing: {pairing}")
+        self.entrants = list(entrants)
+        self.sizes = tuple(sizes)
+        self.modes = tuple(modes)
+        self.pairing = pairing
+        self.rounds = rounds
+        self.games_per_pairing = games_per_pairing
+        self.seed = seed
+        self.workers = workers
+        self.results_path = results_path
+        self.store = store
+        self.results = []
+
+    def run(self):
+        # Imported here so workers that only call play_match skip multiprocessing's import cost
+        from concurrent.futures import ProcessPoolExecutor
+        with contextlib.ExitStack() as stack:
+            out = stack.enter_context(open(self.results_path, "a")) if self.results_path else None
+            pool = stack.enter_context(ProcessPoolExecutor(self.workers)) if self.workers != 1 else None
+            if self.pairing == ROUND_ROBIN:
+                self._play_round(round_robin_pairs(self.entrants), pool, out)
+            else:
+                played = set()
+                for _ in range(self.rounds):
+                    pairs = swiss_pairs(self.entrants, self.points(), played)
+                    played.update(frozenset((a.name, b.name)) for a, b in pairs)
+                    self._play_round(pairs, pool, out)
+        self.results.sort(key=lambda r: r.index)
+        return self.results
+
+    def _play_round(self, pairs, pool, out):
+        specs = pairing_matches(pairs, self.sizes, self.modes, self.games_per_pairing,
+                                self.seed, start_index=len(self.results))
+        finished = pool.map(play_match, specs) if pool else map(play_match, specs)
+        if self.store is not None:
+            from results import from_match  # sqlite3 is only loaded for runs that store results
+        for result in finished:
+            self.results.append(result)
+            if out:
+                out.write(json.dumps(result._asdict()) + "\n")
+                out.flush()
+            if self.store is not None:
+                self.store.record(from_match(result))
+
+    def points(self):
+        points = {e.name: 0.0 for e in self.entrants}
+        for r in self.results:
+            if r.winner == "draw":
+                points[r.p1] += 0.5
+                points[r.p2] += 0.5
+            else:
+                points[r.winner] += 1
+        return points
+
+    def ratings(self):
+        return elo_ratings(self.results)
+
+    def report(self):
+        """ Returns a plain-text standings table sorted by Elo """
+        ratings = self.ratings()
+        points = self.points()
+        lines = [f"{'Entrant':<20}{'Points':>8}{'Elo':>8}  95% CI"]
+        for name, (elo, low, high) in sorted(ratings.items(), key=lambda item: -item[1][0]):
+            lines.append(f"{name:<20}{points[name]:>8.1f}{elo:>8.0f}  [{low:.0f}, {high:.0f}]")
+        return "\n".join(lines)
@@ -0,0 +1,227 @@
+"""
+Auto-tuner for ComputerPlayer's HeuristicParams.
+SPSA: each iteration perturbs every parameter at once by +/- c_k (in units
+of its PARAM_BOUNDS range), plays a batch of self-play games between the two
+perturbed players and steps toward whichever did better. Every eval_every
+iterations the current parameters play the untuned CPU in chunks, stopping
+as soon as the 95% interval of their score clears the best score so far
+either way; tuning stops after patience evaluations without improvement.
+Progress is checkpointed as JSON after every iteration, and iteration seeds
+depend only on the tuner seed, so a resumed run continues where it stopped.
+"""
+import contextlib
+import json
+import math
+import os
+import random
+from collections import namedtuple
+
+from gameLogic import ComputerPlayer, HeuristicParams, PARAM_BOUNDS, size_label
+from tournament import Entrant, MatchSpec, play_match, _match_seed, CONFIDENCE_Z
+
+SPSA_A = 0.2      # Step size numerator
+SPSA_C = 0.1      # Perturbation size numerator, as a share of each range
+SPSA_ALPHA = 0.602
+SPSA_GAMMA = 0.101
+STABILITY = 10    # Iterations added to k in the step size, damping the first steps
+DEFAULT_GAMES = 20  # Games per SPSA iteration
+EVAL_CHUNK = 20
+EVAL_GAMES = 200
+EVAL_INDEX = 1 << 40  # Evaluation match indexes start here, clear of every SPSA batch
+BASELINE = Entrant("baseline")
+
+TuneResult = namedtuple("TuneResult", ["size", "mode", "params", "score", "low", "high", "iterations", "games"])
+
+def score_interval(points, games):
+    """ Mean score and its 95% normal interval from points (1 per win, 0.5 per draw) over games """
+    if not games:
+        return 0.5, 0.0, 1.0
+    mean = points / games
+    margin = CONFIDENCE_Z * math.sqrt(max(mean * (1 - mean), 0.25 / games) / games)
+    return mean, max(0.0, mean - margin), min(1.0, mean + margin)
+
+def to_params(x):
+    """ HeuristicParams for a point of the unit cube, one axis per PARAM_BOUNDS range """
+    return HeuristicParams(*(low + value * (high - low) for value, (low, high) in zip(x, PARAM_BOUNDS)))
+
+def to_unit(params):
+    return [(value - low) / (high - low) for value, (low, high) in zip(params, PARAM_BOUNDS)]
+
+def _clip(x):
+    return [min(1.0, max(0.0, value)) for value in x]
+
+class Tuner:
+    """
+    Tunes HeuristicParams for one board size and mode. Matches run on a
+    process pool (in-process when workers is 1). checkpoint_path, if given,
+    is resumed from when it exists.
+    """
+    def __init__(self, size, mode, start=None, games=DEFAULT_GAMES, eval_every=5, eval_games=EVAL_GAMES,
+                 patience=3, seed=0, workers=None, checkpoint_path=None):
+        self.size = size
+        self.mode = mode
+        self.games = games + games % 2  # Even, so both sides move first equally often
+        self.eval_every = eval_every
+        self.eval_games = eval_games
+        self.patience = patience
+        self.seed = seed
+        self.workers = workers
+        self.checkpoint_path = checkpoint_path
+        self.iteration = 0
+        self.x = to_unit(start or HeuristicParams())
+        self.best = list(self.x)
+        self.best_score = None  # (mean, low, high) against the baseline, once the start is evaluated
+        self.stale = 0
+        self.games_played = 0
+        self.history = []
+        self._pool = None
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            self._load()
+
+    # --- Checkpoints ---
+    def _state(self):
+        return {"size": self.size, "mode": self.mode, "seed": self.seed, "iteration": self.iteration,
+                "x": self.x, "best": self.best, "best_score": self.best_score and list(self.best_score),
+                "stale": self.stale, "games_played": self.games_played, "history": self.history}
+
+    def _load(self):
+        with open(self.checkpoint_path) as f:
+            state = json.load(f)
+        # JSON turns a (rows, cols) size into a list
+        size = state["size"] if isinstance(state["size"], int) else tuple(state["size"])
+        if (size, state["mode"], state["seed"]) != (self.size, self.mode, self.seed):
+            raise ValueError(f"{self.checkpoint_path} is a checkpoint for another tuning run")
+        self.iteration = state["iteration"]
+        self.x = state["x"]
+        self.best = state["best"]
+        self.best_score = state["best_score"] and tuple(state["best_score"])
+        self.stale = state["stale"]
+        self.games_played = state["games_played"]
+        self.history = state["history"]
+
+    def save(self):
+        if not self.checkpoint_path:
+            return
+        partial = self.checkpoint_path + ".tmp"
+        with open(partial, "w") as f:
+            json.dump(self._state(), f)
+        os.replace(partial, self.checkpoint_path)  # A crash mid-write leaves the last checkpoint intact
+
+    # --- Play ---
+    def _play(self, a, b, games, index):
+        """ Points a scores over games against b, alternating who moves first """
+        specs = []
+        for game in range(games):
+            p1, p2 = (a, b) if game % 2 == 0 else (b, a)
+            seed = _match_seed(self.seed, index + game)
+            specs.append(MatchSpec(index + game, p1, p2, self.size, self.mode, seed))
+        finished = self._pool.map(play_match, specs) if self._pool else map(play_match, specs)
+        points = 0.0
+        for result in finished:
+            points += 1.0 if result.winner == a.name else 0.5 if result.winner == "draw" else 0.0
+        self.games_played += games
+        return points
+
+    @staticmethod
+    def _entrant(name, x):
+        return Entrant(name, ComputerPlayer, {"params": to_params(x)})
+
+    def step(self):
+        """ One SPSA iteration """
+        k = self.iteration
+        rng = random.Random(_match_seed(self.seed, k))
+        delta = [rng.choice((-1, 1)) for _ in self.x]
+        c_k = SPSA_C / (k + 1) ** SPSA_GAMMA
+        a_k = SPSA_A / (k + 1 + STABILITY) ** SPSA_ALPHA
+        plus = _clip([value + c_k * d for value, d in zip(self.x, delta)])
+        minus = _clip([value - c_k * d for value, d in zip(self.x, delta)])
+        points = self._play(self._entrant("plus", plus), self._entrant("minus", minus), self.games,
+                            index=k * 1000003)
+        # Score of plus over minus, -1..1, divided by the perturbation
+        gain = (2 * points / self.games - 1) / (2 * c_k)
+        self.x = _clip([value + a_k * gain * d for value, d in zip(self.x, delta)])
+        self.iteration += 1
+
+    def evaluate(self, x, index):
+        """
+        Score of x against the baseline CPU as (mean, low, high), in chunks
+        until the interval clears the best score either way or eval_games are
+        played. Without a best score yet, all eval_games are played.
+        """
+        points = 0.0
+        games = 0
+        score = score_interval(points, games)
+        while games < self.eval_games:
+            chunk = min(EVAL_CHUNK, self.eval_games - games)
+            points += self._play(self._entrant("candidate", x), BASELINE, chunk, index + games)
+            games += chunk
+            score = score_interval(points, games)
+            if self.best_score and (score[1] > self.best_score[0] or score[2] < self.best_score[0]):
+                break
+        return score
+
+    def run(self, iterations):
+        """ Runs up to iterations SPSA steps in total and returns the best TuneResult """
+        with contextlib.ExitStack() as stack:
+            if self.workers != 1:
+                from concurrent.futures import ProcessPoolExecutor
+                self._pool = stack.enter_context(ProcessPoolExecutor(self.workers))
+            try:
+                if self.best_score is None:
+                    self.best_score = self.evaluate(self.best, EVAL_INDEX)
+                    self.save()
+                while self.iteration < iterations and self.stale < self.patience:
+                    self.step()
+                    if self.iteration % self.eval_every == 0:
+                        score = self.evaluate(self.x, EVAL_INDEX + self.iteration * 1000003)
+                        self.history.append([self.iteration, score[0]])
+                        if score[0] > self.best_score[0]:
+                            self.best, self.best_score, self.stale = list(self.x), score, 0
+                        else:
+                            self.stale += 1
+                    self.save()
+            finally:
+                self._pool = None
+        return self.result()
+
+    def result(self):
+        mean, low, high = self.best_score or (0.5, 0.0, 1.0)
+        return TuneResult(self.size, self.mode, to_params(self.best), mean, low, high, self.iteration,
+                          self.games_played)
+
+def tune_all(sizes, modes, iterations, checkpoint_dir=None, **options):
+    """ Tunes every size and mode in turn; returns {(size, mode): TuneResult} """
+    results = {}
+    for size in sizes:
+        for mode in modes:
+            path = os.path.join(checkpoint_dir, f"tune-{size_label(size)}-{mode}.json") if checkpoint_dir else None
+            results[size, mode] = Tuner(size, mode, checkpoint_path=path, **options).run(iterations)
+    return results
+
+def report(results):
+    """ Plain-text table of the best parameters per size and mode """
+    fields = HeuristicParams._fields
+    lines = [f"{'Size':<8}{'Mode':<9}" + "".join(f"{name:>19}" for name in fields) + "  Score vs CPU"]
+    for result in results.values():
+        values = "".join(f"{value:>19.3f}" for value in result.params)
+        lines.append(f"{size_label(result.size):<8}{result.mode:<9}{values}"
+                     f"  {result.score:.3f} [{result.low:.3f}, {result.high:.3f}]")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    import argparse
+    from gameLogic import parse_board_size
+    parser = argparse.ArgumentParser(description="Tune CPU heuristic parameters by parallel self-play")
+    parser.add_argument("--sizes", type=parse_board_size, nargs="+", default=[5])
+    parser.add_argument("--modes", choices=["simple", "general"], nargs="+", default=["simple", "general"])
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--checkpoint-dir")
+    args = parser.parse_args()
+    if args.checkpoint_dir:
+        os.makedirs(args.checkpoint_dir, exist_ok=True)
+    tuned = tune_all(args.sizes, args.modes, args.iterations, args.checkpoint_dir, games=args.games,
+                     workers=args.workers, seed=args.seed)
+    print(report(tuned))